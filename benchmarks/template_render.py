@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Template rendering benchmark
+Compares the Jinja2 Spring entity template, as the generators render it, against an
+f-string builder producing the same file
+
+Usage: python benchmarks/template_render.py [--classes N] [--repeat R]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, StrictUndefined
+from src.generators.jpa_mapping import plan_associations
+from src.generators.microservice_generator import MicroserviceGenerator
+from src.generators.schema_migration import jpa_name, table_name
+from src.generators.templating import TEMPLATE_DIR, render
+from src.models.class_model import ClassModelFactory, Relationship
+
+
+def fstring_entity(cls_name, package_name, table, table_literal, attributes, audit_accessors, associations,
+                   second_level_cache=False):
+    """f-string builder with the same output as spring/entity.java.j2 (keep the two in sync)"""
+    cache = ('@Cacheable\n@org.hibernate.annotations.Cache(usage = org.hibernate.annotations.'
+             'CacheConcurrencyStrategy.READ_WRITE)\n') if second_level_cache else ''
+    code = f'''package {package_name}.entity;
+
+import com.fasterxml.jackson.annotation.JsonIgnore;
+import javax.persistence.*;
+import javax.validation.constraints.*;
+import java.time.LocalDate;
+import java.time.LocalDateTime;
+import java.util.HashSet;
+import java.util.List;
+import java.util.Objects;
+import java.util.Set;
+
+/**
+ * {cls_name} Entity
+ * Generated for Kessel Run Air Force Mission Systems
+ */
+@Entity
+@Table(name = "{table_literal}")
+{cache}public class {cls_name} {{
+    
+    @Id
+    @GeneratedValue(strategy = GenerationType.IDENTITY)
+    private Long id;
+    
+'''
+    for attr in attributes:
+        if attr.is_collection:
+            code += f'''    @ElementCollection
+    @CollectionTable(name = "{table}_{attr.name}", joinColumns = @JoinColumn(name = "{table}_id"))
+'''
+        code += f'''    @Column(name = "{attr.column}")
+    @NotNull
+    private {attr.java_type} {attr.name};
+    
+'''
+    for assoc in associations:
+        for annotation in assoc.annotations:
+            code += f"    {annotation}\n"
+        init = " = new HashSet<>()" if assoc.is_collection else ""
+        code += f'''    @JsonIgnore
+    private {assoc.java_type} {assoc.field}{init};
+    
+'''
+    code += '''    @Column(name = "created_at")
+    private LocalDateTime createdAt;
+    
+    @Column(name = "updated_at")
+    private LocalDateTime updatedAt;
+    
+    // Soft delete marker; list, lookup and export queries skip deleted rows
+    @Column(name = "deleted_at")
+    private LocalDateTime deletedAt;
+    
+    @PrePersist
+    protected void onCreate() {
+        createdAt = LocalDateTime.now();
+        updatedAt = LocalDateTime.now();
+    }
+    
+    @PreUpdate
+    protected void onUpdate() {
+        updatedAt = LocalDateTime.now();
+    }
+    
+    // Getters and Setters
+    public Long getId() {
+        return id;
+    }
+    
+    public void setId(Long id) {
+        this.id = id;
+    }
+    
+'''
+    for attr in attributes:
+        code += f'''    public {attr.java_type} get{attr.capitalized}() {{
+        return {attr.name};
+    }}
+    
+    public void set{attr.capitalized}({attr.java_type} {attr.name}) {{
+        this.{attr.name} = {attr.name};
+    }}
+    
+'''
+    for assoc in associations:
+        code += f'''    public {assoc.java_type} get{assoc.capitalized}() {{
+        return {assoc.field};
+    }}
+    
+    public void set{assoc.capitalized}({assoc.java_type} {assoc.field}) {{
+        this.{assoc.field} = {assoc.field};
+    }}
+    
+'''
+        if not assoc.is_collection:
+            code += f'''    /**
+     * Id of the {assoc.field} reference; reading it never loads the referenced row
+     */
+    public Long get{assoc.capitalized}Id() {{
+        return {assoc.field} == null ? null : {assoc.field}.getId();
+    }}
+    
+'''
+    for field in audit_accessors:
+        accessor = field[:1].upper() + field[1:]
+        code += f'''    public LocalDateTime get{accessor}() {{
+        return {field};
+    }}
+    
+    public void set{accessor}(LocalDateTime {field}) {{
+        this.{field} = {field};
+    }}
+    
+'''
+    code += f'''    public LocalDateTime getDeletedAt() {{
+        return deletedAt;
+    }}
+    
+    public void setDeletedAt(LocalDateTime deletedAt) {{
+        this.deletedAt = deletedAt;
+    }}
+    
+    @Override
+    public boolean equals(Object o) {{
+        if (this == o) return true;
+        // instanceof and getId() also match lazy proxies of this entity
+        if (!(o instanceof {cls_name})) return false;
+        {cls_name} entity = ({cls_name}) o;
+        // Unsaved entities are only equal to themselves, so they can share a Set
+        return id != null && Objects.equals(id, entity.getId());
+    }}
+    
+    @Override
+    public int hashCode() {{
+        // Constant across persist, when the id gets assigned
+        return {cls_name}.class.hashCode();
+    }}
+    
+    @Override
+    public String toString() {{
+        return "{cls_name}{{" +
+                "id=" + id +
+                "}}";
+    }}
+}}
+'''
+    return code
+
+
+def build_model(count):
+    """Entity classes with a realistic spread of attribute types, each referencing the previous one"""
+    attributes = {
+        'code': 'string', 'name': 'string', 'quantity': 'int', 'weight': 'float',
+        'active': 'boolean', 'updated': 'datetime', 'due': 'date', 'tags': 'list',
+    }
+    classes = [ClassModelFactory.create_entity_class(f"Entity{i}", attributes) for i in range(count)]
+    relationships = [Relationship(f"Entity{i - 1}", f"Entity{i}", 'association', 'one', 'many')
+                     for i in range(1, count)]
+    return classes, relationships
+
+
+def time_all(builders, contexts, repeat):
+    """Best time of each builder over every context; rounds interleave the builders to even out noise"""
+    best = {label: float('inf') for label in builders}
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            for label, func in builders.items():
+                start = time.perf_counter()
+                for context in contexts:
+                    func(context)
+                best[label] = min(best[label], time.perf_counter() - start)
+    finally:
+        gc.enable()
+    for label, seconds in best.items():
+        print(f"{label:<28} {seconds * 1000:8.1f} ms  {len(contexts) / seconds:10.0f} files/s")
+    return best
+
+
+def template_load(cache_dir):
+    """Time to get the entity template from a new environment using cache_dir"""
+    environment = Environment(loader=FileSystemLoader(TEMPLATE_DIR),
+                              bytecode_cache=FileSystemBytecodeCache(cache_dir),
+                              keep_trailing_newline=True, trim_blocks=True, lstrip_blocks=True,
+                              undefined=StrictUndefined)
+    start = time.perf_counter()
+    template = environment.get_template('spring/entity.java.j2')
+    return template, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--classes', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    
+    generator = MicroserviceGenerator()
+    classes, relationships = build_model(args.classes)
+    mappings = plan_associations(classes, relationships)
+    contexts = [dict(cls=cls, package_name='mil.af.kesselrun.benchmark', second_level_cache=False,
+                     table=table_name(cls), table_literal=jpa_name(table_name(cls)),
+                     attributes=generator._entity_attributes(cls, mappings[cls.name]),
+                     audit_accessors=generator._audit_accessors(cls),
+                     associations=mappings[cls.name].associations)
+                for cls in classes]
+    
+    # Compiling from source against reading the bytecode a previous run left on disk
+    with tempfile.TemporaryDirectory() as cache_dir:
+        _, compile_time = template_load(cache_dir)
+        _, cached_time = template_load(cache_dir)
+    print(f"{'template load (compile)':<28} {compile_time * 1000:8.1f} ms")
+    print(f"{'template load (bytecode)':<28} {cached_time * 1000:8.1f} ms")
+    
+    def backend(context):
+        return render('spring/entity.java.j2', **context)
+    
+    def fstring(context):
+        return fstring_entity(context['cls'].name, context['package_name'], context['table'],
+                              context['table_literal'], context['attributes'], context['audit_accessors'],
+                              context['associations'])
+    
+    mismatches = sum(1 for context in contexts if backend(context) != fstring(context))
+    print(f"byte-identical output: {'yes' if not mismatches else f'no ({mismatches} differ)'}")
+    
+    times = time_all({'f-string entity builder': fstring, 'render()': backend}, contexts, args.repeat)
+    print(f"render() / f-string: {times['render()'] / times['f-string entity builder']:.2f}x")
+
+if __name__ == '__main__':
+    main()
@@ -13,14 +13,31 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.parsers.text_parser import TextModelParser
-from src.generators.python_generator import PythonCodeGenerator
-from src.generators.java_generator import JavaCodeGenerator  
-from src.generators.typescript_generator import TypeScriptCodeGenerator
-from src.generators.microservice_generator import MicroserviceGenerator
-from src.generators.openapi_generator import OpenAPIGenerator
-from src.generators.devsecops_generator import DevSecOpsGenerator
-from src.models.class_model import create_sample_model
+# Parsers and generators are imported on first use so --help and
+# single-target runs only pay for what they need
+from src.generators.registry import registry
+
+
+TARGETS = registry.builtin_names()
+
+
+def parse_targets(value):
+    """Parse -l/--language: a single target or a comma-separated list of targets"""
+    targets = [target.strip() for target in value.split(',') if target.strip()]
+    unknown = [target for target in targets if target not in registry]
+    if not targets or unknown:
+        raise argparse.ArgumentTypeError(
+            f"invalid choice: {', '.join(unknown) or repr(value)} (choose from {', '.join(registry.names())})")
+    # Drop duplicates while keeping the requested order
+    return list(dict.fromkeys(targets))
+
+
+def parse_tags(value):
+    """Parse --bundle-tags: a comma-separated list of OpenAPI tags"""
+    tags = [tag.strip() for tag in value.split(',') if tag.strip()]
+    if not tags:
+        raise argparse.ArgumentTypeError(f"no tags in {value!r}")
+    return list(dict.fromkeys(tags))
 
 
 def main():
@@ -31,7 +48,14 @@ def main():
 Examples:
   %(prog)s -i model.txt -o output/ -l python
   %(prog)s -i model.puml -f plantuml -l java -o generated/
+  %(prog)s -i model.yaml -f yaml -l python,java,openapi -o generated/
   %(prog)s --sample -l typescript -o examples/
+  %(prog)s -i model.yaml -f yaml -l openapi --openapi-split -o api/
+  %(prog)s --bundle-openapi api/api/openapi.yaml --bundle-tags User -o bundled/
+  %(prog)s -i model.yaml -f yaml -l microservices --service-config services.yaml -o services/
+  %(prog)s -i model.yaml -f yaml -l microservices,devsecops --fast-startup cds -o services/
+  %(prog)s -i model.yaml -f yaml -l grpc --proto-lock grpc/proto/field-numbers.lock.json -o grpc/ --force
+  %(prog)s -i model.yaml -f yaml -l graphql -o graphql/
   %(prog)s --web  # Start web interface
         '''
     )
@@ -49,9 +73,12 @@ Examples:
                        default='generated/',
                        help='Output directory (default: generated/)')
     parser.add_argument('-l', '--language',
-                       choices=['python', 'java', 'typescript', 'microservices', 'openapi', 'devsecops'],
+                       type=parse_targets,
                        default='python',
-                       help='Target programming language or architecture (default: python)')
+                       metavar='TARGET[,TARGET...]',
+                       help=f'Target programming language or architecture, or a comma-separated list '
+                            f'generated into per-target subdirectories ({", ".join(TARGETS)}, or an installed '
+                            f'plugin; default: python)')
     
     # Special modes
     parser.add_argument('--sample',
@@ -71,8 +98,37 @@ Examples:
     parser.add_argument('--force',
                        action='store_true',
                        help='Overwrite existing files')
+    parser.add_argument('--cache-dir',
+                       help='Reuse per-class output for unchanged classes across runs (python, java, typescript)')
+    parser.add_argument('--openapi-split',
+                       action='store_true',
+                       help='Write the OpenAPI spec as per-tag path and per-schema files (openapi)')
+    parser.add_argument('--bundle-openapi',
+                       metavar='ROOT',
+                       help='Bundle a split OpenAPI layout (its openapi.yaml) back into one spec')
+    parser.add_argument('--bundle-tags',
+                       type=parse_tags,
+                       metavar='TAG[,TAG...]',
+                       help='With --bundle-openapi, only bundle these tags and the schemas they use')
+    parser.add_argument('--service-config',
+                       metavar='FILE',
+                       help='Per-service settings: performance profile, cache, replicas, database '
+                            'connection limits (YAML or JSON; microservices)')
+    parser.add_argument('--performance-profile',
+                       metavar='PROFILE',
+                       help='Default performance profile: balanced, read-heavy, write-heavy or dev '
+                            '(microservices; default: balanced)')
+    parser.add_argument('--fast-startup',
+                       choices=['cds', 'native'],
+                       help='Build images for fast startup: layered jar with an AppCDS archive, or a GraalVM '
+                            'native image, with a startup-time check in CI (microservices, devsecops)')
+    parser.add_argument('--proto-lock',
+                       metavar='FILE',
+                       help='Protobuf field-number lock of an earlier run, so field numbers stay stable '
+                            '(grpc; default: proto/field-numbers.lock.json in the output directory, if present)')
     
     args = parser.parse_args()
+    args.service_config = load_service_config(args)
     
     # Handle special modes
     if args.web:
@@ -83,6 +139,10 @@ Examples:
         generate_sample_code(args)
         return
     
+    if args.bundle_openapi:
+        bundle_openapi(args)
+        return
+    
     # Validate input
     if not args.input:
         parser.error('Input file is required (use -i/--input or --sample)')
@@ -99,10 +159,11 @@ Examples:
         if args.verbose:
             print(f"Reading model from: {args.input}")
             print(f"Model format: {args.format}")
-            print(f"Target language: {args.language}")
+            print(f"Target language: {', '.join(args.language)}")
             print(f"Output directory: {args.output}")
         
         # Parse the model
+        from src.parsers.text_parser import TextModelParser
         parser_instance = TextModelParser()
         
         if args.format == 'plantuml':
@@ -128,39 +189,8 @@ Examples:
             return
         
         # Generate code
-        generators = {
-            'python': PythonCodeGenerator(),
-            'java': JavaCodeGenerator(),
-            'typescript': TypeScriptCodeGenerator(),
-            'microservices': MicroserviceGenerator(),
-            'openapi': OpenAPIGenerator(),
-            'devsecops': DevSecOpsGenerator()
-        }
-        
-        generator = generators[args.language]
-        generated_files = generator.generate(diagram)
-        
-        # Create output directory
         output_dir = Path(args.output)
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Write generated files
-        files_written = 0
-        for filename, content in generated_files.items():
-            output_path = output_dir / filename
-            
-            if output_path.exists() and not args.force:
-                print(f"Warning: {output_path} already exists (use --force to overwrite)")
-                continue
-            
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            
-            files_written += 1
-            if args.verbose:
-                print(f"Generated: {output_path}")
+        files_written = generate_targets(diagram, output_dir, args)
         
         print(f"✅ Successfully generated {files_written} files in {output_dir}")
         
@@ -172,40 +202,140 @@ Examples:
         sys.exit(1)
 
 
+def load_service_config(args):
+    """Read --service-config and apply --performance-profile and --fast-startup, or exit with the problem"""
+    if not args.service_config and not args.performance_profile and not args.fast_startup:
+        return None
+    
+    from src.generators.service_config import ServiceConfig, load_service_config as read_service_config
+    try:
+        config = read_service_config(args.service_config) if args.service_config else ServiceConfig()
+        if args.performance_profile:
+            config = config.with_profile(args.performance_profile)
+        if args.fast_startup:
+            config = config.with_startup(args.fast_startup)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    return config
+
+
 def generate_sample_code(args):
     """Generate code from sample model"""
     if args.verbose:
         print("Generating sample model...")
     
     # Create sample diagram
+    from src.models.class_model import create_sample_model
     diagram = create_sample_model()
     
     # Generate code
-    generators = {
-        'python': PythonCodeGenerator(),
-        'java': JavaCodeGenerator(),
-        'typescript': TypeScriptCodeGenerator(),
-        'microservices': MicroserviceGenerator(),
-        'openapi': OpenAPIGenerator(),
-        'devsecops': DevSecOpsGenerator()
-    }
-    
-    generator = generators[args.language]
-    generated_files = generator.generate(diagram)
-    
-    # Create output directory
     output_dir = Path(args.output)
+    files_written = generate_targets(diagram, output_dir, args)
+    
+    print(f"✅ Successfully generated {files_written} sample files in {output_dir}")
+
+
+def bundle_openapi(args):
+    """Bundle a split OpenAPI layout into openapi.yaml and openapi.json"""
+    from src.generators.spec_bundle import bundle_spec
+    from src.generators.spec_serializer import serialize_spec
+    
+    try:
+        spec = bundle_spec(args.bundle_openapi, args.bundle_tags)
+    except KeyError as e:
+        print(f"Error: {e.args[0]}", file=sys.stderr)
+        sys.exit(1)
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    
+    openapi_yaml, openapi_json = serialize_spec(spec)
+    output_dir = Path(args.output)
+    files_written = write_generated_files(
+        [("openapi.yaml", openapi_yaml), ("openapi.json", openapi_json)], output_dir, args)
+    
+    print(f"✅ Bundled {len(spec.get('paths', {}))} paths into {files_written} files in {output_dir}")
+
+
+def generate_targets(diagram, output_dir: Path, args) -> int:
+    """
+    Generate every requested target from a single parsed diagram
+    
+    A single target is written straight into output_dir; several targets are
+    generated concurrently, each into its own output_dir/<target> subdirectory.
+    """
+    from src.generators.ir import lower
+    
+    targets = args.language
+    
+    # Shared analysis (index and IR) is lowered once, before the targets fan out
+    lower(diagram)
+    
+    cache = None
+    if args.cache_dir:
+        from src.generators.generation_cache import GenerationCache
+        cache = GenerationCache(args.cache_dir)
+    
+    # Only the requested generators are imported and instantiated
+    generators = {target: registry.create(target, cache) for target in targets}
+    if args.openapi_split and 'openapi' in generators:
+        generators['openapi'].split_output = True
+    if args.service_config and 'microservices' in generators:
+        generators['microservices'].service_config = args.service_config
+    if args.fast_startup and 'devsecops' in generators:
+        generators['devsecops'].fast_startup = args.fast_startup
+    if 'grpc' in generators:
+        generators['grpc'].field_lock = load_field_lock(args, output_dir / 'grpc' if len(targets) > 1 else output_dir)
+    
+    # Write generated files as the generator produces them
+    if len(targets) == 1:
+        return write_generated_files(generators[targets[0]].stream(diagram), output_dir, args)
+    
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+        futures = {
+            target: executor.submit(write_generated_files, generators[target].stream(diagram),
+                                    output_dir / target, args)
+            for target in targets
+        }
+    
+    files_written = 0
+    for target, future in futures.items():
+        target_files = future.result()
+        if args.verbose:
+            print(f"{target}: {target_files} files in {output_dir / target}")
+        files_written += target_files
+    
+    return files_written
+
+
+def load_field_lock(args, target_dir: Path):
+    """Field-number lock from --proto-lock, or the one an earlier run left in the target's output"""
+    from src.generators.proto_schema import LOCK_FILE, FieldLock
+    
+    path = Path(args.proto_lock) if args.proto_lock else target_dir / LOCK_FILE
+    if not args.proto_lock and not path.exists():
+        return None
+    if args.verbose:
+        print(f"Field numbers from: {path}")
+    return FieldLock.load(str(path))
+
+
+def write_generated_files(generated_files, output_dir: Path, args) -> int:
+    """Write (path, content) pairs to disk as they arrive, returning the count written"""
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Write generated files
     files_written = 0
-    for filename, content in generated_files.items():
+    for filename, content in generated_files:
         output_path = output_dir / filename
         
         if output_path.exists() and not args.force:
             print(f"Warning: {output_path} already exists (use --force to overwrite)")
             continue
         
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write(content)
         
@@ -213,7 +343,7 @@ def generate_sample_code(args):
         if args.verbose:
             print(f"Generated: {output_path}")
     
-    print(f"✅ Successfully generated {files_written} sample files in {output_dir}")
+    return files_written
 
 
 def start_web_interface():
@@ -4,17 +4,33 @@ Provides common functionality for all code generators
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterator, Tuple, Callable, Optional
 from ..models.class_model import ClassDiagram
 
 
 class BaseGenerator(ABC):
     """Base class for all code generators"""
     
-    def __init__(self):
-        pass
+    # Bump whenever a change to the generator alters its output, so cached
+    # files produced by an older version are not reused
+    generator_version = "1.1.0"
+    
+    def __init__(self, cache=None):
+        self.cache = cache
     
     @abstractmethod
+    def stream(self, diagram: ClassDiagram) -> Iterator[Tuple[str, str]]:
+        """
+        Lazily generate code from a class diagram
+        
+        Args:
+            diagram: ClassDiagram object containing the model
+            
+        Yields:
+            (file path, file contents) pairs, one file at a time
+        """
+        pass
+    
     def generate(self, diagram: ClassDiagram) -> Dict[str, str]:
         """
         Generate code from a class diagram
@@ -25,7 +41,29 @@ class BaseGenerator(ABC):
         Returns:
             Dictionary mapping file paths to file contents
         """
-        pass
+        return dict(self.stream(diagram))
+    
+    def _cache_options(self) -> Dict[str, Any]:
+        """Options that influence generated output and so belong in cache keys"""
+        return {}
+    
+    def _class_cache_keys(self, diagram: ClassDiagram) -> List[Optional[str]]:
+        """Cache keys aligned with diagram.classes (all None when caching is off)"""
+        if self.cache is None:
+            return [None] * len(diagram.classes)
+        return self.cache.class_keys(diagram, type(self).__name__,
+                                     self.generator_version, self._cache_options())
+    
+    def _cached_output(self, key: Optional[str], render: Callable[[], str]) -> str:
+        """Return cached output for a key, rendering and storing it on a miss"""
+        if key is None:
+            return render()
+        
+        content = self.cache.get(key)
+        if content is None:
+            content = render()
+            self.cache.put(key, content)
+        return content
     
     def _escape_string(self, text: str) -> str:
         """Escape special characters in strings"""
@@ -0,0 +1,91 @@
+"""
+Indentation-aware code writer for generators
+Collects generated text, already indented, and joins it once at the end
+"""
+
+from typing import List, Sequence
+
+
+class CodeWriter:
+    """Writes code line by line, tracking the indentation of nested scopes"""
+    
+    def __init__(self, indent_unit: str = '    '):
+        """
+        Args:
+            indent_unit: Text added per indentation level
+        """
+        self.indent_unit = indent_unit
+        # Written text; an item holds one line, or several joined by newlines
+        self._chunks: List[str] = []
+        # Bound once, since line() runs for many generated lines
+        self._append = self._chunks.append
+        # Indentation of the current scope, and those of the enclosing scopes
+        self._prefix = ''
+        self._prefixes: List[str] = []
+        # Joins the lines of a chunk, indenting all but the first; and a
+        # blank line as that join leaves it
+        self._separator = '\n'
+        self._blank = '\n\n'
+    
+    @property
+    def position(self) -> int:
+        """Number of writes so far; if it is unchanged, nothing was written in between"""
+        return len(self._chunks)
+    
+    def line(self, text: str = ''):
+        """Write one line at the current indentation (blank lines stay unindented)"""
+        self._append(self._prefix + text if text else '')
+    
+    def lines(self, texts: Sequence[str]):
+        """
+        Write several lines at the current indentation
+
+        The lines are indented by one join, so a generator can write a whole
+        member, with its body indented relative to it, in one call.
+        """
+        if '' not in texts:
+            if texts:
+                self._append(self._prefix + self._separator.join(texts))
+            return
+        
+        prefix = self._prefix
+        chunk = prefix + self._separator.join(texts)
+        if prefix:
+            # Unindent blank lines; the second pass catches runs of them, since
+            # a replace only handles every other line of a run
+            blank = self._blank
+            chunk = chunk.replace(blank, '\n\n').replace(blank, '\n\n')
+            if not texts[0]:
+                chunk = chunk[len(prefix):]
+            if not texts[-1]:
+                chunk = chunk[:-len(prefix)]
+        self._append(chunk)
+    
+    def block(self, text: str):
+        """Write multi-line text, indenting every line"""
+        self.lines(text.split('\n'))
+    
+    def indent(self, levels: int = 1) -> "CodeWriter":
+        """Indent everything written inside a `with writer.indent():` block"""
+        self._prefixes.append(self._prefix)
+        self._set_prefix(self._prefix + self.indent_unit * levels)
+        return self
+    
+    def dedent(self):
+        """Return to the indentation in effect before the last indent()"""
+        self._set_prefix(self._prefixes.pop())
+    
+    def __enter__(self) -> "CodeWriter":
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.dedent()
+    
+    def getvalue(self) -> str:
+        """Everything written so far"""
+        return '\n'.join(self._chunks)
+    
+    def _set_prefix(self, prefix: str):
+        self._prefix = prefix
+        self._separator = '\n' + prefix
+        self._blank = f'\n{prefix}\n'
@@ -4,42 +4,53 @@ Integrates security-first patterns, automated testing, and compliance into gener
 """
 
 import os
-from typing import Dict, List, Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Any, Iterator, Mapping, Optional, Tuple
 from .base_generator import BaseGenerator
+from .templating import render
 from ..models.class_model import ClassDiagram, ClassDefinition
 
 
+# Seconds from container start to "Started ..." that the startup_time job accepts
+FAST_STARTUP_BUDGET_SECONDS = 20
+
+# Service the generic Dockerfile.secure and its startup check are written for
+SECURE_SERVICE_NAME = "kessel-run-service"
+
+
 class DevSecOpsGenerator(BaseGenerator):
     """Generate DevSecOps pipeline and security configurations for Kessel Run"""
     
-    def __init__(self):
-        super().__init__()
-        
-    def generate(self, diagram: ClassDiagram) -> Dict[str, str]:
-        """Generate complete DevSecOps pipeline and security configurations"""
-        files = {}
+    def __init__(self, cache=None):
+        super().__init__(cache)
+        # 'cds' or 'native' (--fast-startup): layered jar with an AppCDS archive and a startup-time check
+        self.fast_startup = None
         
+    def stream(self, diagram: ClassDiagram) -> Iterator[Tuple[str, str]]:
+        """Generate complete DevSecOps pipeline and security configurations, one file at a time"""
         # Security configurations
-        files.update(self._generate_security_configs())
+        yield from self._generate_security_configs().items()
         
         # CI/CD pipelines
-        files.update(self._generate_cicd_pipelines(diagram))
+        yield from self._generate_cicd_pipelines(diagram).items()
         
         # Security testing
-        files.update(self._generate_security_tests(diagram))
+        yield from self._generate_security_tests(diagram).items()
         
         # Compliance configurations
-        files.update(self._generate_compliance_configs())
+        yield from self._generate_compliance_configs().items()
         
         # Monitoring and logging
-        files.update(self._generate_monitoring_configs(diagram))
+        yield from self._generate_monitoring_configs(diagram).items()
         
         # Container security
-        files.update(self._generate_container_security())
-        
-        return files
+        yield from self._generate_container_security(self.fast_startup).items()
     
-    def _generate_security_configs(self) -> Dict[str, str]:
+    # Independent of the diagram: built once per process, shared read-only by every instance
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _generate_security_configs() -> Mapping[str, str]:
         """Generate security configuration files"""
         files = {}
         
@@ -292,12 +303,33 @@ public class SecurityHeadersFilter implements Filter {
 }
 '''
         
-        return files
+        return MappingProxyType(files)
     
     def _generate_cicd_pipelines(self, diagram: ClassDiagram) -> Dict[str, str]:
         """Generate CI/CD pipeline configurations"""
         files = {}
         
+        startup_job = f'''
+# Startup time of the AppCDS image against its budget
+startup_time:
+  stage: test
+  image: registry1.dso.mil/ironbank/docker/docker:20
+  services:
+    - name: registry1.dso.mil/ironbank/docker/docker-dind:20-dind
+      alias: docker
+  variables:
+    STARTUP_BUDGET_SECONDS: "{FAST_STARTUP_BUDGET_SECONDS}"
+  script:
+    - docker pull $CI_REGISTRY_IMAGE:$CI_COMMIT_SHA
+    - bash scripts/measure-startup.sh $CI_REGISTRY_IMAGE:$CI_COMMIT_SHA
+  artifacts:
+    reports:
+      metrics: startup-metrics.txt
+  rules:
+    - if: $CI_MERGE_REQUEST_IID
+    - if: $CI_COMMIT_BRANCH == $CI_DEFAULT_BRANCH
+''' if self.fast_startup else ""
+        
         # Enhanced GitLab CI with security scans
         files[".gitlab-ci.yml"] = f'''# Kessel Run DevSecOps Pipeline
 # Enhanced CI/CD with integrated security scanning and compliance
@@ -440,7 +472,7 @@ code_quality:
   rules:
     - if: $CI_MERGE_REQUEST_IID
     - if: $CI_COMMIT_BRANCH == $CI_DEFAULT_BRANCH
-
+{startup_job}
 # Dynamic Application Security Testing (DAST)
 dast:
   stage: security-test
@@ -684,7 +716,10 @@ public class SecurityIntegrationTest {
         
         return files
     
-    def _generate_compliance_configs(self) -> Dict[str, str]:
+    # Independent of the diagram: built once per process, shared read-only by every instance
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _generate_compliance_configs() -> Mapping[str, str]:
         """Generate compliance configuration files"""
         files = {}
         
@@ -800,7 +835,7 @@ system_communications:
   ]
 }'''
         
-        return files
+        return MappingProxyType(files)
     
     def _generate_monitoring_configs(self, diagram: ClassDiagram) -> Dict[str, str]:
         """Generate monitoring and logging configurations"""
@@ -968,12 +1003,51 @@ alerting:
         
         return files
     
-    def _generate_container_security(self) -> Dict[str, str]:
+    # Depends only on the startup mode (three values): built once per mode and process, shared read-only
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _generate_container_security(fast_startup: Optional[str] = None) -> Mapping[str, str]:
         """Generate container security configurations"""
         files = {}
         
+        if fast_startup:
+            # Layered jar on a fixed class path, so the JVM can map an AppCDS archive
+            unpack = '''
+
+# Unpack the layered jar; AppCDS only archives classes loaded from jar files
+RUN java -Djarmode=layertools -jar target/*.jar extract --destination layers && \\
+    jar cf layers/application/BOOT-INF/application.jar -C layers/application/BOOT-INF/classes . && \\
+    (cd layers && jar xf ../target/*.jar META-INF/MANIFEST.MF) && \\
+    sed -n 's/^Start-Class: *//p' layers/META-INF/MANIFEST.MF | tr -d '\\r' > layers/main.arg'''
+            application = '''# Copy application layers: dependencies first, they change least
+COPY --from=builder --chown=kesselrun:kesselrun /app/layers/dependencies/BOOT-INF/lib/ BOOT-INF/lib/
+COPY --from=builder --chown=kesselrun:kesselrun /app/layers/snapshot-dependencies/ ./
+COPY --from=builder --chown=kesselrun:kesselrun /app/layers/application/BOOT-INF/application.jar BOOT-INF/application.jar
+COPY --from=builder --chown=kesselrun:kesselrun /app/layers/main.arg main.arg
+RUN printf -- '-cp BOOT-INF/application.jar:%s\\n' "$(ls BOOT-INF/lib/*.jar | paste -sd: -)" > classpath.arg
+
+# AppCDS training: start once under the training profile and record the loaded classes.
+# Without its backing services the start may fail; the classes loaded until then still count
+RUN (timeout 300 java @classpath.arg -XX:DumpLoadedClassList=classes.lst \\
+        -Dspring.profiles.active=training @main.arg || true) && \\
+    java @classpath.arg -Xshare:dump -XX:SharedClassListFile=classes.lst -XX:SharedArchiveFile=app.jsa && \\
+    rm classes.lst'''
+            permissions = ("RUN chown kesselrun:kesselrun app.jsa classpath.arg && \\\n"
+                           "    chmod 440 app.jsa classpath.arg main.arg && chmod -R a-w BOOT-INF")
+            entrypoint = ('["java", "-Djava.security.egd=file:/dev/./urandom", "@classpath.arg", '
+                          '"-XX:SharedArchiveFile=app.jsa", "-Xshare:auto", "@main.arg"]')
+            files["scripts/measure-startup.sh"] = render(
+                'startup/measure_startup.sh.j2', service_name=SECURE_SERVICE_NAME, mode='cds',
+                database=SECURE_SERVICE_NAME.replace('-', '_'), budget_seconds=FAST_STARTUP_BUDGET_SECONDS)
+        else:
+            unpack = ""
+            application = '''# Copy application jar
+COPY --from=builder --chown=kesselrun:kesselrun /app/target/*.jar app.jar'''
+            permissions = "RUN chmod 440 app.jar"
+            entrypoint = '["java", "-jar", "-Djava.security.egd=file:/dev/./urandom", "app.jar"]'
+        
         # Enhanced Dockerfile with security scanning
-        files["Dockerfile.secure"] = '''# Multi-stage build for enhanced security
+        files["Dockerfile.secure"] = f'''# Multi-stage build for enhanced security
 FROM registry1.dso.mil/ironbank/opensource/openjdk/openjdk11:1.11.0 as builder
 
 # Security: Run as non-root user during build
@@ -985,7 +1059,7 @@ COPY --chown=appuser:appuser pom.xml .
 COPY --chown=appuser:appuser src ./src
 
 # Build application
-RUN mvn clean package -DskipTests
+RUN mvn clean package -DskipTests{unpack}
 
 # Runtime stage
 FROM registry1.dso.mil/ironbank/opensource/openjdk/openjdk11-jre:1.11.0
@@ -1007,8 +1081,7 @@ RUN groupadd -r kesselrun && useradd -r -g kesselrun kesselrun
 # Set working directory
 WORKDIR /app
 
-# Copy application jar
-COPY --from=builder --chown=kesselrun:kesselrun /app/target/*.jar app.jar
+{application}
 
 # Security: Remove unnecessary packages and files
 RUN microdnf update -y && \\
@@ -1017,7 +1090,7 @@ RUN microdnf update -y && \\
     rm -rf /tmp/*
 
 # Security: Set file permissions
-RUN chmod 440 app.jar
+{permissions}
 
 # Switch to non-root user
 USER kesselrun
@@ -1030,7 +1103,7 @@ HEALTHCHECK --interval=30s --timeout=10s --start-period=60s --retries=3 \\
     CMD curl -f http://localhost:8080/actuator/health || exit 1
 
 # Security: Use exec form and non-root user
-ENTRYPOINT ["java", "-jar", "-Djava.security.egd=file:/dev/./urandom", "app.jar"]
+ENTRYPOINT {entrypoint}
 '''
         
         # Container security scanning script
@@ -1085,7 +1158,8 @@ echo "🎉 No critical vulnerabilities found!"
 '''
         
         # Container structure test configuration
-        files["container-test.yaml"] = '''schemaVersion: 2.0.0
+        app_path = "/app/BOOT-INF/application.jar" if fast_startup else "/app/app.jar"
+        files["container-test.yaml"] = f'''schemaVersion: 2.0.0
 
 metadataTest:
   labels:
@@ -1107,12 +1181,12 @@ commandTests:
 
   - name: "app jar exists"
     command: "ls"
-    args: ["/app/app.jar"]
+    args: ["{app_path}"]
     exitCode: 0
 
 fileExistenceTests:
   - name: "app jar"
-    path: "/app/app.jar"
+    path: "{app_path}"
     shouldExist: true
 
   - name: "no root files"
@@ -1121,7 +1195,7 @@ fileExistenceTests:
 
 fileContentTests:
   - name: "app jar permissions"
-    path: "/app/app.jar"
+    path: "{app_path}"
     expectedContents: []
     # File should not be writable by group or others
 
@@ -1130,7 +1204,7 @@ licenseTests:
     files: []
 '''
         
-        return files
+        return MappingProxyType(files)
 
 
 class BaseGenerator:
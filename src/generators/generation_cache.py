@@ -0,0 +1,124 @@
+"""
+Generation cache for per-class code generators
+Keeps generated class files in an in-memory LRU backed by an on-disk store
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+from ..models.class_model import ClassDiagram, ClassDefinition
+
+
+def class_fingerprint(class_def: ClassDefinition) -> str:
+    """Structural hash of a class definition"""
+    # The dataclass repr covers every field recursively and is far cheaper than asdict()
+    return hashlib.sha256(repr(class_def).encode('utf-8')).hexdigest()
+
+
+class GenerationCache:
+    """Two-level cache of generated class files"""
+    
+    def __init__(self, cache_dir: Optional[str] = None, max_entries: int = 4096):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def class_keys(self, diagram: ClassDiagram, generator_name: str, version: str,
+                   options: Dict[str, Any]) -> List[str]:
+        """
+        Compute a cache key for every class in the diagram
+
+        A key combines the class's structural hash, the hashes of the classes it
+        depends on through relationships, the generator version and its options.
+
+        Returns:
+            Keys in the same order as diagram.classes
+        """
+        class_hashes = [class_fingerprint(class_def) for class_def in diagram.classes]
+        fingerprints = {}
+        for class_def, class_hash in zip(diagram.classes, class_hashes):
+            fingerprints.setdefault(class_def.name, class_hash)
+        
+        # Relationships where the class is the source pull in the target class
+        dependencies: Dict[str, List[str]] = {}
+        for rel in diagram.relationships:
+            if rel.target_class == rel.source_class:
+                continue
+            entry = repr(rel)
+            target_hash = fingerprints.get(rel.target_class, '')
+            dependencies.setdefault(rel.source_class, []).append(f"{entry}:{target_hash}")
+            dependencies.setdefault(rel.target_class, []).append(entry)
+        
+        namespace = hashlib.sha256(
+            json.dumps([generator_name, version, options], sort_keys=True, default=str).encode('utf-8')
+        ).hexdigest()
+        
+        keys = []
+        for class_def, class_hash in zip(diagram.classes, class_hashes):
+            digest = hashlib.sha256(namespace.encode('utf-8'))
+            digest.update(class_hash.encode('utf-8'))
+            for dependency in sorted(dependencies.get(class_def.name, [])):
+                digest.update(dependency.encode('utf-8'))
+            keys.append(digest.hexdigest())
+        
+        return keys
+    
+    def get(self, key: str) -> Optional[str]:
+        """Look up generated content, checking memory first and then disk"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+        
+        path = self._path_for(key)
+        if path is not None and path.exists():
+            content = path.read_text(encoding='utf-8')
+            self._remember(key, content)
+            with self._lock:
+                self.hits += 1
+            return content
+        
+        with self._lock:
+            self.misses += 1
+        return None
+    
+    def put(self, key: str, content: str):
+        """Store generated content in memory and on disk"""
+        self._remember(key, content)
+        
+        path = self._path_for(key)
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so readers never see partial entries
+            tmp_path = path.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+            tmp_path.write_text(content, encoding='utf-8')
+            os.replace(tmp_path, path)
+    
+    def clear(self):
+        """Drop all in-memory entries (the on-disk store is left untouched)"""
+        with self._lock:
+            self._memory.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def _remember(self, key: str, content: str):
+        """Insert into the in-memory LRU, evicting the oldest entries"""
+        with self._lock:
+            self._memory[key] = content
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+    
+    def _path_for(self, key: str) -> Optional[Path]:
+        """On-disk location for a cache key"""
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / key[:2] / f"{key}.txt"
@@ -0,0 +1,57 @@
+"""
+GraphQL Generator for Kessel Run Services
+Generates a GraphQL schema from the model, with an Apollo server whose relationship
+resolvers batch through DataLoaders and whose queries are cost-limited by multiplicity
+"""
+
+import re
+from typing import Iterator, Tuple
+from .base_generator import BaseGenerator
+from .graphql_schema import plan_graph
+from .templating import render
+from ..models.class_model import ClassDiagram
+
+
+# TypeScript sources of the server, by template
+SOURCES = ('types', 'limits', 'backend', 'loaders', 'resolvers', 'complexity', 'server')
+
+
+class GraphQLGenerator(BaseGenerator):
+    """Generate a GraphQL API for Kessel Run services"""
+    
+    def __init__(self, cache=None):
+        super().__init__(cache)
+        self.port = 4000
+        # Items a list field returns unless the query asks for fewer, and the most it may ask for
+        self.default_page_size = 20
+        self.max_page_size = 100
+        # Keys a DataLoader hands the backend in one call
+        self.max_batch_size = 100
+        # Estimated query cost above which the server refuses to run a query
+        self.max_complexity = 1000
+    
+    def stream(self, diagram: ClassDiagram) -> Iterator[Tuple[str, str]]:
+        """Generate the schema and the server sources, one file at a time"""
+        types = plan_graph(diagram)
+        context = {
+            'title': f"{diagram.name} API",
+            'package_name': self._package_name(diagram),
+            'types': types,
+            'port': self.port,
+            'default_page_size': self.default_page_size,
+            'max_page_size': self.max_page_size,
+            'max_batch_size': self.max_batch_size,
+            'max_complexity': self.max_complexity,
+        }
+        
+        yield "schema.graphql", render('graphql/schema.graphql.j2', **context)
+        for source in SOURCES:
+            yield f"src/{source}.ts", render(f'graphql/{source}.ts.j2', **context)
+        yield "package.json", render('graphql/package.json.j2', **context)
+        yield "tsconfig.json", render('graphql/tsconfig.json.j2', **context)
+        yield "README.md", render('graphql/README.md.j2', **context)
+    
+    def _package_name(self, diagram: ClassDiagram) -> str:
+        """Diagram name as an npm package name (E-commerce System -> e-commerce-system-graphql)"""
+        name = re.sub(r'[^a-z0-9]+', '-', diagram.name.lower()).strip('-')
+        return f"{name or 'model'}-graphql"
@@ -0,0 +1,225 @@
+"""
+GraphQL schema planning for the GraphQL generator
+Derives object types from classes, and from relationships the edge fields with their batching and cost
+"""
+
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+from ..models.class_model import ClassDiagram
+from .ir import lower
+from .jpa_mapping import EntityMapping, JpaAssociation, plan_associations
+from .naming import pluralize
+from .schema_migration import physical_name, sql_identifier
+from .type_mapping import GENERIC_KINDS, TypeExpr, TypeSyntaxError, map_type, parse_type
+
+
+# GraphQL scalars of UML base types, by lower-cased UML name
+GRAPHQL_SCALARS = {
+    'string': 'String',
+    'str': 'String',
+    'char': 'String',
+    'uuid': 'ID',
+    'int': 'Int',
+    'integer': 'Int',
+    'short': 'Int',
+    # GraphQL's Int is 32-bit; wider integers and decimals travel as strings
+    'long': 'String',
+    'decimal': 'String',
+    'float': 'Float',
+    'double': 'Float',
+    'boolean': 'Boolean',
+    'bool': 'Boolean',
+    # ISO-8601 strings, as in the REST payloads
+    'date': 'String',
+    'datetime': 'String',
+}
+FALLBACK_SCALAR = 'String'
+
+
+class GraphQLField(NamedTuple):
+    """Scalar (or embedded) field of an object type"""
+    name: str
+    graphql_type: str
+    ts_type: str
+    description: str = ''
+
+
+class GraphQLEdge(NamedTuple):
+    """Field resolved through a relationship, batched by a DataLoader"""
+    field: str
+    target: str
+    kind: str                # 'reference' (key on this record), 'children' or 'many-to-many'
+    key: str                 # record property whose values the loader batches
+    loader: str              # the target's by-id loader for references, the edge's own loader otherwise
+    fanout: Optional[int]    # most items per parent the multiplicity allows; None when unbounded
+    batch_query: str         # one query that serves a whole batch of keys
+    
+    @property
+    def is_collection(self) -> bool:
+        return self.kind != 'reference'
+    
+    @property
+    def target_loader(self) -> str:
+        return f"{_lower_first(self.target)}ById"
+
+
+class GraphQLType(NamedTuple):
+    name: str
+    description: str
+    fields: List[GraphQLField]
+    edges: List[GraphQLEdge]
+    # Abstract classes get a type but no root queries
+    queryable: bool
+    
+    @property
+    def field_name(self) -> str:
+        return _lower_first(self.name)
+    
+    @property
+    def plural(self) -> str:
+        return pluralize(self.name)
+    
+    @property
+    def list_field(self) -> str:
+        """Root query listing the type (orders, categories)"""
+        return _lower_first(self.plural)
+    
+    @property
+    def by_id_loader(self) -> str:
+        return f"{self.field_name}ById"
+    
+    @property
+    def references(self) -> List[GraphQLEdge]:
+        return [edge for edge in self.edges if not edge.is_collection]
+    
+    @property
+    def by_ids_query(self) -> str:
+        return f"SELECT * FROM {sql_identifier(self.name.lower())} WHERE id = ANY($1) AND deleted_at IS NULL"
+    
+    @property
+    def list_query(self) -> str:
+        return (f"SELECT * FROM {sql_identifier(self.name.lower())} "
+                f"WHERE deleted_at IS NULL AND ($2 IS NULL OR id > $2) ORDER BY id LIMIT $1")
+
+
+def fanout(multiplicity: Optional[str]) -> Optional[int]:
+    """Upper bound of a multiplicity ('0..5' -> 5, '3' -> 3); None for '*', 'many' or unspecified"""
+    if not multiplicity:
+        return None
+    upper = multiplicity.strip().lower().split('..')[-1].strip()
+    if upper == 'one':
+        return 1
+    return int(upper) if upper.isdigit() else None
+
+
+def field_types(type_name: str, types: Set[str]) -> Tuple[str, str]:
+    """(GraphQL type, TypeScript type) of an attribute; model classes are referenced by name"""
+    try:
+        expr = parse_type(type_name)
+    except TypeSyntaxError:
+        expr = TypeExpr(type_name)
+    kind = GENERIC_KINDS.get(expr.name.lower()) if expr.args else None
+    if kind == 'optional' and len(expr.args) == 1:
+        return field_types(_type_string(expr.args[0]), types)
+    if kind in ('list', 'set') and len(expr.args) == 1 and not expr.args[0].args:
+        item_graphql, item_ts = _named_types(expr.args[0].name, types)
+        return f"[{item_graphql}!]", f"{item_ts}[]"
+    if expr.args:
+        # Maps and nested collections have no GraphQL equivalent; they travel as JSON strings
+        return FALLBACK_SCALAR, 'string'
+    if expr.name.lower() in ('list', 'array', 'set'):
+        return f"[{FALLBACK_SCALAR}!]", 'string[]'
+    return _named_types(expr.name, types)
+
+
+def referenced_type(type_name: str) -> str:
+    """Class an attribute refers to, through Optional, List and Set (List<Order> -> Order)"""
+    try:
+        expr = parse_type(type_name)
+    except TypeSyntaxError:
+        return type_name
+    while expr.args and len(expr.args) == 1 and GENERIC_KINDS.get(expr.name.lower()) in ('optional', 'list', 'set'):
+        expr = expr.args[0]
+    return expr.name
+
+
+def _named_types(name: str, types: Set[str]) -> Tuple[str, str]:
+    if name in types:
+        return name, name
+    scalar = GRAPHQL_SCALARS.get(name.lower(), FALLBACK_SCALAR)
+    if scalar == 'ID':
+        return scalar, 'ID'
+    return scalar, map_type('typescript-json', name if name.lower() in GRAPHQL_SCALARS else 'string')
+
+
+def _type_string(expr: TypeExpr) -> str:
+    if not expr.args:
+        return expr.name
+    return f"{expr.name}<{', '.join(_type_string(arg) for arg in expr.args)}>"
+
+
+def plan_graph(diagram: ClassDiagram) -> List[GraphQLType]:
+    """
+    Object types of a diagram, with an edge field for every mapped relationship
+
+    Relationships are mapped like the JPA associations of the microservice
+    generator (same field names, sides and keys), so the batch queries of the
+    backend stubs match the generated database schema. Attributes holding a
+    class an edge already leads to are left out, like the key attributes a
+    join column replaces: the edge is how clients reach that class.
+    """
+    classes = [cls for cls in diagram.classes if not cls.is_interface]
+    names = {cls.name for cls in classes}
+    mappings = plan_associations(classes, diagram.relationships)
+    diagram_ir = lower(diagram)
+    
+    types = []
+    for cls in classes:
+        mapping = mappings[cls.name]
+        edge_fields = {assoc.field for assoc in mapping.associations}
+        edge_targets = {assoc.target for assoc in mapping.associations}
+        fields = [GraphQLField('id', 'ID!', 'ID')]
+        for attr in diagram_ir.for_class(cls).instance_attributes:
+            if attr.name == 'id' or attr.name in mapping.replaced_attributes or attr.name in edge_fields:
+                continue
+            if referenced_type(attr.data_type) in edge_targets:
+                continue
+            graphql_type, ts_type = field_types(attr.data_type, names)
+            fields.append(GraphQLField(attr.name, graphql_type, ts_type, attr.description or ''))
+        edges = [_edge(cls.name, assoc, mappings) for assoc in mapping.associations]
+        types.append(GraphQLType(cls.name, cls.description or '', fields, edges, not cls.is_abstract))
+    return types
+
+
+def _edge(owner: str, assoc: JpaAssociation, mappings: Dict[str, EntityMapping]) -> GraphQLEdge:
+    target_table = sql_identifier(assoc.target.lower())
+    if not assoc.is_collection:
+        return GraphQLEdge(assoc.field, assoc.target, 'reference', f"{assoc.field}Id",
+                           f"{_lower_first(assoc.target)}ById", 1,
+                           f"SELECT * FROM {target_table} WHERE id = ANY($1) AND deleted_at IS NULL")
+    
+    loader = f"{_lower_first(owner)}{assoc.capitalized}"
+    bound = fanout(assoc.multiplicity)
+    if not assoc.inverse_is_collection:
+        # One-to-many: the children hold the foreign key
+        child_side = _inverse(assoc, mappings)
+        column = physical_name(child_side.join_column)
+        return GraphQLEdge(assoc.field, assoc.target, 'children', 'id', loader, bound,
+                           f"SELECT {column} AS key, * FROM {target_table} "
+                           f"WHERE {column} = ANY($1) AND deleted_at IS NULL")
+    
+    join_table, owner_column, target_column = (assoc if assoc.is_owning else _inverse(assoc, mappings)).join_table
+    key_column, item_column = (owner_column, target_column) if assoc.is_owning else (target_column, owner_column)
+    return GraphQLEdge(assoc.field, assoc.target, 'many-to-many', 'id', loader, bound,
+                       f"SELECT j.{key_column} AS key, t.* FROM {join_table} j "
+                       f"JOIN {target_table} t ON t.id = j.{item_column} "
+                       f"WHERE j.{key_column} = ANY($1) AND t.deleted_at IS NULL")
+
+
+def _inverse(assoc: JpaAssociation, mappings: Dict[str, EntityMapping]) -> JpaAssociation:
+    """The other side of a bidirectional association"""
+    return next(other for other in mappings[assoc.target].associations
+                if other.field == assoc.inverse_field and other.inverse_field == assoc.field)
+
+
+def _lower_first(name: str) -> str:
+    return name[:1].lower() + name[1:]
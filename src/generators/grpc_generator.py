@@ -0,0 +1,235 @@
+"""
+gRPC/Protobuf Generator for Kessel Run Services
+Generates protobuf messages and CRUD services from the model, with Java and Python server and client stubs
+"""
+
+import copy
+import itertools
+import re
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+from .base_generator import BaseGenerator
+from .ir import lower
+from .naming import pluralize
+from .proto_schema import (LOCK_FILE, WELL_KNOWN_IMPORTS, FieldLock, ProtoMessage,
+                           field_name, proto_field_type)
+from .templating import render
+from ..models.class_model import ClassDiagram, ClassDefinition
+
+
+# Id types the generated stores and page tokens know how to handle; others become int64
+ID_TYPES = ('int64', 'int32', 'string')
+
+JAVA_ID_TYPES = {'int64': 'Long', 'int32': 'Integer', 'string': 'String'}
+
+PYTHON_REQUIREMENTS = """grpcio>=1.56,<2
+grpcio-tools>=1.56,<2
+grpcio-health-checking>=1.56,<2
+grpcio-reflection>=1.56,<2
+protobuf>=4.23,<5
+"""
+
+
+class GrpcService(NamedTuple):
+    """CRUD service of one entity, with the names the templates need"""
+    entity: str          # message name, e.g. ShoppingCart
+    plural: str          # ShoppingCarts, in the List rpc and its messages
+    field: str           # request field carrying the entity: shopping_cart
+    plural_field: str    # list response field: shopping_carts
+    java_field: str      # Java accessor stem of field: ShoppingCart
+    java_plural: str     # ShoppingCarts
+    id_type: str         # protobuf type of the id field
+    # Service and request/response message names, unique in the proto package:
+    # ShoppingCartService, GetShoppingCartRequest, ... unless the model already uses them
+    name: str
+    get_request: str
+    list_request: str
+    list_response: str
+    create_request: str
+    update_request: str
+    delete_request: str
+    
+    @property
+    def java_id(self) -> str:
+        return JAVA_ID_TYPES[self.id_type]
+
+
+class GrpcGenerator(BaseGenerator):
+    """Generate gRPC service definitions and stubs for Kessel Run services"""
+    
+    def __init__(self, cache=None):
+        super().__init__(cache)
+        self.proto_package_prefix = "kesselrun"
+        self.java_package_prefix = "mil.af.kesselrun"
+        self.port = 9090
+        # Page size of List calls that do not ask for one, and the most a call may ask for
+        self.default_page_size = 50
+        self.max_page_size = 500
+        # Deadline the generated clients put on every call
+        self.client_deadline_ms = 2000
+        # Field numbers of an earlier run (--proto-lock); the updated lock is written to LOCK_FILE
+        self.field_lock: Optional[FieldLock] = None
+    
+    def stream(self, diagram: ClassDiagram) -> Iterator[Tuple[str, str]]:
+        """Generate the .proto, its field-number lock and the Java and Python stubs, one file at a time"""
+        module = self._module_name(diagram)
+        package = f"{self.proto_package_prefix}.{module}.v1"
+        java_package = f"{self.java_package_prefix}.{module}"
+        proto_path = f"{self.proto_package_prefix}/{module}/v1/{module}.proto"
+        
+        # Work on a copy, so the generator can run again with the same starting lock
+        lock = FieldLock(copy.deepcopy(self.field_lock.messages)) if self.field_lock else FieldLock()
+        messages, services = self._plan_messages(diagram, lock)
+        
+        context = {
+            'title': f"{diagram.name} API",
+            'module': module,
+            'package': package,
+            'java_package': f"{java_package}.v1",
+            'java_base_package': java_package,
+            'proto_path': proto_path,
+            'services': services,
+            'port': self.port,
+            'default_page_size': self.default_page_size,
+            'max_page_size': self.max_page_size,
+            'client_deadline_ms': self.client_deadline_ms,
+            'client_class': f"{self._client_name(diagram)}Client",
+        }
+        
+        yield f"proto/{proto_path}", render('grpc/service.proto.j2', messages=messages,
+                                            imports=self._imports(messages, services), **context)
+        yield LOCK_FILE, lock.dumps()
+        
+        yield from self._generate_java(context)
+        yield from self._generate_python(context)
+        yield "README.md", render('grpc/README.md.j2', **context)
+    
+    def _plan_messages(self, diagram: ClassDiagram,
+                       lock: FieldLock) -> Tuple[List[ProtoMessage], List[GrpcService]]:
+        """
+        Entity messages, then the request/response messages of each entity's service
+
+        Services and their messages share the proto package with the entities, so their
+        names are picked around the entity names (and each other's): a model with both
+        User and UserService gets a UserCrudService.
+        """
+        entities = [cls for cls in diagram.classes if not cls.is_interface]
+        names = {cls.name for cls in entities}
+        diagram_ir = lower(diagram)
+        declared = set(names)
+        
+        messages = []
+        services = []
+        for cls in entities:
+            fields = self._entity_fields(cls, diagram_ir.for_class(cls).instance_attributes, names)
+            messages.append(lock.assign(cls.name, fields, comment=cls.description or ''))
+            if not cls.is_abstract:
+                services.append(self._service(cls, fields[0][1], declared))
+        
+        for service in services:
+            messages.extend(self._service_messages(service, lock))
+        self._check_unique_names(messages, services)
+        return messages, services
+    
+    def _entity_fields(self, cls: ClassDefinition, attributes, messages: Set[str]) -> List[Tuple[str, str, str]]:
+        """(name, type, label) of an entity's fields, its id first"""
+        fields: Dict[str, Tuple[str, str, str]] = {}
+        for attr in attributes:
+            name = field_name(attr.name)
+            if name in fields:
+                continue
+            proto_type, label = proto_field_type(attr.data_type, messages)
+            if name == 'id' and (proto_type not in ID_TYPES or label):
+                proto_type, label = 'int64', ''
+            fields[name] = (name, proto_type, label)
+        id_field = fields.pop('id', ('id', 'int64', ''))
+        return [id_field, *fields.values()]
+    
+    def _service(self, cls: ClassDefinition, id_type: str, declared: Set[str]) -> GrpcService:
+        """Service of an entity, claiming its names in `declared`, the names taken in the proto package"""
+        entity = cls.name
+        plural = pluralize(entity)
+        field = field_name(entity)
+        plural_field = pluralize(field)
+        return GrpcService(
+            entity, plural, field, plural_field, self._java_name(field), self._java_name(plural_field), id_type,
+            name=self._claim(declared, f"{entity}Service", f"{entity}CrudService"),
+            get_request=self._claim(declared, f"Get{entity}Request"),
+            list_request=self._claim(declared, f"List{plural}Request"),
+            list_response=self._claim(declared, f"List{plural}Response"),
+            create_request=self._claim(declared, f"Create{entity}Request"),
+            update_request=self._claim(declared, f"Update{entity}Request"),
+            delete_request=self._claim(declared, f"Delete{entity}Request"),
+        )
+    
+    def _claim(self, declared: Set[str], name: str, *alternatives: str) -> str:
+        """First of the names not declared yet, else `name` with a number (GetUserRequest2); it is then declared"""
+        candidates = itertools.chain((name, *alternatives), (f"{name}{n}" for n in itertools.count(2)))
+        claimed = next(candidate for candidate in candidates if candidate not in declared)
+        declared.add(claimed)
+        return claimed
+    
+    def _check_unique_names(self, messages: List[ProtoMessage], services: List[GrpcService]):
+        """protoc rejects a package declaring a name twice; catch it here rather than in the user's build"""
+        seen: Set[str] = set()
+        for name in [message.name for message in messages] + [service.name for service in services]:
+            if name in seen:
+                raise ValueError(f"gRPC name {name} is declared twice in the proto package")
+            seen.add(name)
+    
+    def _service_messages(self, service: GrpcService, lock: FieldLock) -> List[ProtoMessage]:
+        entity = service.entity
+        return [
+            lock.assign(service.get_request, [('id', service.id_type, '')]),
+            lock.assign(service.list_request, [('page_size', 'int32', ''), ('page_token', 'string', '')],
+                        comment="Keyset page: pass the previous response's next_page_token to continue"),
+            lock.assign(service.list_response, [(service.plural_field, entity, 'repeated'),
+                                                ('next_page_token', 'string', '')],
+                        comment="next_page_token is empty on the last page"),
+            lock.assign(service.create_request, [(service.field, entity, '')]),
+            lock.assign(service.update_request, [(service.field, entity, ''),
+                                                 ('update_mask', 'google.protobuf.FieldMask', '')],
+                        comment="Only the fields in update_mask change; an empty mask replaces the whole entity"),
+            lock.assign(service.delete_request, [('id', service.id_type, '')]),
+        ]
+    
+    def _imports(self, messages: List[ProtoMessage], services: List[GrpcService]) -> List[str]:
+        """Well-known type imports the .proto needs"""
+        used = set()
+        for message in messages:
+            for proto_field in message.fields:
+                for type_name in re.findall(r'[\w.]+', proto_field.type):
+                    used.add(type_name)
+        if services:
+            used.add('google.protobuf.Empty')
+        return sorted(path for type_name, path in WELL_KNOWN_IMPORTS.items() if type_name in used)
+    
+    def _generate_java(self, context: Dict) -> Iterator[Tuple[str, str]]:
+        """Maven module compiling the .proto, with service implementations, a server and a client"""
+        base_dir = f"java/src/main/java/{context['java_base_package'].replace('.', '/')}"
+        yield "java/pom.xml", render('grpc/pom.xml.j2', **context)
+        for service in context['services']:
+            yield (f"{base_dir}/server/{service.name}Impl.java",
+                   render('grpc/service_impl.java.j2', service=service, **context))
+        yield f"{base_dir}/server/GrpcServer.java", render('grpc/server.java.j2', **context)
+        yield (f"{base_dir}/client/{context['client_class']}.java",
+               render('grpc/client.java.j2', **context))
+    
+    def _generate_python(self, context: Dict) -> Iterator[Tuple[str, str]]:
+        """Servicers, a server and a client, on modules generated by grpc_tools.protoc"""
+        yield "python/requirements.txt", PYTHON_REQUIREMENTS
+        yield "python/generate_stubs.sh", render('grpc/generate_stubs.sh.j2', **context)
+        yield "python/server.py", render('grpc/server.py.j2', **context)
+        yield "python/client.py", render('grpc/client.py.j2', **context)
+    
+    def _module_name(self, diagram: ClassDiagram) -> str:
+        """Diagram name as a proto package segment (E-commerce System -> ecommerce_system)"""
+        name = re.sub(r'[^a-z0-9]+', '_', diagram.name.lower().replace('-', '')).strip('_')
+        return name if name and not name[0].isdigit() else f"model_{name}"
+    
+    def _client_name(self, diagram: ClassDiagram) -> str:
+        """Diagram name as a class name prefix (E-commerce System -> ECommerceSystem)"""
+        return ''.join(part[:1].upper() + part[1:] for part in re.split(r'[^A-Za-z0-9]+', diagram.name))
+    
+    def _java_name(self, proto_field: str) -> str:
+        """Accessor stem protoc derives from a field name (shopping_cart -> ShoppingCart)"""
+        return ''.join(part[:1].upper() + part[1:] for part in proto_field.split('_'))
@@ -0,0 +1,114 @@
+"""
+Language-neutral analysis IR shared by all generators
+Lowers a ClassDiagram once into resolved types, dependencies and constructor shapes
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, FrozenSet
+from ..models.class_model import ClassDiagram, ClassDefinition, Attribute, Method, Parameter
+
+
+@dataclass
+class ConstructorShape:
+    """Parameters a generated constructor takes and the attributes they assign"""
+    method: Optional[Method]
+    parameters: List[Parameter]
+    assigned: FrozenSet[str]
+
+
+@dataclass
+class ClassIR:
+    """Lowered form of a single class"""
+    definition: ClassDefinition
+    types: FrozenSet[str]
+    instance_attributes: List[Attribute]
+    static_attributes: List[Attribute]
+    methods: List[Method]
+    has_abstract_methods: bool
+    dependencies: List[ClassDefinition]
+    constructor: ConstructorShape
+
+
+@dataclass
+class DiagramIR:
+    """Lowered form of a whole diagram"""
+    diagram: ClassDiagram
+    classes: List[ClassIR] = field(default_factory=list)
+    _by_identity: Dict[int, ClassIR] = field(default_factory=dict, repr=False)
+    
+    def for_class(self, class_def: ClassDefinition) -> ClassIR:
+        """IR of a class, lowering it on the spot if it is not part of the diagram"""
+        class_ir = self._by_identity.get(id(class_def))
+        if class_ir is None:
+            class_ir = lower_class(class_def, self.diagram)
+        return class_ir
+
+
+def lower(diagram: ClassDiagram) -> DiagramIR:
+    """
+    Lower a diagram into its IR
+
+    The result is memoized alongside the diagram's index, so every generator
+    (and every target of a multi-target run) shares a single lowering pass.
+    """
+    derived = diagram.build_index().derived
+    diagram_ir = derived.get('ir')
+    if diagram_ir is None:
+        diagram_ir = DiagramIR(diagram)
+        for class_def in diagram.classes:
+            class_ir = lower_class(class_def, diagram)
+            diagram_ir.classes.append(class_ir)
+            diagram_ir._by_identity[id(class_def)] = class_ir
+        diagram_ir = derived.setdefault('ir', diagram_ir)
+    return diagram_ir
+
+
+def lower_class(class_def: ClassDefinition, diagram: ClassDiagram) -> ClassIR:
+    """Lower a single class against the diagram it belongs to"""
+    types = set()
+    for attr in class_def.attributes:
+        types.add(attr.data_type)
+    for method in class_def.methods:
+        types.add(method.return_type)
+        for param in method.parameters:
+            types.add(param.data_type)
+    
+    instance_attributes = [attr for attr in class_def.attributes if not attr.is_static]
+    
+    # Classes this one points at through outgoing relationships, in diagram order
+    dependencies = []
+    seen = set()
+    for rel in diagram.get_relationships_for_class(class_def.name):
+        if rel.target_class == class_def.name or rel.target_class in seen:
+            continue
+        related_class = diagram.get_class_by_name(rel.target_class)
+        if related_class:
+            seen.add(rel.target_class)
+            dependencies.append(related_class)
+    
+    return ClassIR(
+        definition=class_def,
+        types=frozenset(types),
+        instance_attributes=instance_attributes,
+        static_attributes=[attr for attr in class_def.attributes if attr.is_static],
+        methods=[method for method in class_def.methods if method.name != '__init__'],
+        has_abstract_methods=any(method.is_abstract for method in class_def.methods),
+        dependencies=dependencies,
+        constructor=_constructor_shape(class_def, instance_attributes),
+    )
+
+
+def _constructor_shape(class_def: ClassDefinition, instance_attributes: List[Attribute]) -> ConstructorShape:
+    """Explicit __init__ parameters, or parameters derived from the instance attributes"""
+    method = next((m for m in class_def.methods if m.name == '__init__'), None)
+    
+    if method and method.parameters:
+        parameters = list(method.parameters)
+    else:
+        parameters = [
+            Parameter(name=attr.name, data_type=attr.data_type, default_value=attr.default_value)
+            for attr in instance_attributes
+        ]
+    
+    assigned = frozenset(param.name for param in method.parameters) if method else frozenset()
+    return ConstructorShape(method=method, parameters=parameters, assigned=assigned)
@@ -3,84 +3,72 @@ Java code generator for class models
 Generates Java classes from UML class diagrams
 """
 
-from typing import List, Dict, Optional
+from typing import Dict, Optional, Iterator, Tuple
+from .base_generator import BaseGenerator
+from .code_writer import CodeWriter
+from .type_mapping import map_type, type_names
+from .ir import ClassIR, lower
 from ..models.class_model import (
     ClassDiagram, ClassDefinition, Attribute, Method, Parameter, 
     Visibility, Relationship
 )
 
 
-class JavaCodeGenerator:
+class JavaCodeGenerator(BaseGenerator):
     """Generates Java code from class models"""
     
-    def __init__(self):
-        self.type_mapping = {
-            'string': 'String',
-            'int': 'int',
-            'integer': 'int',
-            'float': 'float',
-            'double': 'double',
-            'boolean': 'boolean',
-            'bool': 'boolean',
-            'date': 'LocalDate',
-            'datetime': 'LocalDateTime',
-            'list': 'List',
-            'dict': 'Map',
-            'object': 'Object',
-            'void': 'void'
-        }
+    def __init__(self, cache=None):
+        super().__init__(cache)
+        self.type_language = 'java'
         self.required_imports = set()
     
-    def generate(self, diagram: ClassDiagram) -> Dict[str, str]:
-        """Generate Java code for entire diagram"""
-        generated_files = {}
-        
-        # Generate each class
-        for class_def in diagram.classes:
+    def stream(self, diagram: ClassDiagram) -> Iterator[Tuple[str, str]]:
+        """Generate Java code for entire diagram, one file at a time"""
+        # Generate each class, reusing cached output for unchanged classes
+        cache_keys = self._class_cache_keys(diagram)
+        for class_def, cache_key in zip(diagram.classes, cache_keys):
             filename = f"{class_def.name}.java"
-            code = self.generate_class(class_def, diagram)
-            generated_files[filename] = code
-        
-        return generated_files
+            yield filename, self._cached_output(
+                cache_key, lambda: self.generate_class(class_def, diagram))
+    
+    def _cache_options(self) -> Dict[str, str]:
+        """Type mapping affects every generated file"""
+        return {'type_language': self.type_language}
     
     def generate_class(self, class_def: ClassDefinition, diagram: ClassDiagram) -> str:
         """Generate Java code for a single class"""
+        writer = CodeWriter()
+        self.write_class(writer, class_def, diagram)
+        return writer.getvalue()
+    
+    def write_class(self, writer: CodeWriter, class_def: ClassDefinition, diagram: ClassDiagram):
+        """Write Java code for a single class to a code writer"""
         self.required_imports.clear()
-        
-        lines = []
+        class_ir = lower(diagram).for_class(class_def)
         
         # Collect imports
-        self._collect_imports(class_def, diagram)
+        self._collect_imports(class_ir)
         
         # Add package declaration
         if class_def.package:
-            lines.append(f'package {class_def.package};')
-            lines.append('')
+            writer.line(f'package {class_def.package};')
+            writer.line()
         
         # Add imports
         if self.required_imports:
-            for import_stmt in sorted(self.required_imports):
-                lines.append(import_stmt)
-            lines.append('')
+            writer.lines(sorted(self.required_imports))
+            writer.line()
         
         # Add class javadoc
-        lines.append('/**')
-        if class_def.description:
-            lines.append(f' * {class_def.description}')
-        else:
-            lines.append(f' * {class_def.name} class')
-        lines.append(' * Generated from UML model')
-        lines.append(' */')
+        summary = class_def.description or f'{class_def.name} class'
+        writer.lines(('/**', f' * {summary}', ' * Generated from UML model', ' */'))
         
         # Generate class definition
-        class_code = self._generate_class_definition(class_def, diagram)
-        lines.extend(class_code)
-        
-        return '\n'.join(lines)
+        self._write_class_definition(writer, class_ir)
     
-    def _generate_class_definition(self, class_def: ClassDefinition, diagram: ClassDiagram) -> List[str]:
-        """Generate the main class definition"""
-        lines = []
+    def _write_class_definition(self, writer: CodeWriter, class_ir: ClassIR):
+        """Write the main class definition"""
+        class_def = class_ir.definition
         
         # Class modifiers and declaration
         class_line = 'public '
@@ -105,33 +93,26 @@ class JavaCodeGenerator:
                 class_line += f' implements {", ".join(class_def.implemented_interfaces)}'
         
         class_line += ' {'
-        lines.append(class_line)
-        lines.append('')
-        
-        # Generate attributes
-        for attr in class_def.attributes:
-            lines.append(f'    {self._generate_attribute(attr)}')
-        
-        if class_def.attributes:
-            lines.append('')
-        
-        # Generate constructors
-        if not class_def.is_interface:
-            constructor_lines = self._generate_constructors(class_def)
-            if constructor_lines:
-                lines.extend(constructor_lines)
-                lines.append('')
+        writer.lines((class_line, ''))
         
-        # Generate methods
-        for method in class_def.methods:
-            if method.name != '__init__':  # Skip Python-style constructor
-                lines.extend(self._generate_method(method, class_def))
-                lines.append('')
+        with writer.indent():
+            # Generate attributes
+            if class_def.attributes:
+                writer.lines([self._generate_attribute(attr) for attr in class_def.attributes])
+                writer.line()
+            
+            # Generate constructors
+            if not class_def.is_interface:
+                self._write_constructors(writer, class_ir)
+                writer.line()
+            
+            # Generate methods (the Python-style constructor is already lowered out)
+            for method in class_ir.methods:
+                self._write_method(writer, method, class_def)
+                writer.line()
         
         # Close class
-        lines.append('}')
-        
-        return lines
+        writer.line('}')
     
     def _generate_attribute(self, attr: Attribute) -> str:
         """Generate an attribute definition"""
@@ -167,32 +148,27 @@ class JavaCodeGenerator:
         
         return line
     
-    def _generate_constructors(self, class_def: ClassDefinition) -> List[str]:
-        """Generate constructors for the class"""
-        lines = []
+    def _write_constructors(self, writer: CodeWriter, class_ir: ClassIR):
+        """Write constructors for the class"""
+        class_def = class_ir.definition
         
-        # Default constructor
-        lines.append('    /**')
-        lines.append(f'     * Default constructor for {class_def.name}')
-        lines.append('     */')
-        lines.append(f'    public {class_def.name}() {{')
+        # Default constructor, bodies indented relative to the signature
+        lines = ['/**', f' * Default constructor for {class_def.name}', ' */', f'public {class_def.name}() {{']
         
         # Initialize attributes with defaults
-        for attr in class_def.attributes:
-            if not attr.is_static and attr.default_value:
-                lines.append(f'        this.{attr.name} = {attr.default_value};')
+        for attr in class_ir.instance_attributes:
+            if attr.default_value:
+                lines.append(f'    this.{attr.name} = {attr.default_value};')
         
-        lines.append('    }')
-        lines.append('')
+        lines.extend(('}', ''))
         
         # Parameterized constructor (if there are non-static attributes)
-        non_static_attrs = [attr for attr in class_def.attributes if not attr.is_static]
+        non_static_attrs = class_ir.instance_attributes
         if non_static_attrs:
-            lines.append('    /**')
-            lines.append(f'     * Parameterized constructor for {class_def.name}')
+            lines.extend(('/**', f' * Parameterized constructor for {class_def.name}'))
             for attr in non_static_attrs:
-                lines.append(f'     * @param {attr.name} the {attr.name} value')
-            lines.append('     */')
+                lines.append(f' * @param {attr.name} the {attr.name} value')
+            lines.append(' */')
             
             # Constructor signature
             params = []
@@ -200,37 +176,32 @@ class JavaCodeGenerator:
                 java_type = self._map_type(attr.data_type)
                 params.append(f'{java_type} {attr.name}')
             
-            lines.append(f'    public {class_def.name}({", ".join(params)}) {{')
+            lines.append(f'public {class_def.name}({", ".join(params)}) {{')
             
             # Initialize attributes
             for attr in non_static_attrs:
-                lines.append(f'        this.{attr.name} = {attr.name};')
+                lines.append(f'    this.{attr.name} = {attr.name};')
             
-            lines.append('    }')
+            lines.append('}')
         
-        return lines
+        writer.lines(lines)
     
-    def _generate_method(self, method: Method, class_def: ClassDefinition) -> List[str]:
-        """Generate a method definition"""
-        lines = []
-        
+    def _write_method(self, writer: CodeWriter, method: Method, class_def: ClassDefinition):
+        """Write a method definition"""
         # Method javadoc
-        lines.append('    /**')
-        if method.description:
-            lines.append(f'     * {method.description}')
-        else:
-            lines.append(f'     * {method.name.replace("_", " ").title()} method')
+        summary = method.description or f'{method.name.replace("_", " ").title()} method'
+        lines = ['/**', f' * {summary}']
         
         for param in method.parameters:
-            lines.append(f'     * @param {param.name} the {param.name} parameter')
+            lines.append(f' * @param {param.name} the {param.name} parameter')
         
         if method.return_type != 'void':
-            lines.append(f'     * @return {self._map_type(method.return_type)}')
+            lines.append(f' * @return {self._map_type(method.return_type)}')
         
-        lines.append('     */')
+        lines.append(' */')
         
         # Method signature
-        signature = '    '
+        signature = ''
         
         # Visibility
         if method.visibility == Visibility.PUBLIC:
@@ -263,71 +234,59 @@ class JavaCodeGenerator:
         
         # Abstract methods or interface methods don't have body
         if method.is_abstract or class_def.is_interface:
-            signature += ';'
-            lines.append(signature)
+            lines.append(signature + ';')
+            writer.lines(lines)
+            return
+        
+        lines.append(signature + ' {')
+        
+        # Method body, indented relative to the signature
+        if method.body:
+            lines.extend([f'    {line}' if line else '' for line in method.body.split('\n')])
         else:
-            signature += ' {'
-            lines.append(signature)
-            
-            # Method body
-            if method.body:
-                for line in method.body.split('\n'):
-                    lines.append(f'        {line}')
-            else:
-                # Generate basic method body based on method name
-                if method.name.startswith('get'):
-                    attr_name = method.name[3:].lower()
-                    # Find matching attribute
-                    matching_attr = None
-                    for attr in class_def.attributes:
-                        if attr.name.lower() == attr_name:
-                            matching_attr = attr
-                            break
-                    
-                    if matching_attr:
-                        lines.append(f'        return this.{matching_attr.name};')
-                    else:
-                        default_return = self._get_default_value(return_type)
-                        lines.append(f'        return {default_return};')
-                
-                elif method.name.startswith('set'):
-                    attr_name = method.name[3:].lower()
-                    param_name = method.parameters[0].name if method.parameters else 'value'
-                    # Find matching attribute
-                    for attr in class_def.attributes:
-                        if attr.name.lower() == attr_name:
-                            lines.append(f'        this.{attr.name} = {param_name};')
-                            break
-                
-                elif return_type == 'void':
-                    lines.append('        // TODO: Implement method')
+            # Generate basic method body based on method name
+            if method.name.startswith('get'):
+                attr_name = method.name[3:].lower()
+                # Find matching attribute
+                matching_attr = None
+                for attr in class_def.attributes:
+                    if attr.name.lower() == attr_name:
+                        matching_attr = attr
+                        break
                 
+                if matching_attr:
+                    lines.append(f'    return this.{matching_attr.name};')
                 else:
                     default_return = self._get_default_value(return_type)
-                    lines.append(f'        return {default_return};')
+                    lines.append(f'    return {default_return};')
+            
+            elif method.name.startswith('set'):
+                attr_name = method.name[3:].lower()
+                param_name = method.parameters[0].name if method.parameters else 'value'
+                # Find matching attribute
+                for attr in class_def.attributes:
+                    if attr.name.lower() == attr_name:
+                        lines.append(f'    this.{attr.name} = {param_name};')
+                        break
             
-            lines.append('    }')
+            elif return_type == 'void':
+                lines.append('    // TODO: Implement method')
+            
+            else:
+                default_return = self._get_default_value(return_type)
+                lines.append(f'    return {default_return};')
         
-        return lines
+        lines.append('}')
+        writer.lines(lines)
     
-    def _collect_imports(self, class_def: ClassDefinition, diagram: ClassDiagram):
+    def _collect_imports(self, class_ir: ClassIR):
         """Collect required imports for the class"""
-        all_types = set()
-        
-        # Collect types from attributes
-        for attr in class_def.attributes:
-            all_types.add(attr.data_type)
+        # Add required imports based on types, including generic arguments
+        java_names = set()
+        for type_name in class_ir.types:
+            java_names.update(type_names(self.type_language, type_name))
         
-        # Collect types from methods
-        for method in class_def.methods:
-            all_types.add(method.return_type)
-            for param in method.parameters:
-                all_types.add(param.data_type)
-        
-        # Add required imports based on types
-        for type_name in all_types:
-            java_type = self._map_type(type_name)
-            
+        for java_type in java_names:
             if java_type == 'LocalDate':
                 self.required_imports.add('import java.time.LocalDate;')
             elif java_type == 'LocalDateTime':
@@ -338,10 +297,13 @@ class JavaCodeGenerator:
             elif java_type == 'Map':
                 self.required_imports.add('import java.util.Map;')
                 self.required_imports.add('import java.util.HashMap;')
+            elif java_type == 'Set':
+                self.required_imports.add('import java.util.Set;')
+                self.required_imports.add('import java.util.HashSet;')
     
     def _map_type(self, type_name: str) -> str:
         """Map UML types to Java types"""
-        return self.type_mapping.get(type_name.lower(), type_name)
+        return map_type(self.type_language, type_name)
     
     def _get_default_value(self, java_type: str) -> str:
         """Get default value for a Java type"""
@@ -353,11 +315,13 @@ class JavaCodeGenerator:
             'String': '""',
             'List': 'new ArrayList<>()',
             'Map': 'new HashMap<>()',
+            'Set': 'new HashSet<>()',
             'LocalDate': 'LocalDate.now()',
             'LocalDateTime': 'LocalDateTime.now()',
         }
         
-        return defaults.get(java_type, 'null')
+        # Generic types default by their head, e.g. List<Order> -> new ArrayList<>()
+        return defaults.get(java_type.split('<', 1)[0], 'null')
     
     def _to_camel_case(self, name: str) -> str:
         """Convert snake_case to camelCase"""
@@ -0,0 +1,174 @@
+"""
+JPA association planning for the microservice generator
+Turns diagram relationships between the classes of one service into lazy JPA mappings
+"""
+
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from ..models.class_model import ClassDefinition, Relationship
+from .naming import pluralize
+
+
+# Relationship types that become JPA associations; inheritance and dependencies do not
+MAPPED_RELATIONSHIPS = ('association', 'aggregation', 'composition')
+
+_MANY = {'many', '*', 'n', '0..*', '1..*', '0..n', '1..n'}
+
+
+class JpaAssociation(NamedTuple):
+    """One side of a mapped relationship, as declared on an entity"""
+    field: str
+    capitalized: str
+    target: str
+    java_type: str
+    annotations: Tuple[str, ...]
+    is_collection: bool
+    is_owning: bool
+    # Field on the other side, None for unidirectional mappings
+    inverse_field: Optional[str] = None
+    inverse_is_collection: bool = False
+    # Foreign key column of an owning to-one side
+    join_column: Optional[str] = None
+    # (table, owner column, target column) of an owning many-to-many side
+    join_table: Optional[Tuple[str, str, str]] = None
+    # Multiplicity the model gives the target's end, e.g. '0..5' (None when unspecified)
+    multiplicity: Optional[str] = None
+
+
+class EntityMapping(NamedTuple):
+    """Associations of one entity and the attributes its join columns replace"""
+    associations: List[JpaAssociation]
+    replaced_attributes: Set[str]
+    
+    @property
+    def references(self) -> List[JpaAssociation]:
+        """Single-valued associations this entity holds the foreign key for"""
+        return [assoc for assoc in self.associations if not assoc.is_collection and assoc.is_owning]
+    
+    @property
+    def collections(self) -> List[JpaAssociation]:
+        return [assoc for assoc in self.associations if assoc.is_collection]
+
+
+def plan_associations(classes: List[ClassDefinition],
+                      relationships: Iterable[Relationship]) -> Dict[str, EntityMapping]:
+    """
+    Plan the JPA mappings of a service's entities
+
+    Only relationships between classes of the same service are mapped (services
+    refer to each other by id). Every mapping is lazy:
+
+    - many-to-one: @ManyToOne on the "many" side, @OneToMany(mappedBy) back
+    - one-to-one: @OneToOne on the source only, since Hibernate cannot load the
+      mappedBy side of a one-to-one lazily
+    - many-to-many: @ManyToMany with a join table on the source, mappedBy back
+
+    Compositions cascade from the whole (the source) to its parts, with orphan removal.
+
+    Returns:
+        Class name -> mapping, for every class of the service
+    """
+    names = {cls.name for cls in classes}
+    taken: Dict[str, Set[str]] = {cls.name: {attr.name for attr in cls.attributes} for cls in classes}
+    attribute_names = {cls.name: {attr.name for attr in cls.attributes} for cls in classes}
+    plans: Dict[str, EntityMapping] = {cls.name: EntityMapping([], set()) for cls in classes}
+    
+    for rel in relationships:
+        kind = rel.relationship_type.lower()
+        source, target = rel.source_class, rel.target_class
+        if kind not in MAPPED_RELATIONSHIPS or source not in names or target not in names:
+            continue
+        whole_side = kind == 'composition'
+        source_many = _is_many(rel.multiplicity_source, default=False)
+        target_many = _is_many(rel.multiplicity_target, default=kind != 'association')
+        
+        if source_many and target_many:
+            owner_field = _unique_field(pluralize(_lower_first(target)), taken[source])
+            inverse_field = _unique_field(pluralize(_lower_first(source)), taken[target])
+            join_table = f"{_snake_case(source)}_{_snake_case(owner_field)}"
+            owner_column = f"{_snake_case(source)}_id"
+            inverse_column = f"{_snake_case(target)}_id" if source != target else f"related_{_snake_case(target)}_id"
+            _add(plans[source], JpaAssociation(
+                owner_field, _upper_first(owner_field), target, f"Set<{target}>",
+                ("@ManyToMany(fetch = FetchType.LAZY)",
+                 f'@JoinTable(name = "{join_table}",\n'
+                 f'               joinColumns = @JoinColumn(name = "{owner_column}"),\n'
+                 f'               inverseJoinColumns = @JoinColumn(name = "{inverse_column}"))'),
+                True, True, inverse_field, True, join_table=(join_table, owner_column, inverse_column),
+                multiplicity=rel.multiplicity_target))
+            _add(plans[target], JpaAssociation(
+                inverse_field, _upper_first(inverse_field), source, f"Set<{source}>",
+                (f'@ManyToMany(mappedBy = "{owner_field}", fetch = FetchType.LAZY)',),
+                True, False, owner_field, True, multiplicity=rel.multiplicity_source))
+        
+        elif source_many or target_many:
+            # The "many" side holds the foreign key
+            child, parent = (source, target) if source_many else (target, source)
+            child_end, parent_end = ((rel.multiplicity_source, rel.multiplicity_target) if source_many
+                                     else (rel.multiplicity_target, rel.multiplicity_source))
+            reference = _unique_field(_lower_first(parent), taken[child])
+            children = _unique_field(pluralize(_lower_first(child)), taken[parent])
+            join_column = f"{_snake_case(reference)}_id"
+            plans[child].replaced_attributes.update(
+                attribute_names[child] & {join_column, f"{reference}Id"})
+            cascade = ", cascade = CascadeType.ALL, orphanRemoval = true" if whole_side and parent == source else ""
+            _add(plans[child], JpaAssociation(
+                reference, _upper_first(reference), parent, parent,
+                ("@ManyToOne(fetch = FetchType.LAZY)", f'@JoinColumn(name = "{join_column}")'),
+                False, True, children, True, join_column=join_column, multiplicity=parent_end))
+            _add(plans[parent], JpaAssociation(
+                children, _upper_first(children), child, f"Set<{child}>",
+                (f'@OneToMany(mappedBy = "{reference}"{cascade})',),
+                True, False, reference, False, multiplicity=child_end))
+        
+        else:
+            reference = _unique_field(_lower_first(target), taken[source])
+            join_column = f"{_snake_case(reference)}_id"
+            plans[source].replaced_attributes.update(
+                attribute_names[source] & {join_column, f"{reference}Id"})
+            cascade = ", cascade = CascadeType.ALL, orphanRemoval = true" if whole_side else ""
+            _add(plans[source], JpaAssociation(
+                reference, _upper_first(reference), target, target,
+                (f"@OneToOne(fetch = FetchType.LAZY{cascade})", f'@JoinColumn(name = "{join_column}")'),
+                False, True, join_column=join_column, multiplicity=rel.multiplicity_target))
+    
+    return plans
+
+
+def _add(plan: EntityMapping, association: JpaAssociation):
+    plan.associations.append(association)
+
+
+def _is_many(multiplicity: Optional[str], default: bool) -> bool:
+    if not multiplicity:
+        return default
+    multiplicity = multiplicity.strip().lower()
+    if multiplicity in _MANY or multiplicity.endswith('*'):
+        return True
+    # Bounded collections, e.g. '0..5'
+    upper = multiplicity.split('..')[-1].strip()
+    return upper.isdigit() and int(upper) > 1
+
+
+def _unique_field(name: str, taken: Set[str]) -> str:
+    """Field name not used by an attribute or another association of the entity"""
+    field = name
+    suffix = 2
+    while field in taken:
+        field = f"{name}{suffix}"
+        suffix += 1
+    taken.add(field)
+    return field
+
+
+def _lower_first(name: str) -> str:
+    return name[:1].lower() + name[1:]
+
+
+def _upper_first(name: str) -> str:
+    return name[:1].upper() + name[1:]
+
+
+def _snake_case(name: str) -> str:
+    s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)
+    return re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1).lower()
@@ -0,0 +1,161 @@
+"""
+Load-test planning for the OpenAPI generator
+Turns the operations of a spec into the profile the generated Locust suite and mock server run from
+"""
+
+import copy
+import re
+from typing import Any, Dict, List, Optional, Set
+
+from ..models.class_model import ClassDefinition
+
+
+SLO_EXTENSION = "x-slo"
+SCHEMA_REF_PREFIX = "#/components/schemas/"
+HTTP_METHODS = ("get", "post", "put", "patch", "delete")
+
+# Service level objectives of an operation, by kind; the model can tighten them per class
+DEFAULT_SLOS: Dict[str, Dict[str, Any]] = {
+    "read": {"p99Ms": 300, "maxErrorRate": 0.01},
+    "write": {"p99Ms": 800, "maxErrorRate": 0.01},
+}
+
+# Requests per second a resource gets unless its class says otherwise (expected_rps)
+DEFAULT_RESOURCE_RPS = 50.0
+
+# How a resource's traffic splits across its operations
+OPERATION_SHARES = {
+    "list": 0.30,
+    "get": 0.50,
+    "create": 0.10,
+    "update": 0.07,
+    "delete": 0.03,
+}
+WRITE_OPERATIONS = ("create", "update", "delete")
+
+
+def operation_slo(cls: ClassDefinition, operation: str) -> Dict[str, Any]:
+    """
+    x-slo of one CRUD operation of a class
+
+    `p99_ms` and `expected_rps` class annotations (the ones the microservice
+    generator sizes deployments from) override the defaults: the p99 target
+    applies to every operation, and the expected rate is split by OPERATION_SHARES.
+    """
+    slo = dict(DEFAULT_SLOS["write" if operation in WRITE_OPERATIONS else "read"])
+    p99_ms = cls.annotations.get("p99_ms")
+    if isinstance(p99_ms, (int, float)) and not isinstance(p99_ms, bool) and p99_ms > 0:
+        slo["p99Ms"] = int(p99_ms)
+    rps = cls.annotations.get("expected_rps")
+    if not isinstance(rps, (int, float)) or isinstance(rps, bool) or rps <= 0:
+        rps = DEFAULT_RESOURCE_RPS
+    slo["targetRps"] = round(rps * OPERATION_SHARES[operation], 2)
+    return slo
+
+
+def build_load_profile(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Everything the load-test suite needs, with schema $refs resolved
+
+    Returns:
+        {"title", "basePath", "operations": [...]}; each operation has its
+        operationId, method, path (with a regex for the mock server), SLO,
+        request schema and success response (status and schema)
+    """
+    schemas = spec.get("components", {}).get("schemas", {})
+    operations: List[Dict[str, Any]] = []
+    for path, item in spec.get("paths", {}).items():
+        for method in HTTP_METHODS:
+            operation = item.get(method)
+            if not isinstance(operation, dict):
+                continue
+            slo = operation.get(SLO_EXTENSION) or dict(DEFAULT_SLOS["read" if method == "get" else "write"])
+            status, response_schema = _success_response(operation, schemas)
+            operations.append({
+                "operationId": operation.get("operationId") or f"{method} {path}",
+                "tag": (operation.get("tags") or ["default"])[0],
+                "method": method.upper(),
+                "path": path,
+                "pathPattern": _path_pattern(path),
+                "pathParameters": re.findall(r"\{(\w+)\}", path),
+                "queryParameters": _query_defaults(operation, spec),
+                "slo": slo,
+                "requestSchema": _request_schema(operation, schemas),
+                "responseStatus": status,
+                "responseSchema": response_schema,
+            })
+    return {
+        "title": spec.get("info", {}).get("title", "API"),
+        "basePath": _base_path(spec),
+        "operations": operations,
+    }
+
+
+def _base_path(spec: Dict[str, Any]) -> str:
+    """Path prefix of the servers' URLs (/v1 for http://localhost:8080/v1)"""
+    for server in spec.get("servers", []):
+        match = re.match(r"^[a-z]+://[^/]+(/.*)?$", server.get("url", ""))
+        if match:
+            return (match.group(1) or "").rstrip("/")
+    return ""
+
+
+def _path_pattern(path: str) -> str:
+    pattern = re.sub(r"\\\{(\w+)\\\}", r"(?P<\1>[^/]+)", re.escape(path))
+    return f"^{pattern}$"
+
+
+def _query_defaults(operation: Dict[str, Any], spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Query parameters with their default or example values"""
+    parameters = spec.get("components", {}).get("parameters", {})
+    values = {}
+    for parameter in operation.get("parameters", []):
+        ref = parameter.get("$ref", "")
+        if ref.startswith("#/components/parameters/"):
+            parameter = parameters.get(ref.rsplit("/", 1)[1], {})
+        if parameter.get("in") != "query":
+            continue
+        schema = parameter.get("schema", {})
+        value = schema.get("example", schema.get("default"))
+        if value is not None:
+            values[parameter["name"]] = value
+    return values
+
+
+def _request_schema(operation: Dict[str, Any], schemas: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    content = operation.get("requestBody", {}).get("content", {})
+    schema = content.get("application/json", {}).get("schema")
+    return _resolve(schema, schemas, set()) if schema else None
+
+
+def _success_response(operation: Dict[str, Any], schemas: Dict[str, Any]):
+    """Status and schema of the first 2xx response"""
+    for status, response in operation.get("responses", {}).items():
+        if str(status).startswith("2"):
+            schema = response.get("content", {}).get("application/json", {}).get("schema")
+            return int(status), (_resolve(schema, schemas, set()) if schema else None)
+    return 200, None
+
+
+def _resolve(schema: Any, schemas: Dict[str, Any], seen: Set[str]) -> Any:
+    """Copy of a schema with component $refs inlined and allOf merged (cycles become plain objects)"""
+    if isinstance(schema, list):
+        return [_resolve(value, schemas, seen) for value in schema]
+    if not isinstance(schema, dict):
+        return schema
+    
+    ref = schema.get("$ref")
+    if isinstance(ref, str) and ref.startswith(SCHEMA_REF_PREFIX):
+        name = ref[len(SCHEMA_REF_PREFIX):]
+        if name in seen or name not in schemas:
+            return {"type": "object"}
+        return _resolve(schemas[name], schemas, seen | {name})
+    
+    resolved = {key: _resolve(value, schemas, seen) for key, value in schema.items() if key != "allOf"}
+    for part in schema.get("allOf", []):
+        part = _resolve(part, schemas, seen)
+        resolved.setdefault("type", part.get("type", "object"))
+        resolved.setdefault("properties", {}).update(copy.deepcopy(part.get("properties", {})))
+        required = resolved.setdefault("required", [])
+        required.extend(name for name in part.get("required", []) if name not in required)
+    return resolved
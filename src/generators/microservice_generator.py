@@ -3,99 +3,139 @@ Microservices Architecture Generator for Kessel Run
 Generates complete microservice scaffolding with Spring Boot, Docker, and Kubernetes
 """
 
+import json
 import os
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterator, Tuple, NamedTuple
 from .base_generator import BaseGenerator
-from ..models.class_model import ClassDiagram, ClassDefinition
+from .jpa_mapping import EntityMapping, plan_associations
+from .schema_migration import AUDIT_COLUMNS, MIGRATION_DIR, audit_column, jpa_name, plan_schema, table_name
+from .service_config import ServiceConfig, ServiceSettings
+from .service_clustering import Decomposition, decompose
+from .templating import render
+from .type_mapping import map_type
+from ..models.class_model import ClassDiagram, ClassDefinition, Attribute
+
+
+class SpringAttribute(NamedTuple):
+    """Attribute values consumed by the Spring templates (plain attribute access keeps rendering fast)"""
+    name: str
+    java_type: str
+    capitalized: str
+    is_collection: bool = False
+    column: str = ''
+
+
+class Finder(NamedTuple):
+    """A derived findBy{Attribute} repository query"""
+    attribute: SpringAttribute
+    method: str
+    # Whether a findBy{Attribute}Containing substring search comes with it (String attributes only)
+    containing: bool
+
+
+# Attributes that get findBy* repository methods (and the indexes behind them)
+FINDER_ATTRIBUTE_LIMIT = 3
+
+# List views select the id plus this many scalar attributes
+SUMMARY_ATTRIBUTE_LIMIT = 5
+
+# Container sizing of a service pod; the heap is a share of the memory limit (see JAVA_TOOL_OPTIONS)
+JVM_MEMORY = "1Gi"
+JVM_CPU_REQUEST = "500m"
+JVM_CPU_LIMIT = "2"
+JVM_ACTIVE_PROCESSORS = 2
+# Startup budget of 5s x 36 = 3 minutes before Kubernetes restarts the container
+STARTUP_PROBE_FAILURES = 36
+# Heap cap of a native image (75% of JVM_MEMORY, like MaxRAMPercentage on the JVM)
+NATIVE_MAX_HEAP = "768m"
+# Seconds from container start to "Started Application" that the generated CI accepts
+STARTUP_BUDGET_SECONDS = {'cds': 20, 'native': 2}
+
+# Java expressions for valid attribute values in generated test data
+JAVA_SAMPLE_VALUES = {
+    'String': '"sample"',
+    'Integer': '1',
+    'Double': '1.0',
+    'Boolean': 'Boolean.TRUE',
+    'LocalDateTime': 'LocalDateTime.now()',
+    'LocalDate': 'LocalDate.now()',
+    'List<String>': 'new ArrayList<>(List.of("sample"))',
+}
 
 
 class MicroserviceGenerator(BaseGenerator):
     """Generate complete microservice architecture for Kessel Run teams"""
     
-    def __init__(self):
-        super().__init__()
+    def __init__(self, cache=None):
+        super().__init__(cache)
         self.service_port_start = 8080
+        # Bounds on the classes per service; smaller clusters are merged into common services
+        self.max_service_size = 12
+        self.min_service_size = 2
+        # Rows per round trip when streaming NDJSON exports
+        self.export_fetch_size = 1000
+        # Performance profile, pool sizing inputs and cache backend per service (--service-config)
+        self.service_config = ServiceConfig()
         
-    def generate(self, diagram: ClassDiagram) -> Dict[str, str]:
-        """Generate complete microservice architecture"""
-        files = {}
+    def stream(self, diagram: ClassDiagram) -> Iterator[Tuple[str, str]]:
+        """Generate complete microservice architecture, one file at a time"""
+        # Generate a microservice for each cluster of related classes
+        decomposition = decompose(diagram, max_size=self.max_service_size, min_size=self.min_service_size)
+        services = self._identify_services(decomposition)
+        self.service_config.check_services(self._service_name(service) for service in services)
         
-        # Generate a microservice for each major entity
-        services = self._identify_services(diagram)
+        # Why each class landed in its service
+        yield "service-boundaries.json", json.dumps(decomposition.to_dict(), indent=2)
         
         for i, service in enumerate(services):
-            service_name = service['name'].lower().replace(' ', '-')
+            service_name = self._service_name(service)
             service_port = self.service_port_start + i
             
             # Spring Boot Application
-            files.update(self._generate_spring_boot_service(service, service_name, service_port))
+            settings = self.service_config.capacity_for(service_name, service['classes'])
+            yield from self._generate_spring_boot_service(service, service_name, service_port, diagram, settings)
             
             # Docker configuration
-            files.update(self._generate_docker_files(service_name))
+            yield from self._generate_docker_files(service_name, service_port, settings.startup).items()
             
             # Kubernetes manifests
-            files.update(self._generate_k8s_manifests(service, service_name, service_port))
+            yield from self._generate_k8s_manifests(service_name, service_port, settings).items()
             
             # API Gateway configuration
-            files.update(self._generate_api_gateway_config(service, service_name, service_port))
+            yield from self._generate_api_gateway_config(service_name, service_port, service['domain']).items()
             
         # Infrastructure files
-        files.update(self._generate_infrastructure_files(services))
-        
-        return files
+        yield from self._generate_infrastructure_files(services).items()
     
-    def _identify_services(self, diagram: ClassDiagram) -> List[Dict[str, Any]]:
-        """Identify microservices based on domain entities"""
-        services = []
-        
-        # Group related classes into services
-        service_groups = {
-            'user-service': ['User', 'Profile', 'Authentication'],
-            'product-service': ['Product', 'Catalog', 'Inventory'],
-            'order-service': ['Order', 'OrderItem', 'Cart', 'ShoppingCart'],
-            'payment-service': ['Payment', 'Transaction', 'Billing'],
-            'notification-service': ['Notification', 'Email', 'SMS'],
-        }
-        
-        for service_name, class_patterns in service_groups.items():
-            matching_classes = []
-            for cls in diagram.classes:
-                if any(pattern.lower() in cls.name.lower() for pattern in class_patterns):
-                    matching_classes.append(cls)
-            
-            if matching_classes:
-                services.append({
-                    'name': service_name,
-                    'classes': matching_classes,
-                    'domain': service_name.split('-')[0].title()
-                })
-        
-        # Handle remaining classes
-        remaining_classes = [cls for cls in diagram.classes 
-                           if not any(cls in service['classes'] for service in services)]
-        
-        if remaining_classes:
-            services.append({
-                'name': 'common-service',
-                'classes': remaining_classes,
-                'domain': 'Common'
-            })
-        
-        return services
-    
-    def _generate_spring_boot_service(self, service: Dict, service_name: str, port: int) -> Dict[str, str]:
-        """Generate Spring Boot microservice"""
-        files = {}
+    def _service_name(self, service: Dict[str, Any]) -> str:
+        """Name of a service's directory, manifests and --service-config entry"""
+        return service['name'].lower().replace(' ', '-')
+    
+    def _identify_services(self, decomposition: Decomposition) -> List[Dict[str, Any]]:
+        """Identify microservices from the clusters of the relationship graph"""
+        return [
+            {'name': service.name, 'classes': service.classes, 'domain': service.domain}
+            for service in decomposition.services
+        ]
+    
+    def _generate_spring_boot_service(self, service: Dict, service_name: str, port: int,
+                                      diagram: ClassDiagram, settings: ServiceSettings) -> Iterator[Tuple[str, str]]:
+        """Generate Spring Boot microservice, one file at a time"""
         package_name = f"mil.af.kesselrun.{service_name.replace('-', '')}"
+        mappings = plan_associations(service['classes'], diagram.relationships)
+        performance = settings.performance
+        caching = performance.cache != 'none'
+        cache_import = "\nimport org.springframework.cache.annotation.EnableCaching;" if caching else ""
+        cache_annotation = "\n@EnableCaching" if caching else ""
         
         # Application class
-        files[f"{service_name}/src/main/java/{package_name.replace('.', '/')}/Application.java"] = f'''package {package_name};
+        yield f"{service_name}/src/main/java/{package_name.replace('.', '/')}/Application.java", f'''package {package_name};
 
 import org.springframework.boot.SpringApplication;
 import org.springframework.boot.autoconfigure.SpringBootApplication;
 import org.springframework.cloud.client.discovery.EnableDiscoveryClient;
 import org.springframework.cloud.openfeign.EnableFeignClients;
-import org.springframework.data.jpa.repository.config.EnableJpaRepositories;
+import org.springframework.data.jpa.repository.config.EnableJpaRepositories;{cache_import}
 
 /**
  * {service['domain']} Service Application
@@ -104,7 +144,7 @@ import org.springframework.data.jpa.repository.config.EnableJpaRepositories;
 @SpringBootApplication
 @EnableDiscoveryClient
 @EnableFeignClients
-@EnableJpaRepositories
+@EnableJpaRepositories{cache_annotation}
 public class Application {{
     public static void main(String[] args) {{
         SpringApplication.run(Application.class, args);
@@ -112,242 +152,110 @@ public class Application {{
 }}
 '''
         
+        # Redis-backed caches need a serializer that understands the entities
+        if performance.cache == 'redis':
+            yield (f"{service_name}/src/main/java/{package_name.replace('.', '/')}/config/CacheConfig.java",
+                   render('spring/redis_cache_config.java.j2', package_name=package_name,
+                          ttl_seconds=performance.cache_ttl_seconds))
+        
+        # Exits the AppCDS training run once startup is complete
+        if settings.startup == 'cds':
+            yield (f"{service_name}/src/main/java/{package_name.replace('.', '/')}/config/TrainingRun.java",
+                   render('spring/training_run.java.j2', package_name=package_name))
+        
+        # Native image: reflection the AOT step cannot infer from the Spring context
+        if settings.startup == 'native':
+            yield from self._generate_native_hints(service['classes'], package_name, service_name).items()
+        
+        # Keyset page wrapper shared by the list endpoints
+        yield (f"{service_name}/src/main/java/{package_name.replace('.', '/')}/dto/CursorPage.java",
+               render('spring/cursor_page.java.j2', package_name=package_name))
+        
         # Generate entities
         for cls in service['classes']:
-            files.update(self._generate_spring_entity(cls, package_name, service_name))
+            yield from self._generate_spring_entity(cls, mappings[cls.name], package_name, service_name,
+                                                    performance.second_level_cache).items()
+        
+        # Generate list view projections
+        for cls in service['classes']:
+            yield from self._generate_spring_projection(cls, mappings[cls.name], package_name, service_name).items()
         
         # Generate repositories
         for cls in service['classes']:
-            files.update(self._generate_spring_repository(cls, package_name, service_name))
+            yield from self._generate_spring_repository(cls, mappings[cls.name], package_name, service_name).items()
         
         # Generate services
         for cls in service['classes']:
-            files.update(self._generate_spring_service(cls, package_name, service_name))
+            yield from self._generate_spring_service(cls, package_name, service_name, caching).items()
         
         # Generate controllers
         for cls in service['classes']:
-            files.update(self._generate_spring_controller(cls, package_name, service_name))
+            yield from self._generate_spring_controller(cls, package_name, service_name).items()
         
-        # Configuration files
-        files.update(self._generate_spring_config(service_name, port))
+        # Versioned schema migration with the keys and indexes the repositories rely on
+        yield (f"{service_name}/{MIGRATION_DIR}/V1__create_{service_name.replace('-', '_')}_schema.sql",
+               self._generate_migration(service['classes'], mappings, service_name))
         
-        return files
+        # Fetch plan tests for entities with associations
+        yield from self._generate_spring_fetch_tests(service['classes'], mappings, package_name, service_name).items()
+        
+        # Configuration files
+        cache_names = tuple(cls.name.lower() for cls in service['classes'])
+        yield from self._generate_spring_config(service_name, port, settings, cache_names).items()
     
-    def _generate_spring_entity(self, cls: ClassDefinition, package_name: str, service_name: str) -> Dict[str, str]:
+    def _generate_spring_entity(self, cls: ClassDefinition, mapping: EntityMapping, package_name: str,
+                                service_name: str, second_level_cache: bool = False) -> Dict[str, str]:
         """Generate JPA Entity"""
         files = {}
         
-        entity_code = f'''package {package_name}.entity;
-
-import javax.persistence.*;
-import javax.validation.constraints.*;
-import java.time.LocalDateTime;
-import java.util.Objects;
-
-/**
- * {cls.name} Entity
- * Generated for Kessel Run Air Force Mission Systems
- */
-@Entity
-@Table(name = "{cls.name.lower()}")
-public class {cls.name} {{
-    
-    @Id
-    @GeneratedValue(strategy = GenerationType.IDENTITY)
-    private Long id;
-    
-'''
-        
-        # Add attributes
-        for attr in cls.attributes:
-            attr_name = attr.name
-            attr_type = self._map_to_java_type(attr.type)
-            
-            entity_code += f'''    @Column(name = "{attr_name}")
-    @NotNull
-    private {attr_type} {attr_name};
-    
-'''
-        
-        # Add audit fields
-        entity_code += '''    @Column(name = "created_at")
-    private LocalDateTime createdAt;
-    
-    @Column(name = "updated_at")
-    private LocalDateTime updatedAt;
-    
-    @PrePersist
-    protected void onCreate() {
-        createdAt = LocalDateTime.now();
-        updatedAt = LocalDateTime.now();
-    }
-    
-    @PreUpdate
-    protected void onUpdate() {
-        updatedAt = LocalDateTime.now();
-    }
-    
-'''
-        
-        # Generate getters and setters
-        entity_code += "    // Getters and Setters\n"
-        for attr in cls.attributes:
-            attr_name = attr.name
-            attr_type = self._map_to_java_type(attr.type)
-            capitalized = attr_name.capitalize()
-            
-            entity_code += f'''    public {attr_type} get{capitalized}() {{
-        return {attr_name};
-    }}
-    
-    public void set{capitalized}({attr_type} {attr_name}) {{
-        this.{attr_name} = {attr_name};
-    }}
-    
-'''
-        
-        # Add equals, hashCode, toString
-        entity_code += f'''    @Override
-    public boolean equals(Object o) {{
-        if (this == o) return true;
-        if (o == null || getClass() != o.getClass()) return false;
-        {cls.name} entity = ({cls.name}) o;
-        return Objects.equals(id, entity.id);
-    }}
-    
-    @Override
-    public int hashCode() {{
-        return Objects.hash(id);
-    }}
-    
-    @Override
-    public String toString() {{
-        return "{cls.name}{{" +
-                "id=" + id +
-                "}}";
-    }}
-}}
-'''
+        entity_code = render('spring/entity.java.j2', cls=cls, package_name=package_name,
+                             second_level_cache=second_level_cache,
+                             table=table_name(cls), table_literal=jpa_name(table_name(cls)),
+                             attributes=self._entity_attributes(cls, mapping),
+                             audit_accessors=self._audit_accessors(cls),
+                             associations=mapping.associations)
         
         files[f"{service_name}/src/main/java/{package_name.replace('.', '/')}/entity/{cls.name}.java"] = entity_code
         return files
     
-    def _generate_spring_repository(self, cls: ClassDefinition, package_name: str, service_name: str) -> Dict[str, str]:
+    def _generate_spring_repository(self, cls: ClassDefinition, mapping: EntityMapping,
+                                    package_name: str, service_name: str) -> Dict[str, str]:
         """Generate Spring Data JPA Repository"""
         files = {}
         
-        repo_code = f'''package {package_name}.repository;
-
-import {package_name}.entity.{cls.name};
-import org.springframework.data.jpa.repository.JpaRepository;
-import org.springframework.data.jpa.repository.Query;
-import org.springframework.data.repository.query.Param;
-import org.springframework.stereotype.Repository;
-import java.util.List;
-import java.util.Optional;
-
-/**
- * {cls.name} Repository
- * Air Force Kessel Run Data Access Layer
- */
-@Repository
-public interface {cls.name}Repository extends JpaRepository<{cls.name}, Long> {{
-    
-    /**
-     * Find active records
-     */
-    @Query("SELECT e FROM {cls.name} e WHERE e.deletedAt IS NULL")
-    List<{cls.name}> findAllActive();
-    
-    /**
-     * Find by custom criteria
-     */
-'''
+        attributes = self._entity_attributes(cls, mapping)
         
-        # Add finder methods based on attributes
-        for attr in cls.attributes[:3]:  # Limit to first 3 attributes
-            attr_name = attr.name
-            attr_type = self._map_to_java_type(attr.type)
-            capitalized = attr_name.capitalize()
-            
-            repo_code += f'''    Optional<{cls.name}> findBy{capitalized}({attr_type} {attr_name});
-    List<{cls.name}> findBy{capitalized}Containing({attr_type} {attr_name});
+        repo_code = render('spring/repository.java.j2', cls=cls, package_name=package_name,
+                           finders=self._finders(attributes),
+                           # Single records are serialized after their transaction, so value collections load with them
+                           value_paths=', '.join(f'"{attr.name}"' for attr in attributes if attr.is_collection),
+                           export_fetch_size=self.export_fetch_size,
+                           collections=mapping.collections,
+                           reference_paths=', '.join(f'"{assoc.field}"' for assoc in mapping.references))
+        
+        files[f"{service_name}/src/main/java/{package_name.replace('.', '/')}/repository/{cls.name}Repository.java"] = repo_code
+        return files
     
-'''
+    def _generate_spring_projection(self, cls: ClassDefinition, mapping: EntityMapping,
+                                    package_name: str, service_name: str) -> Dict[str, str]:
+        """Generate Spring Data projection for list views"""
+        files = {}
         
-        repo_code += "}\n"
+        # Collections would need a join per row, so list views leave them out
+        scalars = [attr for attr in self._entity_attributes(cls, mapping) if not attr.is_collection]
+        summary_code = render('spring/summary.java.j2', cls=cls, package_name=package_name,
+                              summary_attributes=scalars[:SUMMARY_ATTRIBUTE_LIMIT])
         
-        files[f"{service_name}/src/main/java/{package_name.replace('.', '/')}/repository/{cls.name}Repository.java"] = repo_code
+        files[f"{service_name}/src/main/java/{package_name.replace('.', '/')}/projection/{cls.name}Summary.java"] = summary_code
         return files
     
-    def _generate_spring_service(self, cls: ClassDefinition, package_name: str, service_name: str) -> Dict[str, str]:
+    def _generate_spring_service(self, cls: ClassDefinition, package_name: str, service_name: str,
+                                 caching: bool = False) -> Dict[str, str]:
         """Generate Spring Service Layer"""
         files = {}
         
-        service_code = f'''package {package_name}.service;
-
-import {package_name}.entity.{cls.name};
-import {package_name}.repository.{cls.name}Repository;
-import org.springframework.beans.factory.annotation.Autowired;
-import org.springframework.stereotype.Service;
-import org.springframework.transaction.annotation.Transactional;
-import java.util.List;
-import java.util.Optional;
-
-/**
- * {cls.name} Service
- * Business Logic Layer for Air Force Kessel Run
- */
-@Service
-@Transactional
-public class {cls.name}Service {{
-    
-    @Autowired
-    private {cls.name}Repository repository;
-    
-    /**
-     * Get all active records
-     */
-    @Transactional(readOnly = true)
-    public List<{cls.name}> findAll() {{
-        return repository.findAllActive();
-    }}
-    
-    /**
-     * Get by ID
-     */
-    @Transactional(readOnly = true)
-    public Optional<{cls.name}> findById(Long id) {{
-        return repository.findById(id);
-    }}
-    
-    /**
-     * Create new record
-     */
-    public {cls.name} create({cls.name} entity) {{
-        return repository.save(entity);
-    }}
-    
-    /**
-     * Update existing record
-     */
-    public {cls.name} update(Long id, {cls.name} entity) {{
-        Optional<{cls.name}> existing = repository.findById(id);
-        if (existing.isPresent()) {{
-            entity.setId(id);
-            return repository.save(entity);
-        }}
-        throw new RuntimeException("{cls.name} not found with id: " + id);
-    }}
-    
-    /**
-     * Delete record
-     */
-    public void delete(Long id) {{
-        repository.deleteById(id);
-    }}
-}}
-'''
+        service_code = render('spring/service.java.j2', cls=cls, package_name=package_name,
+                              cache_name=cls.name.lower() if caching else None)
         
         files[f"{service_name}/src/main/java/{package_name.replace('.', '/')}/service/{cls.name}Service.java"] = service_code
         return files
@@ -356,89 +264,149 @@ public class {cls.name}Service {{
         """Generate Spring REST Controller"""
         files = {}
         
-        controller_code = f'''package {package_name}.controller;
-
-import {package_name}.entity.{cls.name};
-import {package_name}.service.{cls.name}Service;
-import org.springframework.beans.factory.annotation.Autowired;
-import org.springframework.http.HttpStatus;
-import org.springframework.http.ResponseEntity;
-import org.springframework.web.bind.annotation.*;
-import javax.validation.Valid;
-import java.util.List;
-import java.util.Optional;
-
-/**
- * {cls.name} REST Controller
- * Air Force Kessel Run API Endpoints
- */
-@RestController
-@RequestMapping("/api/v1/{cls.name.lower()}")
-@CrossOrigin(origins = "*")
-public class {cls.name}Controller {{
-    
-    @Autowired
-    private {cls.name}Service service;
-    
-    /**
-     * Get all records
-     */
-    @GetMapping
-    public ResponseEntity<List<{cls.name}>> getAll() {{
-        List<{cls.name}> entities = service.findAll();
-        return ResponseEntity.ok(entities);
-    }}
-    
-    /**
-     * Get by ID
-     */
-    @GetMapping("/{{id}}")
-    public ResponseEntity<{cls.name}> getById(@PathVariable Long id) {{
-        Optional<{cls.name}> entity = service.findById(id);
-        return entity.map(ResponseEntity::ok)
-                     .orElse(ResponseEntity.notFound().build());
-    }}
+        controller_code = render('spring/controller.java.j2', cls=cls, package_name=package_name)
+        
+        files[f"{service_name}/src/main/java/{package_name.replace('.', '/')}/controller/{cls.name}Controller.java"] = controller_code
+        return files
     
-    /**
-     * Create new record
-     */
-    @PostMapping
-    public ResponseEntity<{cls.name}> create(@Valid @RequestBody {cls.name} entity) {{
-        {cls.name} created = service.create(entity);
-        return ResponseEntity.status(HttpStatus.CREATED).body(created);
-    }}
+    def _generate_migration(self, classes: List[ClassDefinition], mappings: Dict[str, EntityMapping],
+                            service_name: str) -> str:
+        """Generate the Flyway migration creating the service's schema"""
+        attributes = {cls.name: self._entity_attributes(cls, mappings[cls.name]) for cls in classes}
+        finders = {name: self._finders(class_attributes) for name, class_attributes in attributes.items()}
+        schema = plan_schema(classes, mappings, attributes, finders)
+        return render('spring/migration.sql.j2', service_name=service_name, schema=schema)
     
-    /**
-     * Update existing record
-     */
-    @PutMapping("/{{id}}")
-    public ResponseEntity<{cls.name}> update(@PathVariable Long id, 
-                                            @Valid @RequestBody {cls.name} entity) {{
-        try {{
-            {cls.name} updated = service.update(id, entity);
-            return ResponseEntity.ok(updated);
-        }} catch (RuntimeException e) {{
-            return ResponseEntity.notFound().build();
-        }}
-    }}
+    def _generate_spring_fetch_tests(self, classes: List[ClassDefinition], mappings: Dict[str, EntityMapping],
+                                     package_name: str, service_name: str) -> Dict[str, str]:
+        """Generate query-count tests for the association fetch paths"""
+        files = {}
+        mapped = [cls for cls in classes if mappings[cls.name].associations]
+        if not mapped:
+            return files
+        
+        test_dir = f"{service_name}/src/test/java/{package_name.replace('.', '/')}"
+        entities = [
+            (cls.name, [(attr.capitalized, JAVA_SAMPLE_VALUES.get(attr.java_type, '"sample"'))
+                        for attr in self._entity_attributes(cls, mappings[cls.name])])
+            for cls in classes
+        ]
+        files[f"{test_dir}/TestData.java"] = render('spring/test_data.java.j2', package_name=package_name,
+                                                    entities=entities)
+        
+        for cls in mapped:
+            mapping = mappings[cls.name]
+            files[f"{test_dir}/repository/{cls.name}FetchPlanTest.java"] = render(
+                'spring/fetch_plan_test.java.j2', cls=cls, package_name=package_name,
+                collections=mapping.collections, references=mapping.references)
+        return files
     
-    /**
-     * Delete record
-     */
-    @DeleteMapping("/{{id}}")
-    public ResponseEntity<Void> delete(@PathVariable Long id) {{
-        service.delete(id);
-        return ResponseEntity.noContent().build();
-    }}
-}}
-'''
+    def _generate_native_hints(self, classes: List[ClassDefinition], package_name: str,
+                               service_name: str) -> Dict[str, str]:
+        """Generate GraalVM reachability metadata for the service's entities, projections and DTOs"""
+        files = {}
+        hints_dir = f"{service_name}/src/main/resources/META-INF/native-image/mil.af.kesselrun/{service_name}"
+        
+        # Hibernate and Jackson reach entity members reflectively
+        members = {"allDeclaredConstructors": True, "allDeclaredMethods": True, "allDeclaredFields": True}
+        reflection = [{"name": f"{package_name}.entity.{cls.name}", **members} for cls in classes]
+        reflection += [{"name": f"{package_name}.projection.{cls.name}Summary", "allPublicMethods": True}
+                       for cls in classes]
+        reflection.append({"name": f"{package_name}.dto.CursorPage", **members})
+        files[f"{hints_dir}/reflect-config.json"] = json.dumps(reflection, indent=2)
+        
+        # Spring Data implements the summary projections as JDK proxies
+        proxies = [
+            {"interfaces": [f"{package_name}.projection.{cls.name}Summary",
+                            "org.springframework.data.projection.TargetAware",
+                            "org.springframework.aop.SpringProxy",
+                            "org.springframework.core.DecoratingProxy"]}
+            for cls in classes
+        ]
+        files[f"{hints_dir}/proxy-config.json"] = json.dumps(proxies, indent=2)
+        
+        # Flyway scans the classpath for migrations at startup
+        resources = {"resources": {"includes": [{"pattern": r"db/migration/.*\.sql"},
+                                                {"pattern": r"application.*\.yml"}]}}
+        files[f"{hints_dir}/resource-config.json"] = json.dumps(resources, indent=2)
         
-        files[f"{service_name}/src/main/java/{package_name.replace('.', '/')}/controller/{cls.name}Controller.java"] = controller_code
         return files
     
-    def _generate_spring_config(self, service_name: str, port: int) -> Dict[str, str]:
+    def _entity_attributes(self, cls: ClassDefinition, mapping: EntityMapping) -> List["SpringAttribute"]:
+        """Attributes stored as columns, without those a join column replaces or an audit column covers"""
+        return [attr for attr in self._template_attributes(cls.attributes)
+                if attr.name not in mapping.replaced_attributes and not audit_column(cls, attr)]
+    
+    def _audit_accessors(self, cls: ClassDefinition) -> List[str]:
+        """Audit fields the model declares, which keep the getter and setter the model gave them"""
+        columns = {audit_column(cls, attr) for attr in self._template_attributes(cls.attributes)}
+        # deletedAt always has its accessors
+        return [field for column, field in AUDIT_COLUMNS.items() if column in columns and column != 'deleted_at']
+    
+    @staticmethod
+    def _finders(attributes: List[SpringAttribute]) -> List[Finder]:
+        """Derived queries of a repository: the first few scalar attributes, by value and (strings) by substring"""
+        # Spring Data parses the method name back into the property, so only its first letter changes case
+        return [Finder(attr, f"findBy{attr.capitalized}", attr.java_type == 'String')
+                for attr in attributes[:FINDER_ATTRIBUTE_LIMIT] if not attr.is_collection]
+    
+    def _template_attributes(self, attributes: List[Attribute]) -> List["SpringAttribute"]:
+        """Precompute the per-attribute values the Spring templates need"""
+        template_attributes = []
+        for attr in attributes:
+            # Entities carry their own generated Long id
+            if attr.name == 'id':
+                continue
+            java_type = self._map_to_java_type(attr.data_type)
+            template_attributes.append(
+                SpringAttribute(attr.name, java_type, attr.name[:1].upper() + attr.name[1:], '<' in java_type,
+                                jpa_name(attr.name)))
+        return template_attributes
+    
+    @staticmethod
+    def _generate_spring_config(service_name: str, port: int, settings: ServiceSettings,
+                                cache_names: Tuple[str, ...]) -> Dict[str, str]:
         """Generate Spring Boot configuration files"""
         files = {}
+        performance = settings.performance
+        
+        second_level_cache = '''
+        # Entity (second-level) cache; entities opt in with @Cacheable
+        cache:
+          use_second_level_cache: true
+          use_query_cache: false
+          region:
+            factory_class: org.hibernate.cache.jcache.internal.JCacheRegionFactory
+        javax:
+          cache:
+            provider: com.github.benmanes.caffeine.jcache.spi.CaffeineCachingProvider
+            missing_cache_strategy: create''' if performance.second_level_cache else ""
+        shared_cache_mode = '''
+      javax:
+        persistence:
+          sharedCache:
+            mode: ENABLE_SELECTIVE''' if performance.second_level_cache else ""
+        
+        if performance.cache == 'caffeine':
+            spring_cache = f'''
+  cache:
+    type: caffeine
+    cache-names: {','.join(cache_names)}
+    caffeine:
+      spec: maximumSize={performance.cache_max_entries},expireAfterWrite={performance.cache_ttl_seconds}s'''
+        elif performance.cache == 'redis':
+            spring_cache = f'''
+  cache:
+    type: redis
+    cache-names: {','.join(cache_names)}
+  redis:
+    host: ${{REDIS_HOST:localhost}}
+    port: ${{REDIS_PORT:6379}}
+    timeout: 500ms'''
+        else:
+            spring_cache = '''
+  cache:
+    type: none'''
         
         # application.yml
         files[f"{service_name}/src/main/resources/application.yml"] = f'''spring:
@@ -451,14 +419,44 @@ public class {cls.name}Controller {{
     username: kessel_user
     password: kessel_pass
     driver-class-name: org.postgresql.Driver
+    hikari:
+      # Performance profile: {performance.name}
+      # {settings.pool_size} connections x {settings.peak_pods} pods ({settings.max_pods} replicas at most plus rolling-update surge)
+      # stays within the database's {settings.db_max_connections} connections, {settings.db_reserved_connections} kept in reserve
+      maximum-pool-size: {settings.pool_size}
+      minimum-idle: {settings.pool_size}
+      connection-timeout: 3000
+      max-lifetime: 1800000
+      pool-name: {service_name}-pool
+      data-source-properties:
+        # Lets the driver turn batched inserts into multi-row statements
+        reWriteBatchedInserts: true
   jpa:
     hibernate:
-      ddl-auto: update
-    show-sql: true
+      # Flyway owns the schema (db/migration); Hibernate only checks the mappings against it
+      ddl-auto: validate
+    show-sql: {str(performance.show_sql).lower()}
+    open-in-view: false
     properties:
       hibernate:
         dialect: org.hibernate.dialect.PostgreSQLDialect
-        format_sql: true
+        format_sql: {str(performance.show_sql).lower()}
+        # Lazy associations load in batches of ids instead of one query per row
+        default_batch_fetch_size: 16
+        jdbc:
+          batch_size: {performance.jdbc_batch_size}
+        order_inserts: true
+        order_updates: true
+        query:
+          in_clause_parameter_padding: true
+          fail_on_pagination_over_collection_fetch: true{second_level_cache}{shared_cache_mode}{spring_cache}
+  flyway:
+    enabled: true
+    locations: classpath:db/migration
+  mvc:
+    async:
+      # NDJSON exports stream for as long as the table takes
+      request-timeout: 30m
   cloud:
     consul:
       host: localhost
@@ -480,6 +478,9 @@ management:
   endpoint:
     health:
       show-details: always
+      # /actuator/health/liveness and /readiness for the Kubernetes probes
+      probes:
+        enabled: true
 
 logging:
   level:
@@ -501,6 +502,147 @@ kessel-run:
     metrics-path: /metrics
 '''
         
+        if settings.startup == 'cds':
+            # AppCDS training run during the image build: no database, registry or cache server
+            files[f"{service_name}/src/main/resources/application-training.yml"] = '''spring:
+  datasource:
+    url: jdbc:h2:mem:training;MODE=PostgreSQL
+    driver-class-name: org.h2.Driver
+    username: sa
+    password: ""
+  jpa:
+    hibernate:
+      ddl-auto: create-drop
+    properties:
+      hibernate:
+        dialect: org.hibernate.dialect.H2Dialect
+        globally_quoted_identifiers: true
+  flyway:
+    enabled: false
+  cache:
+    type: simple
+  cloud:
+    consul:
+      enabled: false
+'''
+        
+        cache_dependencies = ""
+        if performance.cache == 'caffeine' or performance.second_level_cache:
+            cache_dependencies += '''
+        <dependency>
+            <groupId>com.github.ben-manes.caffeine</groupId>
+            <artifactId>caffeine</artifactId>
+        </dependency>'''
+        if performance.second_level_cache:
+            cache_dependencies += '''
+        <dependency>
+            <groupId>com.github.ben-manes.caffeine</groupId>
+            <artifactId>jcache</artifactId>
+        </dependency>
+        <dependency>
+            <groupId>org.hibernate</groupId>
+            <artifactId>hibernate-jcache</artifactId>
+        </dependency>'''
+        if performance.cache == 'redis':
+            cache_dependencies += '''
+        <dependency>
+            <groupId>org.springframework.boot</groupId>
+            <artifactId>spring-boot-starter-data-redis</artifactId>
+        </dependency>'''
+        
+        # The AppCDS training run starts the service on an in-memory database
+        h2_scope = "runtime" if settings.startup == 'cds' else "test"
+        native_build = f'''
+    
+    <!-- mvn -Pnative package: Spring AOT processing, then a GraalVM native image -->
+    <profiles>
+        <profile>
+            <id>native</id>
+            <dependencies>
+                <dependency>
+                    <groupId>org.springframework.experimental</groupId>
+                    <artifactId>spring-native</artifactId>
+                    <version>${{spring-native.version}}</version>
+                </dependency>
+            </dependencies>
+            <build>
+                <plugins>
+                    <plugin>
+                        <groupId>org.springframework.experimental</groupId>
+                        <artifactId>spring-aot-maven-plugin</artifactId>
+                        <version>${{spring-native.version}}</version>
+                        <executions>
+                            <execution>
+                                <id>generate</id>
+                                <goals>
+                                    <goal>generate</goal>
+                                </goals>
+                            </execution>
+                        </executions>
+                    </plugin>
+                    <!-- Lazy associations cannot use runtime proxies in a native image -->
+                    <plugin>
+                        <groupId>org.hibernate.orm.tooling</groupId>
+                        <artifactId>hibernate-enhance-maven-plugin</artifactId>
+                        <version>${{hibernate.version}}</version>
+                        <executions>
+                            <execution>
+                                <goals>
+                                    <goal>enhance</goal>
+                                </goals>
+                                <configuration>
+                                    <enableLazyInitialization>true</enableLazyInitialization>
+                                    <enableDirtyTracking>true</enableDirtyTracking>
+                                </configuration>
+                            </execution>
+                        </executions>
+                    </plugin>
+                    <plugin>
+                        <groupId>org.graalvm.buildtools</groupId>
+                        <artifactId>native-maven-plugin</artifactId>
+                        <version>${{native-build-tools.version}}</version>
+                        <extensions>true</extensions>
+                        <executions>
+                            <execution>
+                                <id>build-native</id>
+                                <goals>
+                                    <goal>compile-no-fork</goal>
+                                </goals>
+                                <phase>package</phase>
+                            </execution>
+                        </executions>
+                        <configuration>
+                            <imageName>{service_name}</imageName>
+                        </configuration>
+                    </plugin>
+                    <plugin>
+                        <groupId>org.springframework.boot</groupId>
+                        <artifactId>spring-boot-maven-plugin</artifactId>
+                        <configuration>
+                            <classifier>exec</classifier>
+                        </configuration>
+                    </plugin>
+                </plugins>
+            </build>
+        </profile>
+    </profiles>
+    
+    <repositories>
+        <repository>
+            <id>spring-release</id>
+            <url>https://repo.spring.io/release</url>
+        </repository>
+    </repositories>
+    <pluginRepositories>
+        <pluginRepository>
+            <id>spring-release</id>
+            <url>https://repo.spring.io/release</url>
+        </pluginRepository>
+    </pluginRepositories>''' if settings.startup == 'native' else ""
+        native_properties = '''
+        <spring-native.version>0.12.0</spring-native.version>
+        <native-build-tools.version>0.9.13</native-build-tools.version>''' if settings.startup == 'native' else ""
+        
         # pom.xml
         files[f"{service_name}/pom.xml"] = f'''<?xml version="1.0" encoding="UTF-8"?>
 <project xmlns="http://maven.apache.org/POM/4.0.0"
@@ -526,7 +668,7 @@ kessel-run:
     
     <properties>
         <java.version>11</java.version>
-        <spring-cloud.version>2021.0.3</spring-cloud.version>
+        <spring-cloud.version>2021.0.3</spring-cloud.version>{native_properties}
     </properties>
     
     <dependencies>
@@ -551,6 +693,10 @@ kessel-run:
             <groupId>org.springframework.boot</groupId>
             <artifactId>spring-boot-starter-security</artifactId>
         </dependency>
+        <dependency>
+            <groupId>org.springframework.boot</groupId>
+            <artifactId>spring-boot-starter-cache</artifactId>
+        </dependency>{cache_dependencies}
         
         <!-- Spring Cloud -->
         <dependency>
@@ -563,6 +709,10 @@ kessel-run:
         </dependency>
         
         <!-- Database -->
+        <dependency>
+            <groupId>org.flywaydb</groupId>
+            <artifactId>flyway-core</artifactId>
+        </dependency>
         <dependency>
             <groupId>org.postgresql</groupId>
             <artifactId>postgresql</artifactId>
@@ -575,6 +725,11 @@ kessel-run:
             <artifactId>spring-boot-starter-test</artifactId>
             <scope>test</scope>
         </dependency>
+        <dependency>
+            <groupId>com.h2database</groupId>
+            <artifactId>h2</artifactId>
+            <scope>{h2_scope}</scope>
+        </dependency>
         
         <!-- Metrics -->
         <dependency>
@@ -600,20 +755,35 @@ kessel-run:
             <plugin>
                 <groupId>org.springframework.boot</groupId>
                 <artifactId>spring-boot-maven-plugin</artifactId>
+                <configuration>
+                    <!-- Dependencies and application code unpack into separate image layers -->
+                    <layers>
+                        <enabled>true</enabled>
+                    </layers>
+                </configuration>
             </plugin>
         </plugins>
-    </build>
+    </build>{native_build}
 </project>
 '''
         
         return files
     
-    def _generate_docker_files(self, service_name: str) -> Dict[str, str]:
+    @staticmethod
+    def _generate_docker_files(service_name: str, port: int, startup: str = 'jvm') -> Dict[str, str]:
         """Generate Docker configuration"""
         files = {}
         
-        # Dockerfile
-        files[f"{service_name}/Dockerfile"] = f'''FROM openjdk:11-jre-slim
+        # Dockerfile: layered jar with an AppCDS archive, a GraalVM native image, or a plain JVM
+        if startup == 'cds':
+            main_class = f"mil.af.kesselrun.{service_name.replace('-', '')}.Application"
+            files[f"{service_name}/Dockerfile"] = render('startup/Dockerfile.cds.j2', service_name=service_name,
+                                                         port=port, main_class=main_class)
+        elif startup == 'native':
+            files[f"{service_name}/Dockerfile"] = render('startup/Dockerfile.native.j2', service_name=service_name,
+                                                         port=port, max_heap=NATIVE_MAX_HEAP)
+        else:
+            files[f"{service_name}/Dockerfile"] = f'''FROM openjdk:11-jre-slim
 
 # Kessel Run Air Force microservice
 LABEL maintainer="Kessel Run <kessel.run@us.af.mil>"
@@ -646,6 +816,16 @@ HEALTHCHECK --interval=30s --timeout=10s --start-period=60s --retries=3 \\
 ENTRYPOINT ["java", "-jar", "app.jar"]
 '''
         
+        # Startup-time check in CI for the fast-startup images
+        if startup != 'jvm':
+            budget_seconds = STARTUP_BUDGET_SECONDS[startup]
+            files[f"{service_name}/scripts/measure-startup.sh"] = render(
+                'startup/measure_startup.sh.j2', service_name=service_name, mode=startup,
+                database=service_name.replace('-', '_'), budget_seconds=budget_seconds)
+            files[f"{service_name}/.gitlab-ci.yml"] = render(
+                'startup/gitlab_ci.yml.j2', service_name=service_name, budget_seconds=budget_seconds,
+                mode_description="AppCDS" if startup == 'cds' else "native")
+        
         # docker-compose.yml for local development
         files[f"{service_name}/docker-compose.yml"] = f'''version: '3.8'
 
@@ -694,9 +874,24 @@ networks:
         
         return files
     
-    def _generate_k8s_manifests(self, service: Dict, service_name: str, port: int) -> Dict[str, str]:
+    @staticmethod
+    def _generate_k8s_manifests(service_name: str, port: int, settings: ServiceSettings) -> Dict[str, str]:
         """Generate Kubernetes manifests"""
         files = {}
+        # Actuator endpoints live under the servlet context path
+        actuator = f"/{service_name}/actuator"
+        
+        # Container-aware heap: the JVM sizes itself from the memory limit, not the node
+        jvm_options = ["-XX:+UseContainerSupport", "-XX:InitialRAMPercentage=50.0", "-XX:MaxRAMPercentage=75.0",
+                       f"-XX:ActiveProcessorCount={JVM_ACTIVE_PROCESSORS}", "-XX:+UseG1GC",
+                       "-XX:+ExitOnOutOfMemoryError"]
+        if settings.gc_pause_ms:
+            jvm_options.append(f"-XX:MaxGCPauseMillis={settings.gc_pause_ms}")
+        
+        capacity = (f"{settings.expected_rps:g} rps expected" if settings.expected_rps
+                    else "no expected load given")
+        if settings.p99_ms:
+            capacity += f", p99 target {settings.p99_ms}ms"
         
         # Deployment
         files[f"{service_name}/k8s/deployment.yaml"] = f'''apiVersion: apps/v1
@@ -711,7 +906,8 @@ metadata:
   annotations:
     kessel-run.af.mil/service: "{service_name}"
 spec:
-  replicas: 3
+  # Starting size; the HorizontalPodAutoscaler (hpa.yaml) owns it from here
+  replicas: {settings.min_pods}
   selector:
     matchLabels:
       app: {service_name}
@@ -723,7 +919,7 @@ spec:
       annotations:
         prometheus.io/scrape: "true"
         prometheus.io/port: "{port}"
-        prometheus.io/path: "/actuator/prometheus"
+        prometheus.io/path: "{actuator}/prometheus"
     spec:
       serviceAccountName: {service_name}-sa
       securityContext:
@@ -740,6 +936,8 @@ spec:
         env:
         - name: SPRING_PROFILES_ACTIVE
           value: "kubernetes"
+        - name: JAVA_TOOL_OPTIONS
+          value: "{' '.join(jvm_options)}"
         - name: SPRING_DATASOURCE_URL
           valueFrom:
             secretKeyRef:
@@ -755,25 +953,37 @@ spec:
             secretKeyRef:
               name: {service_name}-db-secret
               key: password
+        # Memory request equals the limit so the heap is never overcommitted; the CPU
+        # limit leaves room for JIT compilation while the JVM warms up
         resources:
           requests:
-            memory: "512Mi"
-            cpu: "250m"
+            memory: "{JVM_MEMORY}"
+            cpu: "{JVM_CPU_REQUEST}"
           limits:
-            memory: "1Gi"
-            cpu: "500m"
+            memory: "{JVM_MEMORY}"
+            cpu: "{JVM_CPU_LIMIT}"
+        # Liveness and readiness only start once the application is up, so a slow
+        # cold start is never mistaken for a hung one
+        startupProbe:
+          httpGet:
+            path: {actuator}/health/liveness
+            port: {port}
+          periodSeconds: 5
+          failureThreshold: {STARTUP_PROBE_FAILURES}
         livenessProbe:
           httpGet:
-            path: /actuator/health
+            path: {actuator}/health/liveness
             port: {port}
-          initialDelaySeconds: 60
-          periodSeconds: 30
+          periodSeconds: 10
+          timeoutSeconds: 3
+          failureThreshold: 3
         readinessProbe:
           httpGet:
-            path: /actuator/health/readiness
+            path: {actuator}/health/readiness
             port: {port}
-          initialDelaySeconds: 30
-          periodSeconds: 10
+          periodSeconds: 5
+          timeoutSeconds: 3
+          failureThreshold: 3
         securityContext:
           allowPrivilegeEscalation: false
           readOnlyRootFilesystem: true
@@ -783,6 +993,72 @@ spec:
             - ALL
 '''
         
+        # Autoscaling on CPU and per-pod request rate ({capacity})
+        files[f"{service_name}/k8s/hpa.yaml"] = f'''apiVersion: autoscaling/v2
+kind: HorizontalPodAutoscaler
+metadata:
+  name: {service_name}
+  namespace: kessel-run
+  labels:
+    app: {service_name}
+  annotations:
+    kessel-run.af.mil/capacity: "{capacity}, {settings.pod_rps:g} rps per pod"
+spec:
+  scaleTargetRef:
+    apiVersion: apps/v1
+    kind: Deployment
+    name: {service_name}
+  minReplicas: {settings.min_pods}
+  maxReplicas: {settings.max_pods}
+  metrics:
+  - type: Resource
+    resource:
+      name: cpu
+      target:
+        type: Utilization
+        averageUtilization: {round(settings.target_utilization * 100)}
+  # Served by prometheus-adapter from Micrometer's http_server_requests_seconds_count:
+  #   seriesQuery: 'http_server_requests_seconds_count{{namespace!="",pod!=""}}'
+  #   name: {{as: "http_server_requests_per_second"}}
+  #   metricsQuery: 'sum(rate(<<.Series>>{{<<.LabelMatchers>>}}[1m])) by (<<.GroupBy>>)'
+  - type: Pods
+    pods:
+      metric:
+        name: http_server_requests_per_second
+      target:
+        type: AverageValue
+        averageValue: "{settings.target_pod_rps}"
+  behavior:
+    # New pods need a while to warm up, so scale out early and in slowly
+    scaleUp:
+      stabilizationWindowSeconds: 0
+      policies:
+      - type: Percent
+        value: 100
+        periodSeconds: 30
+    scaleDown:
+      stabilizationWindowSeconds: 300
+      policies:
+      - type: Pods
+        value: 1
+        periodSeconds: 60
+'''
+        
+        # Voluntary disruptions (node drains, upgrades) take down one pod at a time
+        files[f"{service_name}/k8s/pdb.yaml"] = f'''apiVersion: policy/v1
+kind: PodDisruptionBudget
+metadata:
+  name: {service_name}
+  namespace: kessel-run
+  labels:
+    app: {service_name}
+spec:
+  maxUnavailable: 1
+  selector:
+    matchLabels:
+      app: {service_name}
+'''
+        
         # Service
         files[f"{service_name}/k8s/service.yaml"] = f'''apiVersion: v1
 kind: Service
@@ -806,7 +1082,8 @@ spec:
         
         return files
     
-    def _generate_api_gateway_config(self, service: Dict, service_name: str, port: int) -> Dict[str, str]:
+    @staticmethod
+    def _generate_api_gateway_config(service_name: str, port: int, domain: str) -> Dict[str, str]:
         """Generate API Gateway configuration"""
         files = {}
         
@@ -846,7 +1123,7 @@ routes:
 - name: {service_name}-api
   service: {service_name}
   paths:
-  - /api/v1/{service['domain'].lower()}
+  - /api/v1/{domain.lower()}
   methods:
   - GET
   - POST
@@ -983,19 +1260,7 @@ echo "All databases created successfully!"
     
     def _map_to_java_type(self, type_str: str) -> str:
         """Map UML types to Java types"""
-        type_mapping = {
-            'int': 'Integer',
-            'integer': 'Integer',
-            'string': 'String',
-            'float': 'Double',
-            'boolean': 'Boolean',
-            'bool': 'Boolean',
-            'datetime': 'LocalDateTime',
-            'date': 'LocalDate',
-            'list': 'List<String>',
-            'array': 'List<String>'
-        }
-        return type_mapping.get(type_str.lower(), 'String')
+        return map_type('spring', type_str)
 
 
 class BaseGenerator:
@@ -0,0 +1,42 @@
+"""
+Naming helpers shared by generators
+Derives plural names (collection fields, list operations, resource paths) the same way in every target
+"""
+
+import re
+
+
+# Plurals that do not follow the suffix rules, by lower-cased singular
+IRREGULAR_PLURALS = {
+    'person': 'people',
+    'child': 'children',
+}
+
+# The last word of a CamelCase, snake_case or lower-case name
+_LAST_WORD_RE = re.compile(r'([A-Z]?[a-z0-9]+|[A-Z]+)$')
+
+
+def pluralize(name: str) -> str:
+    """
+    English plural of a name's last word, keeping the rest of the name and its case
+
+    Category -> Categories, shipping_address -> shipping_addresses, box -> boxes,
+    SalesPerson -> SalesPeople, OrderItem -> OrderItems
+    """
+    match = _LAST_WORD_RE.search(name)
+    if not match:
+        return f"{name}s"
+    word = match.group(1)
+    irregular = IRREGULAR_PLURALS.get(word.lower())
+    if irregular:
+        plural = irregular.upper() if word.isupper() and len(word) > 1 else word[0] + irregular[1:]
+        return name[:match.start()] + plural
+    if word.isupper() and len(word) > 1:
+        # Acronyms: URL -> URLs
+        return f"{name}s"
+    lower = word.lower()
+    if lower.endswith('y') and len(lower) > 1 and lower[-2] not in 'aeiou':
+        return f"{name[:-1]}ies"
+    if lower.endswith(('s', 'x', 'z', 'ch', 'sh')):
+        return f"{name}es"
+    return f"{name}s"
@@ -4,41 +4,64 @@ Generates complete OpenAPI specifications, client SDKs, and server stubs
 """
 
 import json
-import yaml
-from typing import Dict, List, Any
+import re
+from typing import Dict, List, Any, Iterator, Optional, Tuple
 from .base_generator import BaseGenerator
+from .code_writer import CodeWriter
+from .load_testing import SLO_EXTENSION, build_load_profile, operation_slo
+from .naming import pluralize
+from .schema_dedup import deduplicate_schemas
+from .spec_bundle import INDEX_DOCUMENT, split_spec
+from .spec_serializer import serialize_spec
+from .templating import render
+from .type_mapping import map_type, openapi_schema
 from ..models.class_model import ClassDiagram, ClassDefinition
 
 
 class OpenAPIGenerator(BaseGenerator):
     """Generate OpenAPI specifications and client/server code for Kessel Run"""
     
-    def __init__(self):
-        super().__init__()
+    def __init__(self, cache=None):
+        super().__init__(cache)
         self.api_version = "v1"
+        # Hoist schemas repeated across components (audit fields, links, paging) behind $refs
+        self.dedup_schemas = True
+        # Write the spec as a root document with per-tag path and per-schema files
+        self.split_output = False
         
-    def generate(self, diagram: ClassDiagram) -> Dict[str, str]:
-        """Generate OpenAPI specifications and related files"""
-        files = {}
-        
+    def stream(self, diagram: ClassDiagram) -> Iterator[Tuple[str, str]]:
+        """Generate OpenAPI specifications and related files, one file at a time"""
         # Generate OpenAPI specification
         openapi_spec = self._generate_openapi_spec(diagram)
-        files["api/openapi.yaml"] = yaml.dump(openapi_spec, default_flow_style=False, sort_keys=False)
-        files["api/openapi.json"] = json.dumps(openapi_spec, indent=2)
+        dedup_report = deduplicate_schemas(openapi_spec) if self.dedup_schemas else None
+        if self.split_output:
+            yield from self._generate_split_spec(openapi_spec)
+        else:
+            openapi_yaml, openapi_json = serialize_spec(openapi_spec)
+            yield "api/openapi.yaml", openapi_yaml
+            yield "api/openapi.json", openapi_json
+        if dedup_report is not None:
+            yield "api/schema-dedup-report.json", json.dumps(dedup_report.to_dict(), indent=2)
         
         # Generate client SDKs
-        files.update(self._generate_client_sdks(diagram, openapi_spec))
+        yield from self._generate_client_sdks(diagram, openapi_spec).items()
         
         # Generate server stubs
-        files.update(self._generate_server_stubs(diagram, openapi_spec))
+        yield from self._generate_server_stubs(diagram, openapi_spec).items()
         
         # Generate API documentation
-        files.update(self._generate_api_docs(diagram, openapi_spec))
+        yield from self._generate_api_docs(diagram, openapi_spec).items()
         
         # Generate testing files
-        files.update(self._generate_api_tests(diagram, openapi_spec))
-        
-        return files
+        yield from self._generate_api_tests(diagram, openapi_spec).items()
+    
+    def _generate_split_spec(self, openapi_spec: Dict[str, Any]) -> Iterator[Tuple[str, str]]:
+        """Multi-file spec: openapi.yaml, paths/<Tag>.yaml, components/schemas/<Name>.yaml and index.json"""
+        for path, document in split_spec(openapi_spec).items():
+            if path == INDEX_DOCUMENT:
+                yield f"api/{path}", json.dumps(document, indent=2)
+            else:
+                yield f"api/{path}", serialize_spec(document)[0]
     
     def _generate_openapi_spec(self, diagram: ClassDiagram) -> Dict[str, Any]:
         """Generate complete OpenAPI 3.0 specification"""
@@ -171,7 +194,7 @@ class OpenAPIGenerator(BaseGenerator):
         
         # Add attributes
         for attr in cls.attributes:
-            property_schema = self._map_to_openapi_type(attr.type)
+            property_schema = self._map_to_openapi_type(attr.data_type)
             property_schema["description"] = f"{cls.name} {attr.name}"
             properties[attr.name] = property_schema
             
@@ -266,16 +289,20 @@ class OpenAPIGenerator(BaseGenerator):
     def _generate_paths_for_class(self, cls: ClassDefinition) -> Dict[str, Any]:
         """Generate API paths for a class"""
         paths = {}
-        resource_name = cls.name.lower()
-        resource_path = f"/{resource_name}s"
+        plural = pluralize(cls.name)
+        resource_path = f"/{plural.lower()}"
+        
+        # x-client: how generated clients treat each operation (request coalescing,
+        # response caching, page streaming, cache invalidation)
+        # x-slo: p99 latency, error rate and request rate the load tests hold it to
         
         # Collection endpoints
         paths[resource_path] = {
             "get": {
                 "tags": [cls.name],
-                "summary": f"List all {cls.name}s",
+                "summary": f"List all {plural}",
                 "description": f"Retrieve a paginated list of {cls.name} entities",
-                "operationId": f"list{cls.name}s",
+                "operationId": f"list{plural}",
                 "parameters": [
                     {"$ref": "#/components/parameters/pageParam"},
                     {"$ref": "#/components/parameters/sizeParam"},
@@ -303,7 +330,9 @@ class OpenAPIGenerator(BaseGenerator):
                     "401": {"$ref": "#/components/responses/ErrorResponse"},
                     "500": {"$ref": "#/components/responses/ErrorResponse"}
                 },
-                "security": [{"bearerAuth": []}]
+                "security": [{"bearerAuth": []}],
+                "x-client": {"dedupe": True, "cache": True, "paginate": True},
+                SLO_EXTENSION: operation_slo(cls, "list")
             },
             "post": {
                 "tags": [cls.name],
@@ -332,7 +361,9 @@ class OpenAPIGenerator(BaseGenerator):
                     "409": {"$ref": "#/components/responses/ErrorResponse"},
                     "500": {"$ref": "#/components/responses/ErrorResponse"}
                 },
-                "security": [{"bearerAuth": []}]
+                "security": [{"bearerAuth": []}],
+                "x-client": {"invalidates": [resource_path]},
+                SLO_EXTENSION: operation_slo(cls, "create")
             }
         }
         
@@ -368,7 +399,9 @@ class OpenAPIGenerator(BaseGenerator):
                     "401": {"$ref": "#/components/responses/ErrorResponse"},
                     "500": {"$ref": "#/components/responses/ErrorResponse"}
                 },
-                "security": [{"bearerAuth": []}]
+                "security": [{"bearerAuth": []}],
+                "x-client": {"dedupe": True, "cache": True},
+                SLO_EXTENSION: operation_slo(cls, "get")
             },
             "put": {
                 "tags": [cls.name],
@@ -409,7 +442,9 @@ class OpenAPIGenerator(BaseGenerator):
                     "401": {"$ref": "#/components/responses/ErrorResponse"},
                     "500": {"$ref": "#/components/responses/ErrorResponse"}
                 },
-                "security": [{"bearerAuth": []}]
+                "security": [{"bearerAuth": []}],
+                "x-client": {"invalidates": [resource_path]},
+                SLO_EXTENSION: operation_slo(cls, "update")
             },
             "delete": {
                 "tags": [cls.name],
@@ -436,7 +471,9 @@ class OpenAPIGenerator(BaseGenerator):
                     "401": {"$ref": "#/components/responses/ErrorResponse"},
                     "500": {"$ref": "#/components/responses/ErrorResponse"}
                 },
-                "security": [{"bearerAuth": []}]
+                "security": [{"bearerAuth": []}],
+                "x-client": {"invalidates": [resource_path]},
+                SLO_EXTENSION: operation_slo(cls, "delete")
             }
         }
         
@@ -449,18 +486,24 @@ class OpenAPIGenerator(BaseGenerator):
         # JavaScript/TypeScript client
         files["clients/typescript/api-client.ts"] = self._generate_typescript_client(diagram, spec)
         
-        # Java client
-        files["clients/java/ApiClient.java"] = self._generate_java_client(diagram, spec)
+        # Java client (the public class has to match its file name)
+        files[f"clients/java/{self._client_name(diagram)}ApiClient.java"] = self._generate_java_client(diagram, spec)
+        files.update(self._generate_java_client_models(diagram))
         
-        # Python client
+        # Python clients
         files["clients/python/api_client.py"] = self._generate_python_client(diagram, spec)
+        files["clients/python/async_api_client.py"] = self._generate_python_async_client(diagram, spec)
+        files["clients/python/requirements.txt"] = "requests>=2.31\nhttpx>=0.25\n"
         
         return files
     
     def _generate_typescript_client(self, diagram: ClassDiagram, spec: Dict) -> str:
         """Generate TypeScript API client"""
+        client_name = self._client_name(diagram)
+        behaviors = self._client_behaviors(spec)
+        writer = CodeWriter('  ')
         
-        client_code = f'''/**
+        writer.block(f'''/**
  * {diagram.name} API Client
  * Generated TypeScript client for Air Force Kessel Run
  */
@@ -470,6 +513,23 @@ export interface ApiConfig {{
   apiKey?: string;
   token?: string;
   timeout?: number;
+  // Responses kept by operations with caching on (0 disables the cache)
+  cacheSize?: number;
+}}
+
+export interface RequestOptions {{
+  // Aborts this call; a request shared with other callers is aborted once all of them abort
+  signal?: AbortSignal;
+  // Identical concurrent GETs share one request
+  dedupe?: boolean;
+  // Serve from the LRU response cache, honoring Cache-Control and revalidating with ETag
+  cache?: boolean;
+  // Collection paths whose cached responses a successful call invalidates
+  invalidates?: string[];
+}}
+
+export interface PageOptions extends RequestOptions {{
+  pageSize?: number;
 }}
 
 export interface ApiResponse<T> {{
@@ -501,55 +561,147 @@ export interface PageResponse<T> {{
   last: boolean;
 }}
 
-// Entity interfaces
-'''
+// Entity interfaces''')
         
         # Generate interfaces for each entity
         for cls in diagram.classes:
-            client_code += f'''
-export interface {cls.name} {{
-  id: number;
-'''
-            for attr in cls.attributes:
-                ts_type = self._map_to_typescript_type(attr.type)
-                client_code += f'  {attr.name}: {ts_type};\n'
+            # Same fields as the entity schema; request payloads leave out the server-set ones
+            fields = {"id": "number"}
+            fields.update((attr.name, self._map_to_typescript_type(attr.data_type)) for attr in cls.attributes)
+            fields.update(createdAt="string", updatedAt="string")
+            ts_types = [(name, ts_type) for name, ts_type in fields.items()
+                        if name not in ("id", "createdAt", "updatedAt")]
             
-            client_code += f'''  createdAt: string;
-  updatedAt: string;
-}}
-
-export interface {cls.name}CreateRequest {{
-'''
-            for attr in cls.attributes:
-                ts_type = self._map_to_typescript_type(attr.type)
-                client_code += f'  {attr.name}: {ts_type};\n'
+            writer.line()
+            writer.line(f'export interface {cls.name} {{')
+            with writer.indent():
+                for name, ts_type in fields.items():
+                    writer.line(f'{name}: {ts_type};')
+            writer.line('}')
             
-            client_code += f'''}}
-
-export interface {cls.name}UpdateRequest {{
-'''
-            for attr in cls.attributes:
-                ts_type = self._map_to_typescript_type(attr.type)
-                client_code += f'  {attr.name}?: {ts_type};\n'
+            writer.line()
+            writer.line(f'export interface {cls.name}CreateRequest {{')
+            with writer.indent():
+                for name, ts_type in ts_types:
+                    writer.line(f'{name}: {ts_type};')
+            writer.line('}')
             
-            client_code += '}\n'
+            writer.line()
+            writer.line(f'export interface {cls.name}UpdateRequest {{')
+            with writer.indent():
+                for name, ts_type in ts_types:
+                    writer.line(f'{name}?: {ts_type};')
+            writer.line('}')
+        
+        writer.line()
+        writer.block('''interface CacheEntry {
+  response: ApiResponse<any>;
+  etag?: string;
+  expiresAt: number;
+}
+
+interface SharedRequest {
+  promise: Promise<ApiResponse<any>>;
+  controller: AbortController;
+  waiters: number;
+}
+
+class LruCache<V> {
+  private entries = new Map<string, V>();
+  
+  constructor(private capacity: number) {}
+  
+  get(key: string): V | undefined {
+    const value = this.entries.get(key);
+    if (value !== undefined) {
+      // Map order is recency order: move the entry to the end
+      this.entries.delete(key);
+      this.entries.set(key, value);
+    }
+    return value;
+  }
+  
+  set(key: string, value: V): void {
+    this.entries.delete(key);
+    this.entries.set(key, value);
+    if (this.entries.size > this.capacity) {
+      this.entries.delete(this.entries.keys().next().value as string);
+    }
+  }
+  
+  delete(key: string): void {
+    this.entries.delete(key);
+  }
+  
+  deleteWhere(predicate: (key: string) => boolean): void {
+    for (const key of Array.from(this.entries.keys())) {
+      if (predicate(key)) {
+        this.entries.delete(key);
+      }
+    }
+  }
+}
+
+// Milliseconds a response stays fresh, or null when it must not be stored
+function freshness(headers: Headers): number | null {
+  const cacheControl = headers.get('Cache-Control') || '';
+  if (/(^|,)\\s*no-store\\s*(,|$)/i.test(cacheControl)) {
+    return null;
+  }
+  const maxAge = /(^|,)\\s*max-age\\s*=\\s*(\\d+)/i.exec(cacheControl);
+  return maxAge && !/(^|,)\\s*no-cache\\s*(,|$)/i.test(cacheControl) ? Number(maxAge[2]) * 1000 : 0;
+}
+
+function withTimeout(signal: AbortSignal | undefined, timeout: number): AbortSignal {
+  const timeoutSignal = AbortSignal.timeout(timeout);
+  return signal ? AbortSignal.any([signal, timeoutSignal]) : timeoutSignal;
+}''')
         
         # Generate API client class
-        client_code += f'''
-export class {diagram.name}ApiClient {{
+        writer.line()
+        writer.block(f'''export class {client_name}ApiClient {{
   private config: ApiConfig;
+  private inFlight = new Map<string, SharedRequest>();
+  private cache: LruCache<CacheEntry> | null;
   
   constructor(config: ApiConfig) {{
     this.config = config;
+    const cacheSize = config.cacheSize ?? 500;
+    this.cache = cacheSize > 0 ? new LruCache<CacheEntry>(cacheSize) : null;
+  }}
+  
+  // Drop cached responses: all of them, or those under a collection path
+  clearCache(path?: string): void {{
+    if (path === undefined) {{
+      this.cache?.deleteWhere(() => true);
+    }} else {{
+      this.invalidate([path]);
+    }}
   }}
   
   private async request<T>(
     method: string, 
     path: string, 
     data?: any, 
-    params?: Record<string, any>
+    params?: Record<string, any>,
+    options: RequestOptions = {{}}
   ): Promise<ApiResponse<T>> {{
-    const url = new URL(path, this.config.baseUrl);
+    const url = this.url(path, params);
+    const key = `${{method}} ${{url}}`;
+    const cacheKey = method === 'GET' && options.cache && this.cache ? key : null;
+    
+    const response = method === 'GET' && options.dedupe
+      ? await this.shared<T>(key, url, cacheKey, options.signal)
+      : await this.send<T>(method, url, data, cacheKey, options.signal);
+    
+    if (options.invalidates) {{
+      this.invalidate(options.invalidates);
+    }}
+    return response;
+  }}
+  
+  private url(path: string, params?: Record<string, any>): string {{
+    const url = new URL(this.config.baseUrl.replace(/\\/+$/, '') + path);
     
     if (params) {{
       Object.entries(params).forEach(([key, value]) => {{
@@ -559,6 +711,59 @@ export class {diagram.name}ApiClient {{
       }});
     }}
     
+    return url.toString();
+  }}
+  
+  // Join an identical request already in flight, or start one others can join
+  private shared<T>(key: string, url: string, cacheKey: string | null, signal?: AbortSignal): Promise<ApiResponse<T>> {{
+    let entry = this.inFlight.get(key);
+    if (!entry) {{
+      const controller = new AbortController();
+      const promise = this.send<T>('GET', url, undefined, cacheKey, controller.signal);
+      const shared: SharedRequest = {{ promise, controller, waiters: 0 }};
+      promise.catch(() => undefined).finally(() => {{
+        if (this.inFlight.get(key) === shared) {{
+          this.inFlight.delete(key);
+        }}
+      }});
+      this.inFlight.set(key, shared);
+      entry = shared;
+    }}
+    
+    const joined = entry;
+    if (!signal) {{
+      joined.waiters++;
+      return joined.promise;
+    }}
+    if (signal.aborted) {{
+      return Promise.reject(signal.reason);
+    }}
+    
+    joined.waiters++;
+    return new Promise<ApiResponse<T>>((resolve, reject) => {{
+      const onAbort = () => {{
+        if (--joined.waiters === 0) {{
+          joined.controller.abort(signal.reason);
+        }}
+        reject(signal.reason);
+      }};
+      signal.addEventListener('abort', onAbort, {{ once: true }});
+      joined.promise.then(resolve, reject).finally(() => signal.removeEventListener('abort', onAbort));
+    }});
+  }}
+  
+  private async send<T>(
+    method: string,
+    url: string,
+    data: any,
+    cacheKey: string | null,
+    signal?: AbortSignal
+  ): Promise<ApiResponse<T>> {{
+    const cached = cacheKey ? this.cache!.get(cacheKey) : undefined;
+    if (cached && cached.expiresAt > Date.now()) {{
+      return cached.response;
+    }}
+    
     const headers: Record<string, string> = {{
       'Content-Type': 'application/json',
     }};
@@ -571,114 +776,600 @@ export class {diagram.name}ApiClient {{
       headers['X-API-Key'] = this.config.apiKey;
     }}
     
-    const response = await fetch(url.toString(), {{
+    if (cached?.etag) {{
+      headers['If-None-Match'] = cached.etag;
+    }}
+    
+    const response = await fetch(url, {{
       method,
       headers,
-      body: data ? JSON.stringify(data) : undefined,
-      signal: AbortSignal.timeout(this.config.timeout || 30000)
+      body: data !== undefined ? JSON.stringify(data) : undefined,
+      signal: withTimeout(signal, this.config.timeout || 30000)
     }});
     
-    const responseData = await response.json();
+    // Not modified: the cached copy is fresh again
+    if (response.status === 304 && cached) {{
+      cached.expiresAt = Date.now() + (freshness(response.headers) ?? 0);
+      return cached.response;
+    }}
+    
+    const text = await response.text();
+    const responseData = text ? JSON.parse(text) : undefined;
     
     if (!response.ok) {{
-      throw new Error(`API Error: ${{response.status}} - ${{responseData.error?.message || response.statusText}}`);
+      throw new Error(`API Error: ${{response.status}} - ${{responseData?.error?.message || response.statusText}}`);
     }}
     
-    return {{
+    const result: ApiResponse<T> = {{
       data: responseData,
       status: response.status,
       statusText: response.statusText,
       headers: Object.fromEntries(response.headers.entries())
     }};
-  }}
-'''
-        
-        # Generate methods for each entity
-        for cls in diagram.classes:
-            resource_name = cls.name.lower()
-            client_code += f'''
-  // {cls.name} API methods
-  async list{cls.name}s(page = 0, size = 20, sort?: string): Promise<ApiResponse<PageResponse<{cls.name}>>> {{
-    return this.request('GET', '/{resource_name}s', undefined, {{ page, size, sort }});
+    
+    if (cacheKey) {{
+      const lifetime = freshness(response.headers);
+      const etag = response.headers.get('ETag') || undefined;
+      if (lifetime !== null && (lifetime > 0 || etag)) {{
+        this.cache!.set(cacheKey, {{ response: result, etag, expiresAt: Date.now() + lifetime }});
+      }} else {{
+        this.cache!.delete(cacheKey);
+      }}
+    }}
+    return result;
   }}
   
-  async get{cls.name}(id: number): Promise<ApiResponse<{cls.name}>> {{
-    return this.request('GET', `/{resource_name}s/${{id}}`);
+  private invalidate(paths: string[]): void {{
+    for (const path of paths) {{
+      const prefix = `GET ${{this.url(path)}}`;
+      this.cache?.deleteWhere(key => key === prefix || key.startsWith(prefix + '/') || key.startsWith(prefix + '?'));
+    }}
   }}
   
-  async create{cls.name}(data: {cls.name}CreateRequest): Promise<ApiResponse<{cls.name}>> {{
-    return this.request('POST', '/{resource_name}s', data);
+  // Items of every page as they arrive; the next page is requested while this one is consumed
+  private async *paginate<T>(path: string, params: Record<string, any>, options: PageOptions): AsyncGenerator<T> {{
+    const size = options.pageSize ?? 100;
+    const controller = new AbortController();
+    const signal = options.signal ? AbortSignal.any([options.signal, controller.signal]) : controller.signal;
+    const fetchPage = (page: number) => {{
+      const pending = this.request<PageResponse<T>>('GET', path, undefined, {{ ...params, page, size }}, {{ ...options, signal }});
+      // Observed even if the consumer stops before reaching this page
+      pending.catch(() => undefined);
+      return pending;
+    }};
+    
+    let page = 0;
+    let pending: Promise<ApiResponse<PageResponse<T>>> | null = fetchPage(page);
+    try {{
+      while (pending) {{
+        const {{ data }}: ApiResponse<PageResponse<T>> = await pending;
+        pending = data.content.length > 0 && !data.last ? fetchPage(++page) : null;
+        yield* data.content;
+      }}
+    }} finally {{
+      controller.abort();
+    }}
+  }}''')
+        
+        # Generate methods for each entity, with the per-operation defaults from the spec
+        for cls in diagram.classes:
+            plural = pluralize(cls.name)
+            resource_path = f"/{plural.lower()}"
+            list_options = self._ts_request_options(behaviors.get(f"list{plural}"))
+            writer.line()
+            writer.block(f'''  // {cls.name} API methods
+  async list{plural}(page = 0, size = 20, sort?: string, options?: RequestOptions): Promise<ApiResponse<PageResponse<{cls.name}>>> {{
+    return this.request('GET', '{resource_path}', undefined, {{ page, size, sort }}, {list_options});
+  }}''')
+            if behaviors.get(f"list{plural}", {}).get("paginate"):
+                writer.line()
+                writer.block(f'''  iterate{plural}(sort?: string, options?: PageOptions): AsyncGenerator<{cls.name}> {{
+    return this.paginate<{cls.name}>('{resource_path}', {{ sort }}, {list_options});
+  }}''')
+            writer.line()
+            writer.block(f'''  async get{cls.name}(id: number, options?: RequestOptions): Promise<ApiResponse<{cls.name}>> {{
+    return this.request('GET', `{resource_path}/${{id}}`, undefined, undefined, {self._ts_request_options(behaviors.get(f"get{cls.name}ById"))});
   }}
   
-  async update{cls.name}(id: number, data: {cls.name}UpdateRequest): Promise<ApiResponse<{cls.name}>> {{
-    return this.request('PUT', `/{resource_name}s/${{id}}`, data);
+  async create{cls.name}(data: {cls.name}CreateRequest, options?: RequestOptions): Promise<ApiResponse<{cls.name}>> {{
+    return this.request('POST', '{resource_path}', data, undefined, {self._ts_request_options(behaviors.get(f"create{cls.name}"))});
   }}
   
-  async delete{cls.name}(id: number): Promise<ApiResponse<void>> {{
-    return this.request('DELETE', `/{resource_name}s/${{id}}`);
+  async update{cls.name}(id: number, data: {cls.name}UpdateRequest, options?: RequestOptions): Promise<ApiResponse<{cls.name}>> {{
+    return this.request('PUT', `{resource_path}/${{id}}`, data, undefined, {self._ts_request_options(behaviors.get(f"update{cls.name}"))});
   }}
-'''
+  
+  async delete{cls.name}(id: number, options?: RequestOptions): Promise<ApiResponse<void>> {{
+    return this.request('DELETE', `{resource_path}/${{id}}`, undefined, undefined, {self._ts_request_options(behaviors.get(f"delete{cls.name}"))});
+  }}''')
         
-        client_code += '}\n'
-        return client_code
+        writer.line('}')
+        writer.line()
+        return writer.getvalue()
+    
+    def _client_behaviors(self, spec: Dict) -> Dict[str, Dict[str, Any]]:
+        """operationId -> x-client settings of every operation in the spec"""
+        behaviors = {}
+        for path_item in spec.get("paths", {}).values():
+            for operation in path_item.values():
+                if isinstance(operation, dict) and "operationId" in operation:
+                    behaviors[operation["operationId"]] = operation.get("x-client", {})
+        return behaviors
+    
+    def _ts_request_options(self, behavior: Optional[Dict[str, Any]]) -> str:
+        """RequestOptions literal with an operation's x-client defaults, overridable by the caller"""
+        defaults = [f"{key}: {json.dumps(value)}" for key, value in (behavior or {}).items()
+                    if key in ("dedupe", "cache", "invalidates")]
+        return f"{{ {', '.join(defaults + ['...options'])} }}"
     
     def _generate_java_client(self, diagram: ClassDiagram, spec: Dict) -> str:
         """Generate Java API client"""
+        client_name = self._client_name(diagram)
+        writer = CodeWriter()
         
-        return f'''package mil.af.kesselrun.client;
+        writer.block(f'''package mil.af.kesselrun.client;
 
-import java.util.List;
-import java.util.concurrent.CompletableFuture;
+import com.fasterxml.jackson.core.JsonParser;
+import com.fasterxml.jackson.core.JsonToken;
+import com.fasterxml.jackson.databind.DeserializationFeature;
+import com.fasterxml.jackson.databind.JavaType;
+import com.fasterxml.jackson.databind.ObjectMapper;
+import com.fasterxml.jackson.datatype.jsr310.JavaTimeModule;
+import mil.af.kesselrun.client.model.*;
+
+import java.io.IOException;
+import java.io.InputStream;
+import java.io.InterruptedIOException;
+import java.io.UncheckedIOException;
+import java.net.URI;
+import java.net.URLEncoder;
 import java.net.http.HttpClient;
 import java.net.http.HttpRequest;
 import java.net.http.HttpResponse;
-import java.net.URI;
+import java.nio.charset.StandardCharsets;
 import java.time.Duration;
-import com.fasterxml.jackson.databind.ObjectMapper;
-import com.fasterxml.jackson.datatype.jsr310.JavaTimeModule;
+import java.util.Iterator;
+import java.util.NoSuchElementException;
+import java.util.Spliterator;
+import java.util.Spliterators;
+import java.util.concurrent.CompletableFuture;
+import java.util.concurrent.Executor;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.stream.Stream;
+import java.util.stream.StreamSupport;
 
 /**
  * {diagram.name} API Client for Air Force Kessel Run
- * Generated Java client for mission-critical systems
+ * Generated Java client on java.net.http: HTTP/2 multiplexing, a CompletableFuture
+ * method per operation, and pages streamed item by item through Jackson
  */
-public class {diagram.name}ApiClient {{
+public class {client_name}ApiClient implements AutoCloseable {{
     
+    private final Config config;
     private final HttpClient httpClient;
     private final ObjectMapper objectMapper;
-    private final String baseUrl;
-    private final String apiKey;
-    private final String token;
-    
-    public {diagram.name}ApiClient(String baseUrl, String token) {{
-        this.baseUrl = baseUrl;
-        this.token = token;
-        this.apiKey = null;
+    private final ExecutorService ownedExecutor;
+    
+    public {client_name}ApiClient(Config config) {{
+        this.config = config;
+        this.ownedExecutor = config.executor == null ? Executors.newFixedThreadPool(config.threads) : null;
         this.httpClient = HttpClient.newBuilder()
-            .connectTimeout(Duration.ofSeconds(30))
+            .version(config.httpVersion)
+            .connectTimeout(config.connectTimeout)
+            .followRedirects(HttpClient.Redirect.NORMAL)
+            .executor(config.executor != null ? config.executor : ownedExecutor)
             .build();
-        this.objectMapper = new ObjectMapper();
-        this.objectMapper.registerModule(new JavaTimeModule());
+        this.objectMapper = new ObjectMapper()
+            .registerModule(new JavaTimeModule())
+            .configure(DeserializationFeature.FAIL_ON_UNKNOWN_PROPERTIES, false);
     }}
     
-    public {diagram.name}ApiClient(String baseUrl, String apiKey, String token) {{
-        this.baseUrl = baseUrl;
-        this.token = token;
-        this.apiKey = apiKey;
-        this.httpClient = HttpClient.newBuilder()
-            .connectTimeout(Duration.ofSeconds(30))
-            .build();
-        this.objectMapper = new ObjectMapper();
-        this.objectMapper.registerModule(new JavaTimeModule());
+    public {client_name}ApiClient(String baseUrl, String token) {{
+        this(Config.builder(baseUrl).token(token).build());
     }}
     
-    // Implementation methods would be generated here for each entity
-    // This is a simplified example showing the structure
+    /**
+     * Client settings. Requests share the JDK client's connections: over HTTP/2 they are
+     * multiplexed on one connection per host. Its HTTP/1.1 pool is sized through the
+     * jdk.httpclient.connectionPoolSize and jdk.httpclient.keepalive.timeout system properties.
+     */
+    public static final class Config {{
+        private final String baseUrl;
+        private final String token;
+        private final String apiKey;
+        private final HttpClient.Version httpVersion;
+        private final Duration connectTimeout;
+        private final Duration requestTimeout;
+        private final Executor executor;
+        private final int threads;
+        
+        private Config(Builder builder) {{
+            this.baseUrl = builder.baseUrl.replaceAll("/+$", "");
+            this.token = builder.token;
+            this.apiKey = builder.apiKey;
+            this.httpVersion = builder.httpVersion;
+            this.connectTimeout = builder.connectTimeout;
+            this.requestTimeout = builder.requestTimeout;
+            this.executor = builder.executor;
+            this.threads = builder.threads;
+        }}
+        
+        public static Builder builder(String baseUrl) {{
+            return new Builder(baseUrl);
+        }}
+        
+        public static final class Builder {{
+            private final String baseUrl;
+            private String token;
+            private String apiKey;
+            private HttpClient.Version httpVersion = HttpClient.Version.HTTP_2;
+            private Duration connectTimeout = Duration.ofSeconds(10);
+            private Duration requestTimeout = Duration.ofSeconds(30);
+            private Executor executor;
+            private int threads = Math.max(2, Runtime.getRuntime().availableProcessors());
+            
+            private Builder(String baseUrl) {{
+                this.baseUrl = baseUrl;
+            }}
+            
+            public Builder token(String token) {{ this.token = token; return this; }}
+            
+            public Builder apiKey(String apiKey) {{ this.apiKey = apiKey; return this; }}
+            
+            /** HTTP_2 (default; falls back to HTTP/1.1 if the server does not offer it) or HTTP_1_1 */
+            public Builder httpVersion(HttpClient.Version httpVersion) {{ this.httpVersion = httpVersion; return this; }}
+            
+            public Builder connectTimeout(Duration connectTimeout) {{ this.connectTimeout = connectTimeout; return this; }}
+            
+            public Builder requestTimeout(Duration requestTimeout) {{ this.requestTimeout = requestTimeout; return this; }}
+            
+            /** Executor for response handling and dependent stages; the caller keeps ownership */
+            public Builder executor(Executor executor) {{ this.executor = executor; return this; }}
+            
+            /** Size of the client's own fixed pool, used when no executor is given */
+            public Builder threads(int threads) {{ this.threads = threads; return this; }}
+            
+            public Config build() {{
+                return new Config(this);
+            }}
+        }}
+    }}
     
+    /** Error response from the API */
+    public static class ApiException extends RuntimeException {{
+        private final int status;
+        private final String body;
+        
+        public ApiException(int status, String body) {{
+            super("API Error: " + status + " - " + body);
+            this.status = status;
+            this.body = body;
+        }}
+        
+        public int getStatus() {{ return status; }}
+        
+        public String getBody() {{ return body; }}
+    }}''')
+        
+        for cls in diagram.classes:
+            name = cls.name
+            plural = pluralize(name)
+            path = f"/{plural.lower()}"
+            writer.line()
+            with writer.indent():
+                writer.block(f'''// {name} API methods
+
+public CompletableFuture<PageResponse<{name}>> list{plural}Async(int page, int size, String sort) {{
+    return send(request("{path}?page=" + page + "&size=" + size + sortParam(sort)).GET().build(), pageType({name}.class));
+}}
+
+/** Every {name}, read page by page and item by item; close the stream if it is not consumed to the end */
+public Stream<{name}> stream{plural}(String sort, int pageSize) {{
+    return streamPages("{path}", sortParam(sort), pageSize, {name}.class);
+}}
+
+public CompletableFuture<{name}> get{name}Async(long id) {{
+    return send(request("{path}/" + id).GET().build(), type({name}.class));
 }}
+
+public CompletableFuture<{name}> create{name}Async({name}CreateRequest body) {{
+    return send(request("{path}").header("Content-Type", "application/json").POST(json(body)).build(), type({name}.class));
+}}
+
+public CompletableFuture<{name}> update{name}Async(long id, {name}UpdateRequest body) {{
+    return send(request("{path}/" + id).header("Content-Type", "application/json").PUT(json(body)).build(), type({name}.class));
+}}
+
+public CompletableFuture<Void> delete{name}Async(long id) {{
+    return send(request("{path}/" + id).DELETE().build(), null);
+}}''')
+        
+        writer.line()
+        writer.block('''    public CompletableFuture<String> healthCheckAsync() {
+        return httpClient.sendAsync(request("/health").GET().build(), HttpResponse.BodyHandlers.ofString())
+            .thenApply(response -> {
+                if (response.statusCode() >= 400) {
+                    throw new ApiException(response.statusCode(), response.body());
+                }
+                return response.body();
+            });
+    }
+    
+    /** Shuts down the client's own executor (a configured one is left to its owner) */
+    @Override
+    public void close() {
+        if (ownedExecutor != null) {
+            ownedExecutor.shutdown();
+        }
+    }
+    
+    private HttpRequest.Builder request(String path) {
+        HttpRequest.Builder builder = HttpRequest.newBuilder(URI.create(config.baseUrl + path))
+            .timeout(config.requestTimeout)
+            .header("Accept", "application/json");
+        if (config.token != null) {
+            builder.header("Authorization", "Bearer " + config.token);
+        }
+        if (config.apiKey != null) {
+            builder.header("X-API-Key", config.apiKey);
+        }
+        return builder;
+    }
+    
+    private <T> CompletableFuture<T> send(HttpRequest request, JavaType type) {
+        return httpClient.sendAsync(request, HttpResponse.BodyHandlers.ofByteArray())
+            .thenApply(response -> {
+                byte[] body = response.body();
+                if (response.statusCode() >= 400) {
+                    throw new ApiException(response.statusCode(), new String(body, StandardCharsets.UTF_8));
+                }
+                if (type == null || body.length == 0) {
+                    return null;
+                }
+                try {
+                    return objectMapper.<T>readValue(body, type);
+                } catch (IOException e) {
+                    throw new UncheckedIOException(e);
+                }
+            });
+    }
+    
+    private HttpRequest.BodyPublisher json(Object body) {
+        try {
+            return HttpRequest.BodyPublishers.ofByteArray(objectMapper.writeValueAsBytes(body));
+        } catch (IOException e) {
+            throw new UncheckedIOException(e);
+        }
+    }
+    
+    private JavaType type(Class<?> type) {
+        return objectMapper.constructType(type);
+    }
+    
+    private JavaType pageType(Class<?> itemType) {
+        return objectMapper.getTypeFactory().constructParametricType(PageResponse.class, itemType);
+    }
+    
+    private static String sortParam(String sort) {
+        return sort == null ? "" : "&sort=" + URLEncoder.encode(sort, StandardCharsets.UTF_8);
+    }
+    
+    private <T> Stream<T> streamPages(String path, String query, int pageSize, Class<T> itemType) {
+        PageIterator<T> iterator = new PageIterator<>(path, query, pageSize, type(itemType));
+        return StreamSupport.stream(
+                Spliterators.spliteratorUnknownSize(iterator, Spliterator.ORDERED | Spliterator.NONNULL), false)
+            .onClose(iterator::close);
+    }
+    
+    /**
+     * Items of successive pages, each deserialized straight from the response stream,
+     * so only one item (not a whole page) is held in memory at a time
+     */
+    private final class PageIterator<T> implements Iterator<T>, AutoCloseable {
+        private final String path;
+        private final String query;
+        private final int pageSize;
+        private final JavaType itemType;
+        private int page = 0;
+        private int itemsInPage;
+        private Boolean lastPage;
+        // Positioned inside the content array of the current page; null between pages
+        private JsonParser parser;
+        private T next;
+        private boolean done;
+        
+        PageIterator(String path, String query, int pageSize, JavaType itemType) {
+            this.path = path;
+            this.query = query;
+            this.pageSize = pageSize;
+            this.itemType = itemType;
+        }
+        
+        @Override
+        public boolean hasNext() {
+            if (next == null && !done) {
+                next = advance();
+            }
+            return next != null;
+        }
+        
+        @Override
+        public T next() {
+            if (!hasNext()) {
+                throw new NoSuchElementException();
+            }
+            T item = next;
+            next = null;
+            return item;
+        }
+        
+        @Override
+        public void close() {
+            done = true;
+            closeParser();
+        }
+        
+        private T advance() {
+            try {
+                while (true) {
+                    if (parser == null) {
+                        if (Boolean.TRUE.equals(lastPage)) {
+                            done = true;
+                            return null;
+                        }
+                        openPage();
+                        continue;
+                    }
+                    JsonToken token = parser.nextToken();
+                    if (token == JsonToken.END_ARRAY) {
+                        finishPage();
+                    } else if (token != JsonToken.VALUE_NULL) {
+                        itemsInPage++;
+                        return objectMapper.readValue(parser, itemType);
+                    }
+                }
+            } catch (IOException e) {
+                close();
+                throw new UncheckedIOException(e);
+            } catch (RuntimeException e) {
+                close();
+                throw e;
+            }
+        }
+        
+        private void openPage() throws IOException {
+            HttpRequest request = request(path + "?page=" + page + "&size=" + pageSize + query).GET().build();
+            HttpResponse<InputStream> response;
+            try {
+                response = httpClient.send(request, HttpResponse.BodyHandlers.ofInputStream());
+            } catch (InterruptedException e) {
+                Thread.currentThread().interrupt();
+                throw new InterruptedIOException("Interrupted while requesting " + path);
+            }
+            if (response.statusCode() >= 400) {
+                try (InputStream body = response.body()) {
+                    throw new ApiException(response.statusCode(), new String(body.readAllBytes(), StandardCharsets.UTF_8));
+                }
+            }
+            
+            parser = objectMapper.createParser(response.body());
+            itemsInPage = 0;
+            lastPage = null;
+            if (parser.nextToken() != JsonToken.START_OBJECT) {
+                throw new IOException("Expected a page object from " + path);
+            }
+            // Fields before the content array are read as they come
+            while (parser.nextToken() == JsonToken.FIELD_NAME) {
+                String field = parser.currentName();
+                JsonToken value = parser.nextToken();
+                if ("content".equals(field) && value == JsonToken.START_ARRAY) {
+                    return;
+                }
+                readPageField(field, value);
+            }
+            // No content array: nothing (more) to read
+            closeParser();
+            lastPage = true;
+        }
+        
+        private void finishPage() throws IOException {
+            // The remaining fields tell whether this was the last page
+            while (parser.nextToken() == JsonToken.FIELD_NAME) {
+                String field = parser.currentName();
+                readPageField(field, parser.nextToken());
+            }
+            closeParser();
+            if (itemsInPage == 0) {
+                lastPage = true;
+            } else if (lastPage == null) {
+                lastPage = itemsInPage < pageSize;
+            }
+            page++;
+        }
+        
+        private void readPageField(String field, JsonToken value) throws IOException {
+            if ("last".equals(field)) {
+                lastPage = value == JsonToken.VALUE_TRUE;
+            }
+            parser.skipChildren();
+        }
+        
+        private void closeParser() {
+            if (parser != null) {
+                try {
+                    // Also closes the response body, releasing the connection
+                    parser.close();
+                } catch (IOException ignored) {
+                    // Nothing left to read from it
+                } finally {
+                    parser = null;
+                }
+            }
+        }
+    }
+}''')
+        writer.line()
+        return writer.getvalue()
+    
+    def _generate_java_client_models(self, diagram: ClassDiagram) -> Dict[str, str]:
+        """Generate Jackson-mapped records for the Java client's payloads"""
+        files = {}
+        header = '''package mil.af.kesselrun.client.model;
+
+import com.fasterxml.jackson.annotation.JsonIgnoreProperties;
+import com.fasterxml.jackson.annotation.JsonInclude;
+
+import java.time.*;
+import java.util.*;
+'''
+        
+        files["clients/java/model/PageResponse.java"] = header + '''
+/** One page of a paginated list */
+@JsonIgnoreProperties(ignoreUnknown = true)
+public record PageResponse<T>(
+    List<T> content,
+    long totalElements,
+    int totalPages,
+    boolean first,
+    boolean last
+) {}
 '''
+        
+        for cls in diagram.classes:
+            # Same fields as the entity schema; request payloads leave out the server-set ones
+            fields = {"id": "Long"}
+            fields.update((attr.name, map_type('spring', attr.data_type)) for attr in cls.attributes)
+            fields.update(createdAt="OffsetDateTime", updatedAt="OffsetDateTime")
+            payload_fields = {name: java_type for name, java_type in fields.items()
+                              if name not in ("id", "createdAt", "updatedAt")}
+            
+            variants = (
+                (cls.name, fields, f"{cls.name} entity", "@JsonIgnoreProperties(ignoreUnknown = true)"),
+                (f"{cls.name}CreateRequest", payload_fields, f"Request payload for creating {cls.name}", None),
+                (f"{cls.name}UpdateRequest", payload_fields,
+                 f"Request payload for updating {cls.name} (null fields are left out)",
+                 "@JsonInclude(JsonInclude.Include.NON_NULL)"),
+            )
+            for record_name, record_fields, description, annotation in variants:
+                writer = CodeWriter()
+                writer.block(header)
+                writer.line(f'/** {description} */')
+                if annotation:
+                    writer.line(annotation)
+                writer.line(f'public record {record_name}(')
+                with writer.indent():
+                    components = [f'{java_type} {name}' for name, java_type in record_fields.items()]
+                    writer.lines([component + ',' for component in components[:-1]] + components[-1:])
+                writer.line(') {}')
+                writer.line()
+                files[f"clients/java/model/{record_name}.java"] = writer.getvalue()
+        
+        return files
     
     def _generate_python_client(self, diagram: ClassDiagram, spec: Dict) -> str:
         """Generate Python API client"""
+        client_name = self._client_name(diagram)
         
         return f'''"""
 {diagram.name} API Client for Air Force Kessel Run
@@ -700,7 +1391,7 @@ class ApiConfig:
     timeout: int = 30
 
 
-class {diagram.name}ApiClient:
+class {client_name}ApiClient:
     """API client for {diagram.name} service"""
     
     def __init__(self, config: ApiConfig):
@@ -729,20 +1420,326 @@ class {diagram.name}ApiClient:
             return response.json()
         except requests.exceptions.RequestException as e:
             raise Exception(f"API request failed: {{str(e)}}")
+    
+    # Typed entity methods, pooling, retries and pagination are in async_api_client.py
+    
+    def health_check(self) -> Dict:
+        """Check API health status"""
+        return self._request('GET', '/health')
 '''
+    
+    def _generate_python_async_client(self, diagram: ClassDiagram, spec: Dict) -> str:
+        """Generate asyncio Python API client with a sync facade"""
+        client_name = self._client_name(diagram)
+        writer = CodeWriter()
         
-        # Add methods for each entity
+        writer.block(f'''"""
+{diagram.name} async API Client for Air Force Kessel Run
+Generated asyncio client: pooled keep-alive connections, bounded concurrency,
+retries, pagination iterators and coalesced get-by-id calls, plus a sync facade
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Dict, Iterable, Iterator, List, Optional, TypedDict, TypeVar
+
+import httpx
+
+T = TypeVar("T")
+
+# Retried only for idempotent methods, so a POST is never sent twice
+RETRY_STATUSES = frozenset({{429, 502, 503, 504}})
+IDEMPOTENT_METHODS = frozenset({{"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}})
+
+
+@dataclass
+class AsyncApiConfig:
+    base_url: str
+    api_key: Optional[str] = None
+    token: Optional[str] = None
+    timeout: float = 30.0
+    # Keep-alive connection pool shared by every request of a client
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = False  # needs httpx[http2]
+    # Requests on the wire at once; further calls wait for a free slot
+    max_concurrency: int = 64
+    # Retries after the first attempt: exponential backoff with full jitter,
+    # or the server's Retry-After (capped at backoff_max)
+    max_retries: int = 3
+    backoff_base: float = 0.2
+    backoff_max: float = 10.0
+    # Concurrent GETs of the same resource share one request
+    coalesce_gets: bool = True
+    page_size: int = 100
+
+
+class ApiError(Exception):
+    """Error response from the API (after any retries)"""
+    
+    def __init__(self, status: int, message: str, body: Any = None):
+        super().__init__(f"API Error: {{status}} - {{message}}")
+        self.status = status
+        self.body = body
+
+
+class PageResponse(TypedDict):
+    content: List[Dict[str, Any]]
+    pageable: Dict[str, Any]
+    totalElements: int
+    totalPages: int
+    first: bool
+    last: bool''')
+        
+        # Payload types for each entity
         for cls in diagram.classes:
-            resource_name = cls.name.lower()
+            # Same fields as the entity schema; request payloads leave out the server-set ones
+            fields = {"id": "int"}
+            fields.update((attr.name, self._map_to_python_type(attr.data_type)) for attr in cls.attributes)
+            fields.update(createdAt="str", updatedAt="str")
+            payload_fields = [f'{name}: {py_type}' for name, py_type in fields.items()
+                              if name not in ("id", "createdAt", "updatedAt")]
+            
+            writer.lines(('', ''))
+            writer.line(f'class {cls.name}(TypedDict):')
+            with writer.indent():
+                writer.lines([f'{name}: {py_type}' for name, py_type in fields.items()])
+            
+            for suffix, total in (('CreateRequest', ''), ('UpdateRequest', ', total=False')):
+                writer.lines(('', ''))
+                writer.line(f'class {cls.name}{suffix}(TypedDict{total}):')
+                with writer.indent():
+                    writer.lines(payload_fields or ['pass'])
         
-        return '''
-    # Entity-specific methods would be generated here
-    # This is a simplified example showing the structure
+        writer.lines(('', ''))
+        writer.block('''def _api_error(response: httpx.Response) -> ApiError:
+    try:
+        body = response.json()
+    except ValueError:
+        body = response.text
+    error = body.get("error") if isinstance(body, dict) else None
+    message = error.get("message") if isinstance(error, dict) else None
+    return ApiError(response.status_code, message or response.reason_phrase, body)
+
+
+class _AsyncApiBase:
+    """Transport, retries, concurrency limit and paging behind the generated methods"""
     
-    def health_check(self) -> Dict:
+    def __init__(self, config: AsyncApiConfig, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.config = config
+        
+        headers = {"Accept": "application/json"}
+        if config.token:
+            headers["Authorization"] = f"Bearer {config.token}"
+        if config.api_key:
+            headers["X-API-Key"] = config.api_key
+        
+        self._http = httpx.AsyncClient(
+            base_url=config.base_url,
+            headers=headers,
+            timeout=config.timeout,
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry,
+            ),
+            http2=config.http2,
+            transport=transport,
+        )
+        self._slots = asyncio.Semaphore(config.max_concurrency)
+        self._inflight: Dict[str, asyncio.Future] = {}
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+    
+    async def aclose(self):
+        """Close every pooled connection"""
+        await self._http.aclose()
+    
+    async def health_check(self) -> Dict[str, Any]:
         """Check API health status"""
-        return self._request('GET', '/health')
-'''
+        return await self._request("GET", "/health")
+    
+    async def _request(self, method: str, path: str, data: Any = None,
+                       params: Optional[Dict[str, Any]] = None) -> Any:
+        if params:
+            params = {key: value for key, value in params.items() if value is not None}
+        
+        retryable = method in IDEMPOTENT_METHODS
+        for attempt in range(self.config.max_retries + 1):
+            final = not retryable or attempt == self.config.max_retries
+            try:
+                # A slot is held for the exchange only, not while backing off
+                async with self._slots:
+                    response = await self._http.request(method, path, json=data, params=params)
+            except httpx.TransportError:
+                if final:
+                    raise
+                await asyncio.sleep(self._backoff(attempt, None))
+                continue
+            
+            if response.is_success:
+                return response.json() if response.content else None
+            if final or response.status_code not in RETRY_STATUSES:
+                raise _api_error(response)
+            await asyncio.sleep(self._backoff(attempt, response.headers.get("Retry-After")))
+    
+    def _backoff(self, attempt: int, retry_after: Optional[str]) -> float:
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.config.backoff_max)
+        return random.uniform(0, min(self.config.backoff_max, self.config.backoff_base * 2 ** attempt))
+    
+    async def _get(self, path: str) -> Any:
+        """GET one resource; concurrent calls for the same path share one request"""
+        if not self.config.coalesce_gets:
+            return await self._request("GET", path)
+        
+        pending = self._inflight.get(path)
+        if pending is None:
+            pending = self._inflight[path] = asyncio.ensure_future(self._request("GET", path))
+            pending.add_done_callback(lambda _: self._inflight.pop(path, None))
+        # One caller giving up does not cancel the request for the others
+        return await asyncio.shield(pending)
+    
+    async def _get_many(self, paths: List[str]) -> List[Any]:
+        """GET several resources concurrently, in order"""
+        return list(await asyncio.gather(*(self._get(path) for path in paths)))
+    
+    async def _iter_pages(self, path: str, page_size: Optional[int], params: Dict[str, Any]) -> AsyncIterator[Any]:
+        """Items of every page; the next page is fetched while the current one is consumed"""
+        size = page_size or self.config.page_size
+        page = 0
+        upcoming = asyncio.ensure_future(self._request("GET", path, params={**params, "page": page, "size": size}))
+        try:
+            while upcoming is not None:
+                response = await upcoming
+                upcoming = None
+                content = response.get("content") or []
+                last = response.get("last")
+                if last is None:
+                    last = len(content) < size
+                if content and not last:
+                    page += 1
+                    upcoming = asyncio.ensure_future(
+                        self._request("GET", path, params={**params, "page": page, "size": size}))
+                for item in content:
+                    yield item
+        finally:
+            if upcoming is not None:
+                upcoming.cancel()
+
+
+class _SyncFacade:
+    """Runs an async client on a private event loop, for code without one"""
+    
+    def __init__(self, client: _AsyncApiBase):
+        self._loop = asyncio.new_event_loop()
+        self._async = client
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def close(self):
+        """Close every pooled connection and the event loop"""
+        try:
+            self._run(self._async.aclose())
+        finally:
+            self._loop.close()
+    
+    def health_check(self) -> Dict[str, Any]:
+        """Check API health status"""
+        return self._run(self._async.health_check())
+    
+    def _run(self, awaitable: Awaitable[T]) -> T:
+        return self._loop.run_until_complete(awaitable)
+    
+    def _iterate(self, iterator: AsyncIterator[T]) -> Iterator[T]:
+        try:
+            while True:
+                try:
+                    item = self._run(iterator.__anext__())
+                except StopAsyncIteration:
+                    return
+                yield item
+        finally:
+            self._run(iterator.aclose())''')
+        
+        resources = [(cls, self._snake_case(cls.name), self._snake_case(pluralize(cls.name)), f"/{pluralize(cls.name).lower()}")
+                     for cls in diagram.classes]
+        
+        writer.lines(('', ''))
+        writer.line(f'class Async{client_name}Client(_AsyncApiBase):')
+        with writer.indent():
+            writer.line(f'"""Async API client for {diagram.name} service"""')
+            for cls, name, plural, path in resources:
+                writer.line()
+                writer.block(f'''# {cls.name} API methods
+async def list_{plural}(self, page: int = 0, size: int = 20, sort: Optional[str] = None) -> PageResponse:
+    return await self._request("GET", "{path}", params={{"page": page, "size": size, "sort": sort}})
+
+def iter_{plural}(self, page_size: Optional[int] = None, sort: Optional[str] = None) -> AsyncIterator[{cls.name}]:
+    """Every {cls.name}, page by page"""
+    return self._iter_pages("{path}", page_size, {{"sort": sort}})
+
+async def get_{name}(self, id: int) -> {cls.name}:
+    return await self._get(f"{path}/{{id}}")
+
+async def get_{plural}(self, ids: Iterable[int]) -> List[{cls.name}]:
+    """{pluralize(cls.name)} by id, fetched concurrently; repeated ids share one request"""
+    return await self._get_many([f"{path}/{{id}}" for id in ids])
+
+async def create_{name}(self, data: {cls.name}CreateRequest) -> {cls.name}:
+    return await self._request("POST", "{path}", data)
+
+async def update_{name}(self, id: int, data: {cls.name}UpdateRequest) -> {cls.name}:
+    return await self._request("PUT", f"{path}/{{id}}", data)
+
+async def delete_{name}(self, id: int) -> None:
+    await self._request("DELETE", f"{path}/{{id}}")''')
+        
+        writer.lines(('', ''))
+        writer.line(f'class {client_name}Client(_SyncFacade):')
+        with writer.indent():
+            writer.line(f'"""Blocking API client for {diagram.name} service (runs Async{client_name}Client)"""')
+            writer.line()
+            writer.block(f'''def __init__(self, config: AsyncApiConfig, transport: Optional[httpx.AsyncBaseTransport] = None):
+    super().__init__(Async{client_name}Client(config, transport))''')
+            for cls, name, plural, path in resources:
+                writer.line()
+                writer.block(f'''# {cls.name} API methods
+def list_{plural}(self, page: int = 0, size: int = 20, sort: Optional[str] = None) -> PageResponse:
+    return self._run(self._async.list_{plural}(page, size, sort))
+
+def iter_{plural}(self, page_size: Optional[int] = None, sort: Optional[str] = None) -> Iterator[{cls.name}]:
+    return self._iterate(self._async.iter_{plural}(page_size, sort))
+
+def get_{name}(self, id: int) -> {cls.name}:
+    return self._run(self._async.get_{name}(id))
+
+def get_{plural}(self, ids: Iterable[int]) -> List[{cls.name}]:
+    return self._run(self._async.get_{plural}(ids))
+
+def create_{name}(self, data: {cls.name}CreateRequest) -> {cls.name}:
+    return self._run(self._async.create_{name}(data))
+
+def update_{name}(self, id: int, data: {cls.name}UpdateRequest) -> {cls.name}:
+    return self._run(self._async.update_{name}(id, data))
+
+def delete_{name}(self, id: int) -> None:
+    self._run(self._async.delete_{name}(id))''')
+        
+        writer.line()
+        return writer.getvalue()
     
     def _generate_server_stubs(self, diagram: ClassDiagram, spec: Dict) -> Dict[str, str]:
         """Generate server implementation stubs"""
@@ -772,19 +1769,19 @@ import javax.validation.Valid;
  */
 public interface {cls.name}Controller {{
     
-    @GetMapping("/{cls.name.lower()}s")
-    ResponseEntity<Page<{cls.name}>> list{cls.name}s(Pageable pageable);
+    @GetMapping("/{pluralize(cls.name).lower()}")
+    ResponseEntity<Page<{cls.name}>> list{pluralize(cls.name)}(Pageable pageable);
     
-    @GetMapping("/{cls.name.lower()}s/{{id}}")
+    @GetMapping("/{pluralize(cls.name).lower()}/{{id}}")
     ResponseEntity<{cls.name}> get{cls.name}(@PathVariable Long id);
     
-    @PostMapping("/{cls.name.lower()}s")
+    @PostMapping("/{pluralize(cls.name).lower()}")
     ResponseEntity<{cls.name}> create{cls.name}(@Valid @RequestBody {cls.name} entity);
     
-    @PutMapping("/{cls.name.lower()}s/{{id}}")
+    @PutMapping("/{pluralize(cls.name).lower()}/{{id}}")
     ResponseEntity<{cls.name}> update{cls.name}(@PathVariable Long id, @Valid @RequestBody {cls.name} entity);
     
-    @DeleteMapping("/{cls.name.lower()}s/{{id}}")
+    @DeleteMapping("/{pluralize(cls.name).lower()}/{{id}}")
     ResponseEntity<Void> delete{cls.name}(@PathVariable Long id);
 }}
 '''
@@ -857,14 +1854,14 @@ All API responses follow a consistent format:
 **Description:** {cls.name} entity for Air Force mission systems
 
 **Attributes:**
-{"".join([f"- `{attr.name}` ({attr.type}): {cls.name} {attr.name}" for attr in cls.attributes])}
+{"".join([f"- `{attr.name}` ({attr.data_type}): {cls.name} {attr.name}" for attr in cls.attributes])}
 
 **Endpoints:**
-- `GET /{cls.name.lower()}s` - List all {cls.name}s
-- `GET /{cls.name.lower()}s/{{id}}` - Get {cls.name} by ID  
-- `POST /{cls.name.lower()}s` - Create new {cls.name}
-- `PUT /{cls.name.lower()}s/{{id}}` - Update {cls.name}
-- `DELETE /{cls.name.lower()}s/{{id}}` - Delete {cls.name}
+- `GET /{pluralize(cls.name).lower()}` - List all {pluralize(cls.name)}
+- `GET /{pluralize(cls.name).lower()}/{{id}}` - Get {cls.name} by ID  
+- `POST /{pluralize(cls.name).lower()}` - Create new {cls.name}
+- `PUT /{pluralize(cls.name).lower()}/{{id}}` - Update {cls.name}
+- `DELETE /{pluralize(cls.name).lower()}/{{id}}` - Delete {cls.name}
 
 ''' for cls in diagram.classes])}
 
@@ -938,18 +1935,19 @@ For API support, contact the Kessel Run team at kessel.run@us.af.mil
         
         # Generate test items for each entity
         for cls in diagram.classes:
-            resource_name = cls.name.lower()
+            plural = pluralize(cls.name)
+            resource_name = plural.lower()
             
             collection["item"].extend([
                 {
-                    "name": f"List {cls.name}s",
+                    "name": f"List {plural}",
                     "request": {
                         "method": "GET",
                         "header": [],
                         "url": {
-                            "raw": "{{{{base_url}}}}/{resource_name}s",
-                            "host": ["{{{{base_url}}}}"],
-                            "path": [f"{resource_name}s"]
+                            "raw": f"{{{{base_url}}}}/{resource_name}",
+                            "host": ["{{base_url}}"],
+                            "path": [resource_name]
                         }
                     }
                 },
@@ -965,9 +1963,9 @@ For API support, contact the Kessel Run team at kessel.run@us.af.mil
                             "raw": json.dumps({attr.name: f"sample_{attr.name}" for attr in cls.attributes[:3]}, indent=2)
                         },
                         "url": {
-                            "raw": "{{{{base_url}}}}/{resource_name}s",
-                            "host": ["{{{{base_url}}}}"],
-                            "path": [f"{resource_name}s"]
+                            "raw": f"{{{{base_url}}}}/{resource_name}",
+                            "host": ["{{base_url}}"],
+                            "path": [resource_name]
                         }
                     }
                 }
@@ -984,43 +1982,39 @@ For API support, contact the Kessel Run team at kessel.run@us.af.mil
             ]
         }, indent=2)
         
+        files.update(self._generate_load_tests(spec))
+        
         return files
     
+    def _generate_load_tests(self, spec: Dict) -> Dict[str, str]:
+        """Locust suite for every operation, with x-slo thresholds and a mock server for CI"""
+        profile = build_load_profile(spec)
+        context = {"title": profile["title"], "base_path": profile["basePath"]}
+        return {
+            "tests/load/load_profile.json": json.dumps(profile, indent=2),
+            "tests/load/locustfile.py": render("load/locustfile.py.j2", **context),
+            "tests/load/payloads.py": render("load/payloads.py.j2", **context),
+            "tests/load/mock_server.py": render("load/mock_server.py.j2", **context),
+            "tests/load/run-load-test.sh": render("load/run_load_test.sh.j2", **context),
+            "tests/load/requirements.txt": "locust>=2.15,<3\n",
+            "tests/load/load-test.gitlab-ci.yml": render("load/gitlab_ci.yml.j2", **context),
+        }
+    
     def _map_to_openapi_type(self, type_str: str) -> Dict[str, Any]:
         """Map UML types to OpenAPI schema types"""
-        type_mapping = {
-            'int': {'type': 'integer', 'format': 'int32', 'example': 123},
-            'integer': {'type': 'integer', 'format': 'int32', 'example': 123},
-            'long': {'type': 'integer', 'format': 'int64', 'example': 123456789},
-            'string': {'type': 'string', 'example': 'sample text'},
-            'float': {'type': 'number', 'format': 'float', 'example': 123.45},
-            'double': {'type': 'number', 'format': 'double', 'example': 123.456789},
-            'boolean': {'type': 'boolean', 'example': True},
-            'bool': {'type': 'boolean', 'example': True},
-            'datetime': {'type': 'string', 'format': 'date-time', 'example': '2024-01-01T00:00:00Z'},
-            'date': {'type': 'string', 'format': 'date', 'example': '2024-01-01'},
-            'list': {'type': 'array', 'items': {'type': 'string'}},
-            'array': {'type': 'array', 'items': {'type': 'string'}}
-        }
-        return type_mapping.get(type_str.lower(), {'type': 'string', 'example': 'sample text'})
+        return openapi_schema(type_str)
     
     def _map_to_typescript_type(self, type_str: str) -> str:
         """Map UML types to TypeScript types"""
-        type_mapping = {
-            'int': 'number',
-            'integer': 'number', 
-            'long': 'number',
-            'string': 'string',
-            'float': 'number',
-            'double': 'number',
-            'boolean': 'boolean',
-            'bool': 'boolean',
-            'datetime': 'string',
-            'date': 'string',
-            'list': 'string[]',
-            'array': 'string[]'
-        }
-        return type_mapping.get(type_str.lower(), 'string')
+        return map_type('typescript-json', type_str)
+    
+    def _map_to_python_type(self, type_str: str) -> str:
+        """Map UML types to Python types of JSON payloads"""
+        return map_type('python-json', type_str)
+    
+    def _client_name(self, diagram: ClassDiagram) -> str:
+        """Diagram name as a class name prefix (E-commerce System -> ECommerceSystem)"""
+        return ''.join(part[:1].upper() + part[1:] for part in re.split(r'[^A-Za-z0-9]+', diagram.name))
 
 
 class BaseGenerator:
@@ -0,0 +1,226 @@
+"""
+Protobuf schema planning for the gRPC generator
+Maps class attributes to message fields and keeps field numbers stable across model revisions
+"""
+
+import json
+import re
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from .type_mapping import GENERIC_ARITY, GENERIC_KINDS, TypeExpr, TypeSyntaxError, parse_type
+
+
+LOCK_FILE = "proto/field-numbers.lock.json"
+LOCK_VERSION = 1
+
+# Protobuf types of UML base types, by lower-cased UML name
+PROTO_TYPES = {
+    'string': 'string',
+    'str': 'string',
+    'char': 'string',
+    'uuid': 'string',
+    'int': 'int32',
+    'integer': 'int32',
+    'short': 'int32',
+    'long': 'int64',
+    'float': 'double',
+    'double': 'double',
+    'decimal': 'string',
+    'boolean': 'bool',
+    'bool': 'bool',
+    'datetime': 'google.protobuf.Timestamp',
+    'timestamp': 'google.protobuf.Timestamp',
+    # ISO-8601 dates (google.type.Date would pull in googleapis protos)
+    'date': 'string',
+    'bytes': 'bytes',
+    'object': 'google.protobuf.Value',
+    'any': 'google.protobuf.Value',
+}
+FALLBACK_TYPE = 'string'
+
+# Well-known types and the file each one is imported from
+WELL_KNOWN_IMPORTS = {
+    'google.protobuf.Timestamp': 'google/protobuf/timestamp.proto',
+    'google.protobuf.Value': 'google/protobuf/struct.proto',
+    'google.protobuf.Empty': 'google/protobuf/empty.proto',
+    'google.protobuf.FieldMask': 'google/protobuf/field_mask.proto',
+}
+
+# Scalar types allowed as map keys
+MAP_KEY_TYPES = {'string', 'int32', 'int64', 'bool'}
+
+# Numbers protoc refuses: the range reserved for the protobuf implementation, and the maximum
+IMPLEMENTATION_RESERVED = range(19000, 20000)
+MAX_FIELD_NUMBER = 536_870_911
+
+
+class ProtoField(NamedTuple):
+    name: str
+    number: int
+    type: str
+    label: str = ''  # '', 'optional' or 'repeated'
+    
+    @property
+    def signature(self) -> str:
+        """Wire shape of the field; a number may only be reused while this stays the same"""
+        return f"repeated {self.type}" if self.label == 'repeated' else self.type
+    
+    @property
+    def declaration(self) -> str:
+        label = f"{self.label} " if self.label else ''
+        return f"{label}{self.type} {self.name} = {self.number};"
+
+
+class ProtoMessage(NamedTuple):
+    name: str
+    fields: List[ProtoField]
+    reserved_numbers: List[int]
+    reserved_names: List[str]
+    comment: str = ''
+
+
+def field_name(name: str) -> str:
+    """Attribute name as a protobuf field name (lower_snake_case)"""
+    s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)
+    return re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1).lower()
+
+
+def proto_field_type(type_name: str, messages: Set[str]) -> Tuple[str, str]:
+    """
+    (type, label) of a field for a UML type string
+
+    Lists and sets become repeated fields and dicts become maps; other model
+    classes are referenced as messages. Shapes protobuf cannot express (nested
+    collections, maps of collections) and unknown types fall back to string.
+    """
+    try:
+        expr = parse_type(type_name)
+    except TypeSyntaxError:
+        expr = TypeExpr(type_name)
+    
+    label = ''
+    if expr.args and GENERIC_KINDS.get(expr.name.lower()) == 'optional' and len(expr.args) == 1:
+        expr, label = expr.args[0], 'optional'
+    
+    if not expr.args:
+        lowered = expr.name.lower()
+        if lowered in ('list', 'array', 'set'):
+            return 'string', 'repeated'
+        if lowered in ('dict', 'map'):
+            return 'map<string, string>', ''
+        return _element_type(expr, messages), label
+    
+    kind = GENERIC_KINDS.get(expr.name.lower())
+    if kind is None or len(expr.args) != GENERIC_ARITY[kind]:
+        return FALLBACK_TYPE, label
+    if kind in ('list', 'set'):
+        return _element_type(expr.args[0], messages), 'repeated'
+    if kind == 'dict':
+        key = _element_type(expr.args[0], messages)
+        value = _element_type(expr.args[1], messages)
+        return f"map<{key if key in MAP_KEY_TYPES else 'string'}, {value}>", ''
+    # Optional<Optional<T>> is just an optional T
+    return proto_field_type(_type_string(expr.args[0]), messages)[0], 'optional'
+
+
+def _element_type(expr: TypeExpr, messages: Set[str]) -> str:
+    if expr.args:
+        return FALLBACK_TYPE
+    if expr.name in messages:
+        return expr.name
+    return PROTO_TYPES.get(expr.name.lower(), FALLBACK_TYPE)
+
+
+def _type_string(expr: TypeExpr) -> str:
+    if not expr.args:
+        return expr.name
+    return f"{expr.name}<{', '.join(_type_string(arg) for arg in expr.args)}>"
+
+
+class FieldLock:
+    """
+    Field numbers of every generated message, persisted between generator runs
+
+    A field keeps its number for as long as it exists with the same wire shape.
+    Removed fields, and fields whose type changed, have their number and name
+    reserved so no later revision can reuse them; new fields take numbers above
+    every number the message has ever used.
+    """
+    
+    def __init__(self, messages: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.messages: Dict[str, Dict[str, Any]] = messages or {}
+    
+    @classmethod
+    def load(cls, path: str) -> 'FieldLock':
+        """
+        Read a lock file written by an earlier run
+
+        Raises:
+            ValueError: If the file is not a field-number lock
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            try:
+                data = json.load(f)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid field-number lock {path}: {e}") from e
+        if not isinstance(data, dict) or not isinstance(data.get('messages'), dict):
+            raise ValueError(f"Invalid field-number lock {path}: expected a 'messages' mapping")
+        if data.get('version', LOCK_VERSION) != LOCK_VERSION:
+            raise ValueError(f"Unsupported field-number lock version in {path}: {data.get('version')}")
+        messages = {}
+        for name, entry in data['messages'].items():
+            try:
+                messages[name] = {
+                    'fields': {field: {'number': int(locked['number']), 'type': str(locked['type'])}
+                               for field, locked in entry.get('fields', {}).items()},
+                    'reserved': sorted(int(number) for number in entry.get('reserved', [])),
+                    'reservedNames': sorted(str(reserved) for reserved in entry.get('reservedNames', [])),
+                }
+            except (AttributeError, KeyError, TypeError, ValueError) as e:
+                raise ValueError(f"Invalid field-number lock {path}: message {name}: {e}") from e
+        return cls(messages)
+    
+    def dumps(self) -> str:
+        return json.dumps({'version': LOCK_VERSION, 'messages': self.messages}, indent=2, sort_keys=True) + '\n'
+    
+    def assign(self, message: str, fields: Iterable[Tuple[str, str, str]], comment: str = '') -> ProtoMessage:
+        """
+        Number the fields of a message, updating the lock
+
+        Args:
+            message: Message name
+            fields: (name, type, label) of every field, in declaration order
+        """
+        entry = self.messages.setdefault(message, {'fields': {}, 'reserved': [], 'reservedNames': []})
+        locked: Dict[str, Dict[str, Any]] = entry['fields']
+        reserved: Set[int] = set(entry['reserved'])
+        reserved_names: Set[str] = set(entry['reservedNames'])
+        fields = list(fields)
+        
+        current = {}
+        for name, proto_type, label in fields:
+            current[name] = ProtoField(name, 0, proto_type, label).signature
+        for name in list(locked):
+            if current.get(name) != locked[name]['type']:
+                # Removed, or changed in a way old readers would misinterpret
+                reserved.add(locked[name]['number'])
+                reserved_names.add(name)
+                del locked[name]
+        
+        next_number = max([0, *reserved, *(locked_field['number'] for locked_field in locked.values())]) + 1
+        numbered = []
+        for name, proto_type, label in fields:
+            if name not in locked:
+                while next_number in IMPLEMENTATION_RESERVED:
+                    next_number += 1
+                if next_number > MAX_FIELD_NUMBER:
+                    raise ValueError(f"Message {message} ran out of field numbers")
+                locked[name] = {'number': next_number, 'type': current[name]}
+                next_number += 1
+                # A name that comes back gets a fresh number, so it no longer needs reserving
+                reserved_names.discard(name)
+            numbered.append(ProtoField(name, locked[name]['number'], proto_type, label))
+        
+        entry['reserved'] = sorted(reserved)
+        entry['reservedNames'] = sorted(reserved_names)
+        return ProtoMessage(message, numbered, entry['reserved'], entry['reservedNames'], comment)
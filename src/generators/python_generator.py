@@ -3,85 +3,76 @@ Python code generator for class models
 Generates Python classes from UML class diagrams
 """
 
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterator, Tuple
+from .base_generator import BaseGenerator
+from .code_writer import CodeWriter
+from .type_mapping import map_type, type_names
+from .ir import ClassIR, lower
 from ..models.class_model import (
     ClassDiagram, ClassDefinition, Attribute, Method, Parameter, 
     Visibility, Relationship
 )
 
 
-class PythonCodeGenerator:
+class PythonCodeGenerator(BaseGenerator):
     """Generates Python code from class models"""
     
-    def __init__(self):
-        self.type_mapping = {
-            'string': 'str',
-            'int': 'int',
-            'integer': 'int',
-            'float': 'float',
-            'double': 'float',
-            'boolean': 'bool',
-            'bool': 'bool',
-            'date': 'datetime.date',
-            'datetime': 'datetime.datetime',
-            'list': 'List',
-            'dict': 'Dict',
-            'object': 'Any',
-            'void': 'None'
-        }
+    def __init__(self, cache=None):
+        super().__init__(cache)
+        self.type_language = 'python'
         self.required_imports = set()
     
-    def generate(self, diagram: ClassDiagram) -> Dict[str, str]:
-        """Generate Python code for entire diagram"""
+    def stream(self, diagram: ClassDiagram) -> Iterator[Tuple[str, str]]:
+        """Generate Python code for entire diagram, one file at a time"""
         self.required_imports.clear()
-        generated_files = {}
         
-        # Generate each class
-        for class_def in diagram.classes:
+        # Generate each class, reusing cached output for unchanged classes
+        cache_keys = self._class_cache_keys(diagram)
+        for class_def, cache_key in zip(diagram.classes, cache_keys):
             filename = f"{self._to_snake_case(class_def.name)}.py"
-            code = self.generate_class(class_def, diagram)
-            generated_files[filename] = code
+            yield filename, self._cached_output(
+                cache_key, lambda: self.generate_class(class_def, diagram))
         
         # Generate __init__.py for package
         if diagram.packages:
-            init_code = self._generate_package_init(diagram)
-            generated_files["__init__.py"] = init_code
-        
-        return generated_files
+            yield "__init__.py", self._generate_package_init(diagram)
+    
+    def _cache_options(self) -> Dict[str, str]:
+        """Type mapping affects every generated file"""
+        return {'type_language': self.type_language}
     
     def generate_class(self, class_def: ClassDefinition, diagram: ClassDiagram) -> str:
         """Generate Python code for a single class"""
+        writer = CodeWriter()
+        self.write_class(writer, class_def, diagram)
+        return writer.getvalue()
+    
+    def write_class(self, writer: CodeWriter, class_def: ClassDefinition, diagram: ClassDiagram):
+        """Write Python code for a single class to a code writer"""
         self.required_imports.clear()
-        
-        lines = []
+        class_ir = lower(diagram).for_class(class_def)
         
         # Add file header
-        lines.append(f'"""')
-        lines.append(f'{class_def.name} class')
+        header = ['"""', f'{class_def.name} class']
         if class_def.description:
-            lines.append(f'{class_def.description}')
-        lines.append(f'Generated from UML model')
-        lines.append(f'"""')
-        lines.append('')
+            header.append(class_def.description)
+        header.extend(('Generated from UML model', '"""', ''))
+        writer.lines(header)
         
         # Collect imports
-        self._collect_imports(class_def, diagram)
+        self._collect_imports(class_ir)
         
         # Add imports
         if self.required_imports:
-            for import_stmt in sorted(self.required_imports):
-                lines.append(import_stmt)
-            lines.append('')
+            writer.lines(sorted(self.required_imports))
+            writer.line()
         
         # Generate class definition
-        class_code = self._generate_class_definition(class_def, diagram)
-        lines.extend(class_code)
-        
-        return '\n'.join(lines)
+        self._write_class_definition(writer, class_ir)
     
-    def _generate_class_definition(self, class_def: ClassDefinition, diagram: ClassDiagram) -> List[str]:
-        """Generate the main class definition"""
-        lines = []
+    def _write_class_definition(self, writer: CodeWriter, class_ir: ClassIR):
+        """Write the main class definition"""
+        class_def = class_ir.definition
         
         # Class declaration
         class_line = f'class {class_def.name}'
@@ -97,106 +88,83 @@ class PythonCodeGenerator:
             class_line += f'({", ".join(parent_classes)})'
         
         class_line += ':'
-        lines.append(class_line)
-        
-        # Class docstring
-        if class_def.description or class_def.is_abstract or class_def.is_interface:
-            lines.append('    """')
-            if class_def.description:
-                lines.append(f'    {class_def.description}')
-            if class_def.is_abstract:
-                lines.append('    Abstract class')
-            if class_def.is_interface:
-                lines.append('    Interface definition')
-            lines.append('    """')
-            lines.append('')
-        
-        # Add class attributes (class variables)
-        static_attributes = [attr for attr in class_def.attributes if attr.is_static]
-        if static_attributes:
-            for attr in static_attributes:
-                lines.append(f'    {self._generate_attribute(attr, is_static=True)}')
-            lines.append('')
-        
-        # Generate constructor
-        constructor = self._find_constructor(class_def)
-        if constructor or class_def.attributes:
-            lines.extend(self._generate_constructor(class_def, constructor))
-            lines.append('')
-        
-        # Generate methods
-        regular_methods = [m for m in class_def.methods if m.name != '__init__']
-        for method in regular_methods:
-            lines.extend(self._generate_method(method, class_def))
-            lines.append('')
-        
-        # Generate properties for private attributes
-        private_attributes = [attr for attr in class_def.attributes if not attr.is_static]
-        if private_attributes:
-            lines.extend(self._generate_properties(private_attributes))
-        
-        # If class is empty, add pass
-        if len(lines) == 1:
-            lines.append('    pass')
-        
-        return lines
+        writer.line(class_line)
+        body_start = writer.position
+        
+        with writer.indent():
+            # Class docstring
+            if class_def.description or class_def.is_abstract or class_def.is_interface:
+                writer.line('"""')
+                if class_def.description:
+                    writer.line(class_def.description)
+                if class_def.is_abstract:
+                    writer.line('Abstract class')
+                if class_def.is_interface:
+                    writer.line('Interface definition')
+                writer.line('"""')
+                writer.line()
+            
+            # Add class attributes (class variables)
+            if class_ir.static_attributes:
+                for attr in class_ir.static_attributes:
+                    writer.line(self._generate_attribute(attr, is_static=True))
+                writer.line()
+            
+            # Generate constructor
+            if class_ir.constructor.method or class_def.attributes:
+                self._write_constructor(writer, class_ir)
+                writer.line()
+            
+            # Generate methods
+            for method in class_ir.methods:
+                self._write_method(writer, method, class_def)
+                writer.line()
+            
+            # Generate properties for private attributes
+            if class_ir.instance_attributes:
+                self._write_properties(writer, class_ir.instance_attributes)
+            
+            # If class is empty, add pass
+            if writer.position == body_start:
+                writer.line('pass')
     
-    def _generate_constructor(self, class_def: ClassDefinition, constructor: Optional[Method]) -> List[str]:
-        """Generate constructor method"""
-        lines = []
+    def _write_constructor(self, writer: CodeWriter, class_ir: ClassIR):
+        """Write the constructor method"""
+        constructor = class_ir.constructor
         
         # Build parameter list
         params = ['self']
         
-        if constructor and constructor.parameters:
-            for param in constructor.parameters:
-                param_type = self._map_type(param.data_type)
-                param_str = f'{param.name}: {param_type}'
-                if param.default_value:
-                    param_str += f' = {param.default_value}'
-                elif param.is_optional:
-                    param_str += ' = None'
-                params.append(param_str)
-        else:
-            # Generate parameters from attributes
-            for attr in class_def.attributes:
-                if not attr.is_static:
-                    param_type = self._map_type(attr.data_type)
-                    param_str = f'{attr.name}: {param_type}'
-                    if attr.default_value:
-                        param_str += f' = {attr.default_value}'
-                    params.append(param_str)
-        
-        # Constructor signature
-        if len(params) == 1:
-            lines.append('    def __init__(self):')
-        else:
-            lines.append(f'    def __init__({", ".join(params)}):')
+        for param in constructor.parameters:
+            param_type = self._map_type(param.data_type)
+            param_str = f'{param.name}: {param_type}'
+            if param.default_value:
+                param_str += f' = {param.default_value}'
+            elif param.is_optional:
+                param_str += ' = None'
+            params.append(param_str)
         
-        # Constructor docstring
-        lines.append('        """Initialize the class instance"""')
+        # Constructor signature and docstring, body indented relative to the signature
+        lines = [f'def __init__({", ".join(params)}):', '    """Initialize the class instance"""']
         
         # Initialize attributes
-        for attr in class_def.attributes:
-            if not attr.is_static:
-                if constructor and any(p.name == attr.name for p in constructor.parameters):
-                    lines.append(f'        self._{attr.name} = {attr.name}')
-                elif attr.default_value:
-                    lines.append(f'        self._{attr.name} = {attr.default_value}')
-                else:
-                    default_val = self._get_default_value(attr.data_type)
-                    lines.append(f'        self._{attr.name} = {default_val}')
+        for attr in class_ir.instance_attributes:
+            if attr.name in constructor.assigned:
+                lines.append(f'    self._{attr.name} = {attr.name}')
+            elif attr.default_value:
+                lines.append(f'    self._{attr.name} = {attr.default_value}')
+            else:
+                default_val = self._get_default_value(attr.data_type)
+                lines.append(f'    self._{attr.name} = {default_val}')
         
         # If no attributes, add pass
-        if not any(not attr.is_static for attr in class_def.attributes):
-            lines.append('        pass')
+        if not class_ir.instance_attributes:
+            lines.append('    pass')
         
-        return lines
+        writer.lines(lines)
     
-    def _generate_method(self, method: Method, class_def: ClassDefinition) -> List[str]:
-        """Generate a method definition"""
-        lines = []
-        
+    def _write_method(self, writer: CodeWriter, method: Method, class_def: ClassDefinition):
+        """Write a method definition"""
         # Method signature
         params = ['self'] if not method.is_static else []
         
@@ -213,72 +181,68 @@ class PythonCodeGenerator:
         return_type = self._map_type(method.return_type)
         
         # Method decorator
+        lines = []
         if method.is_static:
-            lines.append('    @staticmethod')
+            lines.append('@staticmethod')
         elif method.is_abstract:
-            lines.append('    @abstractmethod')
+            lines.append('@abstractmethod')
         
         # Method signature
-        signature = f'    def {method.name}({", ".join(params)})'
+        signature = f'def {method.name}({", ".join(params)})'
         if return_type != 'None':
             signature += f' -> {return_type}'
         signature += ':'
         lines.append(signature)
         
-        # Method docstring
-        lines.append('        """')
-        if method.description:
-            lines.append(f'        {method.description}')
-        else:
-            lines.append(f'        {method.name.replace("_", " ").title()} method')
-        lines.append('        """')
+        # Method docstring, body indented relative to the signature
+        summary = method.description or f'{method.name.replace("_", " ").title()} method'
+        lines.extend(('    """', f'    {summary}', '    """'))
         
         # Method body
         if method.body:
-            for line in method.body.split('\n'):
-                lines.append(f'        {line}')
+            lines.extend([f'    {line}' if line else '' for line in method.body.split('\n')])
         elif method.is_abstract:
-            lines.append('        pass')
+            lines.append('    pass')
         elif class_def.is_interface:
-            lines.append('        raise NotImplementedError')
+            lines.append('    raise NotImplementedError')
         else:
             # Generate basic method body based on method name
             if method.name.startswith('get_'):
                 attr_name = method.name[4:]
-                lines.append(f'        return self._{attr_name}')
+                lines.append(f'    return self._{attr_name}')
             elif method.name.startswith('set_'):
                 attr_name = method.name[4:]
                 param_name = method.parameters[0].name if method.parameters else 'value'
-                lines.append(f'        self._{attr_name} = {param_name}')
+                lines.append(f'    self._{attr_name} = {param_name}')
             elif method.return_type == 'void' or method.return_type == 'None':
-                lines.append('        pass')
+                lines.append('    pass')
             else:
                 default_return = self._get_default_value(method.return_type)
-                lines.append(f'        return {default_return}')
+                lines.append(f'    return {default_return}')
         
-        return lines
+        writer.lines(lines)
     
-    def _generate_properties(self, attributes: List[Attribute]) -> List[str]:
-        """Generate property decorators for private attributes"""
+    def _write_properties(self, writer: CodeWriter, attributes: List[Attribute]):
+        """Write property decorators for private attributes"""
         lines = []
-        
         for attr in attributes:
             if attr.visibility == Visibility.PRIVATE:
-                # Getter property
-                lines.append('')
-                lines.append('    @property')
-                lines.append(f'    def {attr.name}(self) -> {self._map_type(attr.data_type)}:')
-                lines.append(f'        """Get {attr.name}"""')
-                lines.append(f'        return self._{attr.name}')
-                
-                # Setter property
-                lines.append('')
-                lines.append(f'    @{attr.name}.setter')
-                lines.append(f'    def {attr.name}(self, value: {self._map_type(attr.data_type)}):')
-                lines.append(f'        """Set {attr.name}"""')
-                lines.append(f'        self._{attr.name} = value')
-        
-        return lines
+                python_type = self._map_type(attr.data_type)
+                lines.extend((
+                    # Getter property
+                    '',
+                    '@property',
+                    f'def {attr.name}(self) -> {python_type}:',
+                    f'    """Get {attr.name}"""',
+                    f'    return self._{attr.name}',
+                    # Setter property
+                    '',
+                    f'@{attr.name}.setter',
+                    f'def {attr.name}(self, value: {python_type}):',
+                    f'    """Set {attr.name}"""',
+                    f'    self._{attr.name} = value',
+                ))
+        writer.lines(lines)
     
     def _generate_attribute(self, attr: Attribute, is_static: bool = False) -> str:
         """Generate an attribute definition"""
@@ -288,73 +252,56 @@ class PythonCodeGenerator:
             default_val = self._get_default_value(attr.data_type)
             return f'{attr.name}: {self._map_type(attr.data_type)} = {default_val}'
     
-    def _find_constructor(self, class_def: ClassDefinition) -> Optional[Method]:
-        """Find the constructor method"""
-        for method in class_def.methods:
-            if method.name == '__init__':
-                return method
-        return None
-    
-    def _collect_imports(self, class_def: ClassDefinition, diagram: ClassDiagram):
+    def _collect_imports(self, class_ir: ClassIR):
         """Collect required imports for the class"""
-        # Check for typing imports
-        all_types = set()
-        
-        # Collect types from attributes
-        for attr in class_def.attributes:
-            all_types.add(attr.data_type)
-        
-        # Collect types from methods
-        for method in class_def.methods:
-            all_types.add(method.return_type)
-            for param in method.parameters:
-                all_types.add(param.data_type)
+        # Names the mapped types refer to, including generic arguments
+        python_names = set()
+        for type_name in class_ir.types:
+            python_names.update(type_names(self.type_language, type_name))
         
         # Add required imports
-        if any('List' in t or 'Dict' in t or 'Any' in t or 'Optional' in t for t in all_types):
-            self.required_imports.add('from typing import List, Dict, Any, Optional')
+        if python_names & {'List', 'Dict', 'Any', 'Optional', 'Set'}:
+            typing_names = 'List, Dict, Any, Optional, Set' if 'Set' in python_names else 'List, Dict, Any, Optional'
+            self.required_imports.add(f'from typing import {typing_names}')
         
-        if any('datetime' in t for t in all_types):
+        if any(name.startswith('datetime.') for name in python_names):
             self.required_imports.add('import datetime')
         
-        if any(method.is_abstract for method in class_def.methods):
+        if class_ir.has_abstract_methods:
             self.required_imports.add('from abc import ABC, abstractmethod')
         
         # Add imports for related classes
-        for rel in diagram.get_relationships_for_class(class_def.name):
-            if rel.target_class != class_def.name:
-                # Add import for related class
-                related_class = diagram.get_class_by_name(rel.target_class)
-                if related_class and related_class.package:
-                    self.required_imports.add(f'from .{self._to_snake_case(rel.target_class)} import {rel.target_class}')
+        for related_class in class_ir.dependencies:
+            if related_class.package:
+                self.required_imports.add(f'from .{self._to_snake_case(related_class.name)} import {related_class.name}')
     
     def _generate_package_init(self, diagram: ClassDiagram) -> str:
         """Generate __init__.py for the package"""
-        lines = [
-            f'"""',
-            f'{diagram.name}',
-            f'',
-            f'{diagram.description or "Generated from UML model"}',
-            f'"""',
-            f'',
-        ]
+        writer = CodeWriter()
+        writer.line('"""')
+        writer.line(diagram.name)
+        writer.line()
+        writer.line(diagram.description or "Generated from UML model")
+        writer.line('"""')
+        writer.line()
         
         # Import all classes
         for class_def in diagram.classes:
             module_name = self._to_snake_case(class_def.name)
-            lines.append(f'from .{module_name} import {class_def.name}')
+            writer.line(f'from .{module_name} import {class_def.name}')
         
-        lines.append('')
-        lines.append('__all__ = [')
-        for class_def in diagram.classes:
-            lines.append(f'    "{class_def.name}",')
-        lines.append(']')
+        writer.line()
+        writer.line('__all__ = [')
+        with writer.indent():
+            for class_def in diagram.classes:
+                writer.line(f'"{class_def.name}",')
+        writer.line(']')
         
-        return '\n'.join(lines)
+        return writer.getvalue()
     
     def _map_type(self, type_name: str) -> str:
         """Map UML types to Python types"""
-        return self.type_mapping.get(type_name.lower(), type_name)
+        return map_type(self.type_language, type_name)
     
     def _get_default_value(self, type_name: str) -> str:
         """Get default value for a type"""
@@ -367,11 +314,13 @@ class PythonCodeGenerator:
             'bool': 'False',
             'List': '[]',
             'Dict': '{}',
+            'Set': 'set()',
             'datetime.date': 'datetime.date.today()',
             'datetime.datetime': 'datetime.datetime.now()',
         }
         
-        return defaults.get(python_type, 'None')
+        # Generic types default by their head, e.g. List[Order] -> []
+        return defaults.get(python_type.split('[', 1)[0], 'None')
     
     def _to_snake_case(self, name: str) -> str:
         """Convert PascalCase to snake_case"""
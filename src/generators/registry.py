@@ -0,0 +1,122 @@
+"""
+Generator registry for Model-to-Code Generator
+Maps target names to generator classes and imports each one only on first use
+"""
+
+import importlib
+import threading
+from typing import Dict, List, Optional, Union
+
+
+# Installed packages can add targets by declaring an entry point in this group,
+# e.g. `graphql = my_package.generators:GraphQLGenerator`
+ENTRY_POINT_GROUP = 'model_to_code.generators'
+
+# Built-in targets as "module:Class", modules relative to this package
+BUILTIN_GENERATORS: Dict[str, str] = {
+    'python': '.python_generator:PythonCodeGenerator',
+    'java': '.java_generator:JavaCodeGenerator',
+    'typescript': '.typescript_generator:TypeScriptCodeGenerator',
+    'microservices': '.microservice_generator:MicroserviceGenerator',
+    'openapi': '.openapi_generator:OpenAPIGenerator',
+    'devsecops': '.devsecops_generator:DevSecOpsGenerator',
+    'grpc': '.grpc_generator:GrpcGenerator',
+    'graphql': '.graphql_generator:GraphQLGenerator',
+}
+
+
+class GeneratorRegistry:
+    """Lazily resolved mapping of target names to generator classes"""
+    
+    def __init__(self, builtins: Optional[Dict[str, str]] = None):
+        self._specs: Dict[str, Union[str, type]] = dict(BUILTIN_GENERATORS if builtins is None else builtins)
+        self._classes: Dict[str, type] = {}
+        self._entry_points_loaded = False
+        self._lock = threading.Lock()
+    
+    def register(self, name: str, generator: Union[str, type]):
+        """
+        Register a generator under a target name
+
+        Args:
+            name: Target name used on the command line and in the APIs
+            generator: Generator class, or an importable "module:Class" string
+        """
+        with self._lock:
+            self._specs[name] = generator
+            self._classes.pop(name, None)
+    
+    def names(self) -> List[str]:
+        """All registered target names, built-ins first"""
+        self._load_entry_points()
+        return list(self._specs)
+    
+    def builtin_names(self) -> List[str]:
+        """Built-in target names (no plugin discovery, so cheap enough for --help)"""
+        return list(BUILTIN_GENERATORS)
+    
+    def __contains__(self, name: str) -> bool:
+        if name not in self._specs:
+            self._load_entry_points()
+        return name in self._specs
+    
+    def get_class(self, name: str) -> type:
+        """
+        Resolve the generator class for a target, importing it on first use
+
+        Raises:
+            KeyError: If no generator is registered under the name
+        """
+        generator_class = self._classes.get(name)
+        if generator_class is not None:
+            return generator_class
+        
+        if name not in self:
+            raise KeyError(f"Unknown generator: {name}")
+        
+        with self._lock:
+            spec = self._specs[name]
+            if isinstance(spec, str):
+                module_name, _, class_name = spec.partition(':')
+                module = importlib.import_module(module_name, __package__)
+                generator_class = getattr(module, class_name)
+            elif hasattr(spec, 'load'):
+                # Entry point discovered from installed packages
+                generator_class = spec.load()
+            else:
+                generator_class = spec
+            self._classes[name] = generator_class
+        
+        return generator_class
+    
+    def create(self, name: str, cache=None):
+        """Instantiate the generator for a target"""
+        return self.get_class(name)(cache)
+    
+    def _load_entry_points(self):
+        """Discover third-party generators once; built-in names take precedence"""
+        if self._entry_points_loaded:
+            return
+        
+        # importlib.metadata scans installed distributions, so only pay for it when needed
+        from importlib.metadata import entry_points
+        
+        with self._lock:
+            if self._entry_points_loaded:
+                return
+            for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+                self._specs.setdefault(entry_point.name, entry_point)
+            self._entry_points_loaded = True
+
+
+registry = GeneratorRegistry()
+
+
+def register_generator(name: str, generator: Union[str, type]):
+    """Register a generator with the default registry"""
+    registry.register(name, generator)
+
+
+def create_generator(name: str, cache=None):
+    """Create a generator from the default registry"""
+    return registry.create(name, cache)
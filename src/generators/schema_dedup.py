@@ -0,0 +1,218 @@
+"""
+Schema deduplication for OpenAPI specs
+Hoists repeated component subschemas into shared components referenced by $ref
+"""
+
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Set, Tuple
+
+
+SCHEMA_REF_PREFIX = "#/components/schemas/"
+
+# Keywords whose values are a subschema, a list of subschemas or a map of named ones
+_SUBSCHEMA_KEYWORDS = {
+    "items": "schema", "additionalProperties": "schema", "not": "schema",
+    "allOf": "list", "anyOf": "list", "oneOf": "list",
+    "properties": "map",
+}
+
+
+@dataclass
+class DedupReport:
+    """Outcome of a deduplication pass"""
+    bytes_before: int
+    bytes_after: int
+    components: Dict[str, int] = field(default_factory=dict)  # hoisted name -> references
+    
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_before - self.bytes_after
+    
+    @property
+    def reduction(self) -> float:
+        """Saved fraction of the compact JSON size of the spec"""
+        return self.bytes_saved / self.bytes_before if self.bytes_before else 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "bytesBefore": self.bytes_before,
+            "bytesAfter": self.bytes_after,
+            "bytesSaved": self.bytes_saved,
+            "reduction": round(self.reduction, 4),
+            "hoistedComponents": self.components,
+        }
+
+
+def deduplicate_schemas(spec: Dict[str, Any], min_savings: int = 64) -> DedupReport:
+    """
+    Hoist repeated subschemas of components.schemas into shared components, in place
+
+    A subschema is hoisted when replacing its copies by $ref saves at least
+    `min_savings` bytes of compact JSON. Each pass only hoists the outermost
+    candidates; structures nested inside them are reconsidered in the next pass,
+    once the copies around them are gone.
+
+    Returns:
+        Report with the spec size before and after, and the hoisted components
+    """
+    schemas = spec.get("components", {}).get("schemas")
+    bytes_before = _size(spec)
+    report = DedupReport(bytes_before=bytes_before, bytes_after=bytes_before)
+    if not schemas:
+        return report
+    
+    while True:
+        # Fingerprints by node identity; nodes are not modified until the replacement walk
+        fingerprints: Dict[int, str] = {}
+        occurrences = _count_subschemas(schemas, fingerprints)
+        candidates = {
+            fingerprint for fingerprint, (count, _, _) in occurrences.items()
+            if count >= 2 and _savings(fingerprint, count, 0) >= min_savings
+        }
+        candidates -= _nested_candidates(schemas, candidates, fingerprints)
+        
+        hoisted: Dict[str, str] = {}
+        taken = set(schemas)
+        # The most widely shared schemas get first pick of the plain names (ties in walk order)
+        ranked = sorted((fingerprint for fingerprint in occurrences if fingerprint in candidates),
+                        key=lambda fingerprint: -occurrences[fingerprint][0])
+        for fingerprint in ranked:
+            count, hint, owner = occurrences[fingerprint]
+            name = _component_name(hint, owner, taken)
+            # The estimate above assumed a free name; long names can eat the savings
+            if _savings(fingerprint, count, len(name)) >= min_savings:
+                hoisted[fingerprint] = name
+                taken.add(name)
+                report.components[name] = count
+        if not hoisted:
+            break
+        _replace_subschemas(schemas, hoisted, fingerprints)
+    
+    report.bytes_after = _size(spec)
+    return report
+
+
+def _size(document: Any) -> int:
+    return len(json.dumps(document, separators=(',', ':')))
+
+
+def _fingerprint(schema: Dict[str, Any]) -> str:
+    """Canonical JSON of a schema; equal fingerprints mean interchangeable schemas"""
+    return json.dumps(schema, sort_keys=True, separators=(',', ':'))
+
+
+def _savings(fingerprint: str, count: int, name_length: int) -> int:
+    """Bytes saved by replacing `count` copies with one component and $refs to it"""
+    ref_size = len('{"$ref":""}') + len(SCHEMA_REF_PREFIX) + name_length
+    return count * len(fingerprint) - (len(fingerprint) + count * ref_size)
+
+
+def _subschemas(schema: Dict[str, Any]) -> Iterator[Tuple[Any, Any, str]]:
+    """(container, key, name hint) for every direct subschema position of a schema"""
+    # Follows the schema's own key order, so walks (and component names) are deterministic
+    for keyword, value in schema.items():
+        kind = _SUBSCHEMA_KEYWORDS.get(keyword)
+        if kind is None:
+            continue
+        if kind == "schema":
+            if isinstance(value, dict):
+                yield schema, keyword, _anonymous_hint(value, keyword)
+        elif kind == "list":
+            if isinstance(value, list):
+                for index, member in enumerate(value):
+                    if isinstance(member, dict):
+                        yield value, index, _anonymous_hint(member, keyword)
+        elif isinstance(value, dict):
+            for name, member in value.items():
+                if isinstance(member, dict):
+                    yield value, name, name
+
+
+def _anonymous_hint(schema: Dict[str, Any], keyword: str) -> str:
+    """Name hint for a schema without a property name (wrappers take their only property's)"""
+    properties = schema.get("properties")
+    if isinstance(properties, dict) and len(properties) == 1:
+        return next(iter(properties))
+    return keyword
+
+
+def _roots(schemas: Dict[str, Any]) -> List[Tuple[Dict[str, Any], str]]:
+    """(schema, name) of the named schemas as a walk stack (first schema on top)"""
+    return [(schema, name) for name, schema in reversed(list(schemas.items())) if isinstance(schema, dict)]
+
+
+def _count_subschemas(schemas: Dict[str, Any], fingerprints: Dict[int, str]) -> Dict[str, List[Any]]:
+    """Fingerprint -> [occurrences, name hint, owning schema] (first occurrence), in walk order"""
+    occurrences: Dict[str, List[Any]] = {}
+    stack = _roots(schemas)
+    while stack:
+        schema, owner = stack.pop()
+        children = [(container[key], hint) for container, key, hint in _subschemas(schema)]
+        for subschema, hint in children:
+            if "$ref" in subschema:
+                continue
+            fingerprint = fingerprints.get(id(subschema))
+            if fingerprint is None:
+                fingerprint = fingerprints[id(subschema)] = _fingerprint(subschema)
+            entry = occurrences.get(fingerprint)
+            if entry is None:
+                occurrences[fingerprint] = [1, hint, owner]
+            else:
+                entry[0] += 1
+        stack.extend((subschema, owner) for subschema, _ in reversed(children))
+    return occurrences
+
+
+def _nested_candidates(schemas: Dict[str, Any], candidates: Set[str], fingerprints: Dict[int, str]) -> Set[str]:
+    """Candidates with at least one copy inside another candidate"""
+    nested = set()
+    stack = [(schema, False) for schema, _ in _roots(schemas)]
+    while stack:
+        schema, inside = stack.pop()
+        for container, key, _ in reversed(list(_subschemas(schema))):
+            subschema = container[key]
+            is_candidate = fingerprints.get(id(subschema)) in candidates
+            if is_candidate and inside:
+                nested.add(fingerprints[id(subschema)])
+            stack.append((subschema, inside or is_candidate))
+    return nested
+
+
+def _component_name(hint: str, owner: str, taken: Set[str]) -> str:
+    """Schema name from where the subschema first appeared, qualified by its owner if taken"""
+    base = _pascal_case(hint) or "Schema"
+    if base not in taken:
+        return base
+    base = _pascal_case(owner) + base
+    name = base
+    suffix = 2
+    while name in taken:
+        name = f"{base}{suffix}"
+        suffix += 1
+    return name
+
+
+def _pascal_case(text: str) -> str:
+    return ''.join(part[:1].upper() + part[1:] for part in text.replace('-', '_').split('_') if part)
+
+
+def _replace_subschemas(schemas: Dict[str, Any], hoisted: Dict[str, str], fingerprints: Dict[int, str]):
+    """Swap hoisted subschemas for $refs and add each one to the named schemas"""
+    bodies: Dict[str, Dict[str, Any]] = {}
+    stack = [schema for schema, _ in _roots(schemas)]
+    while stack:
+        children = []
+        for container, key, _ in _subschemas(stack.pop()):
+            subschema = container[key]
+            name = hoisted.get(fingerprints.get(id(subschema)))
+            if name is None:
+                children.append(subschema)
+                continue
+            container[key] = {"$ref": SCHEMA_REF_PREFIX + name}
+            # Hoisted schemas are outermost candidates, so nothing below them changes this pass
+            bodies.setdefault(name, subschema)
+        stack.extend(reversed(children))
+    
+    for name in hoisted.values():
+        schemas[name] = bodies[name]
@@ -0,0 +1,266 @@
+"""
+Database migrations for the microservice generator
+Derives the PostgreSQL schema of a service (tables, keys and indexes) for Flyway
+"""
+
+import hashlib
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+from ..models.class_model import ClassDefinition
+from .jpa_mapping import EntityMapping
+
+
+MIGRATION_DIR = "src/main/resources/db/migration"
+
+# Column types of the Java types the Spring generator emits
+SQL_TYPES = {
+    'String': 'VARCHAR(255)',
+    'Integer': 'INTEGER',
+    'Long': 'BIGINT',
+    'Double': 'DOUBLE PRECISION',
+    'Boolean': 'BOOLEAN',
+    'LocalDateTime': 'TIMESTAMP',
+    'LocalDate': 'DATE',
+}
+DEFAULT_SQL_TYPE = 'VARCHAR(255)'
+
+# Words PostgreSQL reserves; tables and columns named like this must be quoted
+RESERVED_WORDS = frozenset('''
+    all analyse analyze and any array as asc asymmetric both case cast check collate column
+    constraint create current_catalog current_date current_role current_time current_timestamp
+    current_user default deferrable desc distinct do else end except false fetch for foreign
+    from grant group having in initially intersect into lateral leading limit localtime
+    localtimestamp not null offset on only or order placing primary references returning
+    select session_user some symmetric table then to trailing true union unique user using
+    variadic when where window with
+'''.split())
+
+# PostgreSQL truncates longer identifiers
+_MAX_IDENTIFIER = 63
+
+# Columns every entity table gets, with the entity fields behind them: insert and update
+# times set by the entity's lifecycle callbacks, and the soft-delete marker
+AUDIT_COLUMNS = {'created_at': 'createdAt', 'updated_at': 'updatedAt', 'deleted_at': 'deletedAt'}
+
+# Column a large table is partitioned and BRIN-indexed on, unless the model names one
+DEFAULT_PARTITION_COLUMN = 'created_at'
+
+
+class Column(NamedTuple):
+    name: str
+    sql_type: str
+    not_null: bool = False
+
+
+class Index(NamedTuple):
+    name: str
+    table: str
+    columns: str
+    method: Optional[str] = None
+    where: Optional[str] = None
+    # What the index serves, written above it in the migration
+    purpose: str = ''
+
+
+class ForeignKey(NamedTuple):
+    name: str
+    table: str
+    column: str
+    target: str
+
+
+class Table(NamedTuple):
+    name: str
+    columns: List[Column]
+    primary_key: str
+    comment: str = ''
+    # Partitioning recipe for tables marked as large, written as a comment
+    partition_hint: Optional[str] = None
+
+
+class Schema(NamedTuple):
+    """Everything the initial migration of a service creates"""
+    tables: List[Table]
+    foreign_keys: List[ForeignKey]
+    indexes: List[Index]
+    
+    @property
+    def needs_trigram(self) -> bool:
+        return any(index.method == 'gin' for index in self.indexes)
+
+
+def physical_name(name: str) -> str:
+    """
+    Column or table name as Spring Boot's naming strategy writes it
+
+    Mirrors CamelCaseToUnderscoresNamingStrategy: dots become underscores, an
+    underscore goes between a lower-case letter and a capitalized word, and the
+    result is lower case.
+    """
+    chars = list(name.replace('.', '_'))
+    i = 1
+    while i < len(chars) - 1:
+        if chars[i - 1].islower() and chars[i].isupper() and chars[i + 1].islower():
+            chars.insert(i, '_')
+            i += 1
+        i += 1
+    return ''.join(chars).lower()
+
+
+def sql_identifier(name: str) -> str:
+    """Physical name as it appears in SQL, quoted if PostgreSQL reserves it"""
+    physical = physical_name(name)
+    return f'"{physical}"' if physical in RESERVED_WORDS else physical
+
+
+def jpa_name(name: str) -> str:
+    """Name for a JPA @Table/@Column annotation, with the quotes a reserved word needs"""
+    physical = physical_name(name)
+    return f'\\"{physical}\\"' if physical in RESERVED_WORDS else name
+
+
+def table_name(cls: ClassDefinition) -> str:
+    return cls.name.lower()
+
+
+def audit_column(cls: ClassDefinition, attr: Any) -> Optional[str]:
+    """
+    The audit column a model attribute maps to, if any
+
+    Such an attribute is that column rather than a second one with the same name, so it
+    must be a datetime like the column.
+
+    Raises:
+        ValueError: For an attribute of another type mapping to an audit column
+    """
+    column = physical_name(attr.name)
+    if column not in AUDIT_COLUMNS:
+        return None
+    if attr.is_collection or attr.java_type != 'LocalDateTime':
+        raise ValueError(f"{cls.name}.{attr.name} maps to the {column} audit column every entity gets, "
+                         f"which holds a datetime; make it a datetime or rename it")
+    return column
+
+
+def is_large(cls: ClassDefinition) -> bool:
+    """Tables marked large in the model: <<large>> stereotype or `large: true` annotation"""
+    return (cls.stereotype or '').lower() == 'large' or bool(cls.annotations.get('large'))
+
+
+def plan_schema(classes: Sequence[ClassDefinition], mappings: Dict[str, EntityMapping],
+                attributes: Dict[str, Sequence[Any]], finders: Dict[str, Sequence[Any]]) -> Schema:
+    """
+    Tables, foreign keys and indexes for the entities of one service
+
+    Args:
+        classes: Entities of the service
+        mappings: JPA associations per class name
+        attributes: Column attributes per class name (SpringAttribute-like:
+            name, java_type, is_collection)
+        finders: Derived findBy* queries of each class's repository (Finder-like:
+            attribute, method, containing)
+
+    Every generated query is covered: foreign keys and join tables are indexed,
+    each findBy column gets a b-tree index (plus a trigram index where the
+    repository has a *Containing string search), and a partial index on id
+    serves the keyset list query over rows that are not soft-deleted.
+    """
+    tables: List[Table] = []
+    foreign_keys: List[ForeignKey] = []
+    indexes: List[Index] = []
+    
+    for cls in classes:
+        table = table_name(cls)
+        table_sql = sql_identifier(table)
+        mapping = mappings[cls.name]
+        columns = [Column('id', 'BIGINT GENERATED BY DEFAULT AS IDENTITY', True)]
+        collections = []
+        for attr in attributes[cls.name]:
+            if audit_column(cls, attr):
+                continue
+            if attr.is_collection:
+                collections.append(attr)
+            else:
+                columns.append(Column(sql_identifier(attr.name), SQL_TYPES.get(attr.java_type, DEFAULT_SQL_TYPE), True))
+        
+        for assoc in mapping.references:
+            column = physical_name(assoc.join_column)
+            columns.append(Column(column, 'BIGINT'))
+            foreign_keys.append(ForeignKey(_name('fk', table, column), table_sql, column,
+                                           sql_identifier(assoc.target.lower())))
+            indexes.append(Index(_name('idx', table, column), table_sql, column,
+                                 purpose=f"{assoc.field} foreign key and its batch fetches"))
+        
+        columns += [Column(column, 'TIMESTAMP') for column in AUDIT_COLUMNS]
+        
+        partition_hint = None
+        if is_large(cls):
+            partition_column = physical_name(cls.annotations.get('partition_by') or DEFAULT_PARTITION_COLUMN)
+            partition_hint = _partition_hint(table_sql, partition_column)
+            # Cheap to maintain on append-mostly tables, and prunes range scans
+            indexes.append(Index(_name('brin', table, partition_column), table_sql, partition_column,
+                                 method='brin', purpose=f"range scans on {partition_column}"))
+        
+        tables.append(Table(table_sql, columns, 'id', comment=cls.name, partition_hint=partition_hint))
+        
+        # Keyset pages, by-id lookups and exports all filter on deleted_at IS NULL
+        indexes.append(Index(_name('idx', table, 'active'), table_sql, 'id', where='deleted_at IS NULL',
+                             purpose="keyset pages and exports of rows that are not soft-deleted"))
+        
+        # The same queries the repository declares, so no index outlives or misses its finder
+        for finder in finders[cls.name]:
+            attr = finder.attribute
+            column = sql_identifier(attr.name)
+            indexes.append(Index(_name('idx', table, physical_name(attr.name)), table_sql, column,
+                                 purpose=finder.method))
+            if finder.containing:
+                indexes.append(Index(_name('trgm', table, physical_name(attr.name)), table_sql,
+                                     f"{column} gin_trgm_ops", method='gin',
+                                     purpose=f"{finder.method}Containing (LIKE '%...%')"))
+        
+        for attr in collections:
+            collection_table = physical_name(f"{table}_{attr.name}")
+            owner_column = f"{physical_name(table)}_id"
+            tables.append(Table(sql_identifier(collection_table), [
+                Column(owner_column, 'BIGINT', True),
+                Column(sql_identifier(attr.name), DEFAULT_SQL_TYPE),
+            ], '', comment=f"{cls.name}.{attr.name}"))
+            foreign_keys.append(ForeignKey(_name('fk', collection_table, owner_column),
+                                           sql_identifier(collection_table), owner_column, table_sql))
+            indexes.append(Index(_name('idx', collection_table, owner_column), sql_identifier(collection_table),
+                                 owner_column, purpose=f"loading {cls.name}.{attr.name}"))
+        
+        for assoc in mapping.collections:
+            if not assoc.is_owning:
+                continue
+            # Many-to-many owner: the join table of its @JoinTable annotation
+            join_table, owner_column, target_column = assoc.join_table
+            tables.append(Table(join_table, [
+                Column(owner_column, 'BIGINT', True),
+                Column(target_column, 'BIGINT', True),
+            ], f"{owner_column}, {target_column}", comment=f"{cls.name}.{assoc.field}"))
+            foreign_keys.append(ForeignKey(_name('fk', join_table, owner_column), join_table, owner_column, table_sql))
+            foreign_keys.append(ForeignKey(_name('fk', join_table, target_column), join_table, target_column,
+                                           sql_identifier(assoc.target.lower())))
+            # The primary key leads with the owner; the inverse side needs its own index
+            indexes.append(Index(_name('idx', join_table, target_column), join_table, target_column,
+                                 purpose=f"{assoc.target} side of {cls.name}.{assoc.field}"))
+    
+    return Schema(tables, foreign_keys, indexes)
+
+
+def _partition_hint(table: str, column: str) -> str:
+    partition = table.strip('"') + '_2024_01'
+    return (f"Large table: consider declarative range partitioning on {column}, e.g.\n"
+            f"  CREATE TABLE {table} (...) PARTITION BY RANGE ({column});\n"
+            f"  CREATE TABLE {partition} PARTITION OF {table}\n"
+            f"      FOR VALUES FROM ('2024-01-01') TO ('2024-02-01');\n"
+            f"The primary key must then include {column}: PRIMARY KEY (id, {column})")
+
+
+def _name(prefix: str, table: str, column: str) -> str:
+    """Constraint or index name, shortened with a hash past PostgreSQL's identifier limit"""
+    name = f"{prefix}_{physical_name(table)}_{column}".replace('"', '')
+    if len(name) <= _MAX_IDENTIFIER:
+        return name
+    digest = hashlib.sha1(name.encode('utf-8')).hexdigest()[:8]
+    return f"{name[:_MAX_IDENTIFIER - 9]}_{digest}"
@@ -0,0 +1,267 @@
+"""
+Service decomposition for the microservice generator
+Clusters classes into services by weighted label propagation over the relationship graph
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Set, Tuple
+from ..models.class_model import ClassDiagram, ClassDefinition
+
+
+# How strongly a relationship ties its two classes to the same service
+EDGE_WEIGHTS: Dict[str, float] = {
+    'composition': 3.0,
+    'aggregation': 2.0,
+    'inheritance': 2.0,
+    'association': 1.0,
+    'dependency': 0.5,
+}
+DEFAULT_EDGE_WEIGHT = 1.0
+
+COMMON_SERVICE = 'common-service'
+
+
+@dataclass
+class ServiceCluster:
+    """One service and why its classes ended up in it"""
+    name: str
+    domain: str
+    anchor: str
+    classes: List[ClassDefinition]
+    internal_weight: float = 0.0
+    external_weight: float = 0.0
+    placements: Dict[str, str] = field(default_factory=dict)  # class name -> reason
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "anchor": self.anchor,
+            "classes": [cls.name for cls in self.classes],
+            "internalWeight": self.internal_weight,
+            "externalWeight": self.external_weight,
+            "placements": self.placements,
+        }
+
+
+@dataclass
+class Decomposition:
+    """Services of a diagram, with the settings that produced them"""
+    services: List[ServiceCluster]
+    max_size: int
+    min_size: int
+    iterations: int
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "algorithm": "weighted label propagation",
+            "edgeWeights": EDGE_WEIGHTS,
+            "maxServiceSize": self.max_size,
+            "minServiceSize": self.min_size,
+            "iterations": self.iterations,
+            "services": [service.to_dict() for service in self.services],
+        }
+
+
+def decompose(diagram: ClassDiagram, max_size: int = 12, min_size: int = 2,
+              max_iterations: int = 20) -> Decomposition:
+    """
+    Cluster the classes of a diagram into services
+
+    Every class repeatedly adopts the service label carrying the most
+    relationship weight among its neighbours, in diagram order, until no label
+    changes. Labels that already hold `max_size` classes take no new members.
+    Ties go to the class's current label, then to the label first seen in the
+    diagram, so the result depends only on the diagram. Each pass is linear in
+    the number of relationships.
+
+    Clusters smaller than `min_size` (isolated classes included) are collected
+    into common services of at most `max_size` classes each.
+
+    Raises:
+        ValueError: When class names repeat; each class becomes an entity of its
+            own, so a name must identify one class
+    """
+    classes = _unique_classes(diagram)
+    neighbours, edge_kinds = _weighted_graph(diagram, classes)
+    
+    labels = list(range(len(classes)))
+    sizes = [1] * len(classes)
+    iterations = 0
+    changed = True
+    while changed and iterations < max_iterations:
+        changed = False
+        iterations += 1
+        for node, edges in enumerate(neighbours):
+            if not edges:
+                continue
+            current = labels[node]
+            weights: Dict[int, float] = {}
+            for other, weight in edges.items():
+                label = labels[other]
+                weights[label] = weights.get(label, 0.0) + weight
+            
+            best, best_weight = current, weights.get(current, 0.0)
+            for label, weight in weights.items():
+                if label == current or sizes[label] >= max_size:
+                    continue
+                if weight > best_weight or (weight == best_weight and best != current and label < best):
+                    best, best_weight = label, weight
+            
+            if best != current:
+                sizes[current] -= 1
+                sizes[best] += 1
+                labels[node] = best
+                changed = True
+    
+    # Clusters in order of their first class; small ones go to the common service
+    members: Dict[int, List[int]] = {}
+    for node, label in enumerate(labels):
+        members.setdefault(label, []).append(node)
+    clustered = [nodes for nodes in members.values() if len(nodes) >= min_size]
+    leftovers = [node for nodes in members.values() if len(nodes) < min_size for node in nodes]
+    
+    services = []
+    taken = {COMMON_SERVICE}
+    for nodes in clustered:
+        services.append(_describe(nodes, classes, neighbours, edge_kinds, taken))
+    # Leftovers in diagram order, split so the common services respect max_size too
+    leftovers.sort()
+    for start in range(0, len(leftovers), max_size):
+        name = COMMON_SERVICE if start == 0 else _unique_name(COMMON_SERVICE, taken)
+        services.append(_describe_common(name, leftovers[start:start + max_size], classes, neighbours))
+    
+    return Decomposition(services=services, max_size=max_size, min_size=min_size, iterations=iterations)
+
+
+def _unique_classes(diagram: ClassDiagram) -> List[ClassDefinition]:
+    """The diagram's classes, checked to have distinct names"""
+    by_name = diagram.build_index().classes_by_name
+    if len(by_name) < len(diagram.classes):
+        counts: Dict[str, int] = {}
+        for cls in diagram.classes:
+            counts[cls.name] = counts.get(cls.name, 0) + 1
+        repeated = ', '.join(f"{name} ({count}x)" for name, count in counts.items() if count > 1)
+        raise ValueError(f"Class names must be unique to split the model into services: {repeated}")
+    return list(diagram.classes)
+
+
+def _weighted_graph(diagram: ClassDiagram, classes: List[ClassDefinition]
+                    ) -> Tuple[List[Dict[int, float]], Dict[Tuple[int, int], str]]:
+    """Adjacency (neighbour -> summed weight) per class, and the strongest edge kind per pair"""
+    positions = {cls.name: position for position, cls in enumerate(classes)}
+    neighbours: List[Dict[int, float]] = [{} for _ in classes]
+    edge_kinds: Dict[Tuple[int, int], str] = {}
+    
+    def connect(source: str, target: str, kind: str):
+        a, b = positions.get(source), positions.get(target)
+        if a is None or b is None or a == b:
+            return
+        weight = EDGE_WEIGHTS.get(kind, DEFAULT_EDGE_WEIGHT)
+        neighbours[a][b] = neighbours[a].get(b, 0.0) + weight
+        neighbours[b][a] = neighbours[b].get(a, 0.0) + weight
+        pair = (min(a, b), max(a, b))
+        strongest = edge_kinds.get(pair)
+        if strongest is None or EDGE_WEIGHTS.get(strongest, DEFAULT_EDGE_WEIGHT) < weight:
+            edge_kinds[pair] = kind
+    
+    inherits = set()
+    for rel in diagram.relationships:
+        kind = rel.relationship_type.lower()
+        connect(rel.source_class, rel.target_class, kind)
+        if kind == 'inheritance':
+            inherits.add((rel.source_class, rel.target_class))
+    # Parents declared on the class itself, unless a relationship already says so
+    for cls in classes:
+        for parent in cls.parent_classes:
+            if (cls.name, parent) not in inherits:
+                connect(cls.name, parent, 'inheritance')
+    
+    return neighbours, edge_kinds
+
+
+def _describe(nodes: List[int], classes: List[ClassDefinition], neighbours: List[Dict[int, float]],
+              edge_kinds: Dict[Tuple[int, int], str], taken: Set[str]) -> ServiceCluster:
+    """Name a cluster after its most connected class and record each member's strongest tie"""
+    members = set(nodes)
+    internal = {node: sum(w for other, w in neighbours[node].items() if other in members) for node in nodes}
+    # Most internal weight wins; the first class in the diagram breaks ties
+    anchor = max(nodes, key=lambda node: (internal[node], -node))
+    anchor_name = classes[anchor].name
+    
+    placements = {}
+    for node in nodes:
+        if node == anchor:
+            placements[anchor_name] = f"anchor: strongest ties in the service ({internal[node]:g})"
+            continue
+        partner = max((other for other in neighbours[node] if other in members),
+                      key=lambda other: (neighbours[node][other], -other), default=None)
+        if partner is None:
+            # Possible when propagation stops at max_iterations
+            placements[classes[node].name] = "no direct tie (label propagation did not converge)"
+        else:
+            kind = edge_kinds[(min(node, partner), max(node, partner))]
+            placements[classes[node].name] = f"{kind} with {classes[partner].name} ({neighbours[node][partner]:g})"
+    
+    base = _kebab_case(anchor_name)
+    if not base.endswith('-service'):
+        base += '-service'
+    name = _unique_name(base, taken)
+    
+    internal_weight, external_weight = _cut(nodes, members, neighbours)
+    return ServiceCluster(
+        name=name,
+        domain=anchor_name,
+        anchor=anchor_name,
+        classes=[classes[node] for node in nodes],
+        internal_weight=internal_weight,
+        external_weight=external_weight,
+        placements=placements,
+    )
+
+
+def _unique_name(base: str, taken: Set[str]) -> str:
+    """`base`, or `base-2`, `base-3`... if taken; the name returned is then taken"""
+    name = base
+    suffix = 2
+    while name in taken:
+        name = f"{base}-{suffix}"
+        suffix += 1
+    taken.add(name)
+    return name
+
+
+def _describe_common(name: str, nodes: List[int], classes: List[ClassDefinition],
+                     neighbours: List[Dict[int, float]]) -> ServiceCluster:
+    placements = {
+        classes[node].name: ("no relationships" if not neighbours[node]
+                             else "cluster below the minimum service size")
+        for node in nodes
+    }
+    internal_weight, external_weight = _cut(nodes, set(nodes), neighbours)
+    return ServiceCluster(
+        name=name,
+        domain='Common',
+        anchor='',
+        classes=[classes[node] for node in nodes],
+        internal_weight=internal_weight,
+        external_weight=external_weight,
+        placements=placements,
+    )
+
+
+def _cut(nodes: List[int], members: Set[int], neighbours: List[Dict[int, float]]) -> Tuple[float, float]:
+    """Relationship weight inside a service and weight crossing its boundary"""
+    inside = crossing = 0.0
+    for node in nodes:
+        for other, weight in neighbours[node].items():
+            if other in members:
+                inside += weight
+            else:
+                crossing += weight
+    return inside / 2, crossing
+
+
+def _kebab_case(name: str) -> str:
+    s1 = re.sub('(.)([A-Z][a-z]+)', r'\1-\2', name)
+    return re.sub('([a-z0-9])([A-Z])', r'\1-\2', s1).lower()
@@ -0,0 +1,306 @@
+"""
+Per-service settings for the microservice generator
+Performance profiles and deployment inputs, read from an optional --service-config file
+and from capacity annotations in the model
+"""
+
+import json
+import math
+from dataclasses import dataclass, field, fields, replace
+from typing import Any, Dict, Iterable, Optional
+
+import yaml
+
+from ..models.class_model import ClassDefinition
+
+
+@dataclass(frozen=True)
+class PerformanceProfile:
+    """Runtime tuning a generated service is built with"""
+    name: str
+    cache: str                    # caffeine, redis or none (Spring cache behind @Cacheable reads)
+    cache_ttl_seconds: int        # also used when a service overrides the cache backend
+    cache_max_entries: int        # per cache, for caffeine
+    second_level_cache: bool      # Hibernate L2 cache for entities
+    jdbc_batch_size: int
+    max_pool_size: int            # upper bound on connections per pod
+    show_sql: bool = False
+
+
+PROFILES: Dict[str, PerformanceProfile] = {
+    profile.name: profile for profile in (
+        PerformanceProfile('balanced', cache='caffeine', cache_ttl_seconds=300, cache_max_entries=10_000,
+                           second_level_cache=True, jdbc_batch_size=50, max_pool_size=20),
+        PerformanceProfile('read-heavy', cache='caffeine', cache_ttl_seconds=900, cache_max_entries=50_000,
+                           second_level_cache=True, jdbc_batch_size=50, max_pool_size=30),
+        PerformanceProfile('write-heavy', cache='none', cache_ttl_seconds=60, cache_max_entries=5_000,
+                           second_level_cache=False, jdbc_batch_size=100, max_pool_size=30),
+        PerformanceProfile('dev', cache='none', cache_ttl_seconds=60, cache_max_entries=1_000,
+                           second_level_cache=False, jdbc_batch_size=50, max_pool_size=5, show_sql=True),
+    )
+}
+DEFAULT_PROFILE = 'balanced'
+
+CACHE_BACKENDS = ('caffeine', 'redis', 'none')
+
+# How a service's container starts: plain JVM, JVM with an AppCDS archive, or GraalVM native image
+STARTUP_MODES = ('jvm', 'cds', 'native')
+
+# Kubernetes' default rolling update adds up to 25% extra pods while old ones drain
+ROLLING_UPDATE_SURGE = 0.25
+
+# Autoscaling keeps pods below full load: queueing delay grows sharply near saturation,
+# so services with a tight p99 target run with more headroom
+TARGET_UTILIZATION = 0.7
+LATENCY_SENSITIVE_UTILIZATION = 0.5
+LATENCY_SENSITIVE_P99_MS = 250
+
+# At least two pods, so a node drain or a crash never takes the whole service down
+MIN_REPLICAS = 2
+# Default room the autoscaler has above the minimum
+SCALE_OUT_FACTOR = 2
+
+# Fewest connections a pod's pool may hold: one for a request's transaction, one for
+# the health check and background work next to it
+MIN_POOL_SIZE = 2
+
+# Model annotations carrying capacity inputs (summed / tightest over a service's classes)
+RPS_ANNOTATION = 'expected_rps'
+P99_ANNOTATION = 'p99_ms'
+
+# Counts end up verbatim in manifests and pool settings, so they must be whole numbers
+_POSITIVE_INTEGERS = ('replicas', 'max_replicas', 'p99_ms', 'db_max_connections')
+_POSITIVE_NUMBERS = ('expected_rps', 'pod_rps')
+
+
+@dataclass(frozen=True)
+class ServiceSettings:
+    """Settings of one generated service"""
+    profile: str = DEFAULT_PROFILE
+    # Overrides the profile's cache backend (e.g. redis for caches shared across pods)
+    cache: Optional[str] = None
+    startup: str = 'jvm'
+    # Minimum replicas when no expected load is known
+    replicas: int = 3
+    max_replicas: Optional[int] = None
+    # Capacity inputs; unset ones are taken from the model's annotations
+    expected_rps: Optional[float] = None
+    p99_ms: Optional[int] = None
+    # Requests per second one pod serves at its CPU request (measure it with a load test)
+    pod_rps: float = 100.0
+    db_max_connections: int = 100
+    db_reserved_connections: int = 10
+    
+    @property
+    def performance(self) -> PerformanceProfile:
+        profile = PROFILES[self.profile]
+        return replace(profile, cache=self.cache) if self.cache else profile
+    
+    @property
+    def target_utilization(self) -> float:
+        """Share of a pod's capacity the autoscaler aims for"""
+        if self.p99_ms is not None and self.p99_ms < LATENCY_SENSITIVE_P99_MS:
+            return LATENCY_SENSITIVE_UTILIZATION
+        return TARGET_UTILIZATION
+    
+    @property
+    def target_pod_rps(self) -> int:
+        """Requests per second per pod the autoscaler scales out at"""
+        return max(1, int(self.pod_rps * self.target_utilization))
+    
+    @property
+    def min_pods(self) -> int:
+        """Autoscaler minimum: enough pods for the expected load at the target utilization"""
+        if self.expected_rps:
+            return max(MIN_REPLICAS, math.ceil(self.expected_rps / self.target_pod_rps))
+        return max(MIN_REPLICAS, self.replicas)
+    
+    @property
+    def max_pods(self) -> int:
+        return max(self.max_replicas or self.min_pods * SCALE_OUT_FACTOR, self.min_pods)
+    
+    @property
+    def peak_pods(self) -> int:
+        """Pods that can hold connections at once: every replica plus a rolling update's surge"""
+        return self.max_pods + math.ceil(self.max_pods * ROLLING_UPDATE_SURGE)
+    
+    @property
+    def available_connections(self) -> int:
+        """Database connections the service's pods may hold between them"""
+        return self.db_max_connections - self.db_reserved_connections
+    
+    @property
+    def pool_size(self) -> int:
+        """
+        Connections per pod, so the peak pod count stays within the database's limit
+
+        ServiceConfig.capacity_for rejects settings where this drops below MIN_POOL_SIZE.
+        """
+        return min(self.performance.max_pool_size, self.available_connections // self.peak_pods)
+    
+    @property
+    def gc_pause_ms(self) -> Optional[int]:
+        """G1 pause goal: a small share of the p99 budget, when there is one"""
+        return max(20, self.p99_ms // 4) if self.p99_ms else None
+    
+    def with_model_capacity(self, classes: Iterable[ClassDefinition]) -> 'ServiceSettings':
+        """
+        Fill the capacity inputs the config leaves open from class annotations
+
+        A service expects the sum of its classes' `expected_rps` and must meet the
+        tightest of their `p99_ms` targets.
+        """
+        classes = list(classes)
+        changes: Dict[str, Any] = {}
+        if self.expected_rps is None:
+            rates = [_annotation(cls, RPS_ANNOTATION) for cls in classes if RPS_ANNOTATION in cls.annotations]
+            if rates:
+                changes['expected_rps'] = sum(rates)
+        if self.p99_ms is None:
+            targets = [_annotation(cls, P99_ANNOTATION) for cls in classes if P99_ANNOTATION in cls.annotations]
+            if targets:
+                changes['p99_ms'] = int(min(targets))
+        return replace(self, **changes) if changes else self
+
+
+@dataclass
+class ServiceConfig:
+    """Default settings and per-service overrides, by generated service name"""
+    defaults: ServiceSettings = field(default_factory=ServiceSettings)
+    services: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    
+    def settings_for(self, service_name: str) -> ServiceSettings:
+        """Defaults with the service's own overrides applied"""
+        overrides = self.services.get(service_name)
+        return replace(self.defaults, **overrides) if overrides else self.defaults
+    
+    def capacity_for(self, service_name: str, classes: Iterable[ClassDefinition]) -> ServiceSettings:
+        """
+        Settings of a service, with the capacity inputs its config leaves open taken from its classes
+
+        Raises:
+            ValueError: When the database has fewer than MIN_POOL_SIZE connections for each
+                pod the service runs at peak
+        """
+        settings = self.settings_for(service_name).with_model_capacity(classes)
+        if settings.available_connections // settings.peak_pods < MIN_POOL_SIZE:
+            raise ValueError(
+                f"{service_name} runs up to {settings.peak_pods} pods at peak ({settings.max_pods} replicas "
+                f"plus rolling-update surge), but db_max_connections - db_reserved_connections leaves "
+                f"{settings.available_connections} connections, fewer than {MIN_POOL_SIZE} per pod; "
+                f"raise db_max_connections or lower max_replicas"
+            )
+        return settings
+    
+    def check_services(self, service_names: Iterable[str]):
+        """
+        Reject overrides for services the model does not produce (usually a misspelt name)
+
+        Raises:
+            ValueError: Naming the unknown services and the generated ones
+        """
+        service_names = list(service_names)
+        unknown = set(self.services) - set(service_names)
+        if unknown:
+            raise ValueError(f"Service config names services the model does not produce: "
+                             f"{', '.join(sorted(unknown))} (generated services: {', '.join(service_names)})")
+    
+    def with_profile(self, profile: str) -> 'ServiceConfig':
+        """Copy whose default profile is `profile`; per-service profiles still win"""
+        _validated({'profile': profile}, '--performance-profile')
+        return replace(self, defaults=replace(self.defaults, profile=profile))
+    
+    def with_startup(self, startup: str) -> 'ServiceConfig':
+        """Copy whose default startup mode is `startup`; per-service modes still win"""
+        _validated({'startup': startup}, '--fast-startup')
+        return replace(self, defaults=replace(self.defaults, startup=startup))
+
+
+def load_service_config(path: str) -> ServiceConfig:
+    """
+    Read a service config file (YAML or JSON)
+
+    Example:
+        defaults:
+          profile: balanced
+          db_max_connections: 200
+        services:
+          order-service:
+            profile: read-heavy
+            cache: redis
+            startup: cds
+            expected_rps: 400
+            p99_ms: 150
+            max_replicas: 12
+
+    Raises:
+        ValueError: For malformed files, unknown keys, profiles, cache backends or startup modes,
+            counts that are not positive integers, and reserved connections that leave none of
+            the database's connections to the services
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        try:
+            data = json.load(f) if path.endswith('.json') else yaml.safe_load(f)
+        except yaml.YAMLError as e:
+            raise ValueError(f"Invalid service config {path}: {e}") from e
+    if data is not None and not isinstance(data, dict):
+        raise ValueError(f"Service config {path} must be a mapping")
+    return parse_service_config(data or {})
+
+
+def parse_service_config(data: Dict[str, Any]) -> ServiceConfig:
+    """Build a ServiceConfig from parsed file contents"""
+    unknown = set(data) - {'defaults', 'services'}
+    if unknown:
+        raise ValueError(f"Unknown service config sections: {', '.join(sorted(unknown))}")
+    
+    defaults = ServiceSettings(**_validated(data.get('defaults') or {}, 'defaults'))
+    _check_connections(defaults, 'defaults')
+    services = {
+        name: _validated(overrides or {}, name)
+        for name, overrides in (data.get('services') or {}).items()
+    }
+    for name, overrides in services.items():
+        _check_connections(replace(defaults, **overrides), name)
+    return ServiceConfig(defaults=defaults, services=services)
+
+
+def _validated(settings: Dict[str, Any], where: str) -> Dict[str, Any]:
+    known = {f.name for f in fields(ServiceSettings)}
+    unknown = set(settings) - known
+    if unknown:
+        raise ValueError(f"Unknown settings in {where}: {', '.join(sorted(unknown))}")
+    if 'profile' in settings and settings['profile'] not in PROFILES:
+        raise ValueError(f"Unknown performance profile in {where}: {settings['profile']} "
+                         f"(choose from {', '.join(PROFILES)})")
+    if 'cache' in settings and settings['cache'] not in CACHE_BACKENDS:
+        raise ValueError(f"Unknown cache in {where}: {settings['cache']} (choose from {', '.join(CACHE_BACKENDS)})")
+    if 'startup' in settings and settings['startup'] not in STARTUP_MODES:
+        raise ValueError(f"Unknown startup mode in {where}: {settings['startup']} "
+                         f"(choose from {', '.join(STARTUP_MODES)})")
+    for name in _POSITIVE_INTEGERS:
+        value = settings.get(name)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, int) or value <= 0):
+            raise ValueError(f"{name} in {where} must be a positive integer, got {value!r}")
+    for name in _POSITIVE_NUMBERS:
+        value = settings.get(name)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0):
+            raise ValueError(f"{name} in {where} must be a positive number, got {value!r}")
+    reserved = settings.get('db_reserved_connections')
+    if reserved is not None and (isinstance(reserved, bool) or not isinstance(reserved, int) or reserved < 0):
+        raise ValueError(f"db_reserved_connections in {where} must be a non-negative integer, got {reserved!r}")
+    return settings
+
+
+def _check_connections(settings: ServiceSettings, where: str):
+    """Reject reserved connections that take up all of the database's connections"""
+    if settings.db_reserved_connections >= settings.db_max_connections:
+        raise ValueError(f"db_reserved_connections in {where} ({settings.db_reserved_connections}) must be "
+                         f"below db_max_connections ({settings.db_max_connections})")
+
+
+def _annotation(cls: ClassDefinition, key: str) -> float:
+    value = cls.annotations[key]
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+        raise ValueError(f"Annotation {key} of {cls.name} must be a positive number, got {value!r}")
+    return value
@@ -0,0 +1,285 @@
+"""
+Multi-file OpenAPI layout
+Splits a spec into a root document, per-tag path files and per-schema component files,
+and bundles such a layout back into a single document
+"""
+
+import json
+import os
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import yaml
+
+
+ROOT_DOCUMENT = "openapi.yaml"
+INDEX_DOCUMENT = "index.json"
+PATHS_DIR = "paths"
+SCHEMAS_DIR = "components/schemas"
+
+SCHEMA_REF_PREFIX = "#/components/schemas/"
+DEFAULT_TAG = "default"
+
+_Loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+def split_spec(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Split a spec into documents linked by relative $refs
+
+    Returns:
+        Relative file path -> document: the root document, one path file per tag,
+        one file per component schema and an index of what lives where
+    """
+    schemas = spec.get("components", {}).get("schemas", {})
+    schema_files = {name: f"{_file_stem(name)}.yaml" for name in schemas}
+    
+    # Path items are grouped by the first tag of their first operation
+    tag_files: Dict[str, str] = {}
+    tag_paths: Dict[str, Dict[str, Any]] = {}
+    path_tags: Dict[str, str] = {}
+    for path, item in spec.get("paths", {}).items():
+        tag = path_tags[path] = _path_tag(item)
+        tag_files.setdefault(tag, f"{PATHS_DIR}/{_file_stem(tag)}.yaml")
+        tag_paths.setdefault(tag, {})[path] = item
+    
+    root: Dict[str, Any] = {}
+    for key, value in spec.items():
+        if key == "paths":
+            root[key] = {path: {"$ref": f"{tag_files[path_tags[path]]}#{_pointer(path)}"} for path in value}
+        elif key == "components":
+            root[key] = {
+                section: ({name: {"$ref": f"{SCHEMAS_DIR}/{schema_files[name]}"} for name in schemas}
+                          if section == "schemas" else _relink(entries, schema_files, SCHEMAS_DIR + "/", ""))
+                for section, entries in value.items()
+            }
+        else:
+            root[key] = value
+    
+    documents: Dict[str, Any] = {ROOT_DOCUMENT: root}
+    for tag, paths in tag_paths.items():
+        documents[tag_files[tag]] = _relink(paths, schema_files, f"../{SCHEMAS_DIR}/", "../" + ROOT_DOCUMENT)
+    for name, schema in schemas.items():
+        # Schemas sit side by side, so they reference each other by file name alone
+        documents[f"{SCHEMAS_DIR}/{schema_files[name]}"] = _relink(schema, schema_files, "", "../../" + ROOT_DOCUMENT)
+    
+    documents[INDEX_DOCUMENT] = _build_index(schemas, schema_files, tag_paths, tag_files)
+    return documents
+
+
+def bundle_spec(root_path: str, tags: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """
+    Rebuild a single-document spec from a split layout
+
+    Files are loaded only when a $ref reaches them, and each file once. With
+    `tags`, only those tags' paths (located through the index) and the schemas
+    they reach are bundled.
+    """
+    return _Bundler(root_path).bundle(None if tags is None else list(tags))
+
+
+def _file_stem(name: str) -> str:
+    return re.sub(r'[^A-Za-z0-9_.-]', '_', name) or "_"
+
+
+def _path_tag(item: Dict[str, Any]) -> str:
+    for operation in item.values():
+        if isinstance(operation, dict) and operation.get("tags"):
+            return str(operation["tags"][0])
+    return DEFAULT_TAG
+
+
+def _pointer(*tokens: str) -> str:
+    """JSON pointer to the given keys"""
+    return ''.join('/' + token.replace('~', '~0').replace('/', '~1') for token in tokens)
+
+
+def _tokens(pointer: str) -> List[str]:
+    return [token.replace('~1', '/').replace('~0', '~') for token in pointer.split('/')[1:]]
+
+
+def _relink(node: Any, schema_files: Dict[str, str], schema_dir: str, root_document: str) -> Any:
+    """
+    Copy of a spec fragment with its local $refs pointed at the split files
+
+    Schema refs go to `schema_dir` + the schema's file; any other local ref goes
+    into `root_document` ("" for the root document itself).
+    """
+    if isinstance(node, dict):
+        ref = node.get("$ref")
+        if isinstance(ref, str) and ref.startswith('#'):
+            node = dict(node)
+            node["$ref"] = _relink_ref(ref, schema_files, schema_dir, root_document)
+            return node
+        return {key: _relink(value, schema_files, schema_dir, root_document) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_relink(value, schema_files, schema_dir, root_document) for value in node]
+    return node
+
+
+def _relink_ref(ref: str, schema_files: Dict[str, str], schema_dir: str, root_document: str) -> str:
+    if ref.startswith(SCHEMA_REF_PREFIX):
+        name, _, rest = ref[len(SCHEMA_REF_PREFIX):].partition('/')
+        if name in schema_files:
+            target = schema_dir + schema_files[name]
+            return f"{target}#/{rest}" if rest else target
+    return root_document + ref
+
+
+def _schema_refs(node: Any, found: Set[str]) -> Set[str]:
+    """Names of the component schemas a fragment references"""
+    if isinstance(node, dict):
+        ref = node.get("$ref")
+        if isinstance(ref, str) and ref.startswith(SCHEMA_REF_PREFIX):
+            found.add(ref[len(SCHEMA_REF_PREFIX):].partition('/')[0])
+        for value in node.values():
+            _schema_refs(value, found)
+    elif isinstance(node, list):
+        for value in node:
+            _schema_refs(value, found)
+    return found
+
+
+def _build_index(schemas: Dict[str, Any], schema_files: Dict[str, str],
+                 tag_paths: Dict[str, Dict[str, Any]], tag_files: Dict[str, str]) -> Dict[str, Any]:
+    """Where each tag and schema lives, and every schema a tag needs (transitively)"""
+    schema_refs = {name: _schema_refs(schema, set()) & schemas.keys() for name, schema in schemas.items()}
+    order = {name: position for position, name in enumerate(schemas)}
+    
+    tags = {}
+    for tag, paths in tag_paths.items():
+        needed = _schema_refs(paths, set()) & schemas.keys()
+        pending = list(needed)
+        while pending:
+            for dependency in schema_refs[pending.pop()] - needed:
+                needed.add(dependency)
+                pending.append(dependency)
+        tags[tag] = {
+            "file": tag_files[tag],
+            "paths": list(paths),
+            "schemas": sorted(needed, key=order.__getitem__),
+        }
+    
+    return {
+        "root": ROOT_DOCUMENT,
+        "tags": tags,
+        "schemas": {
+            name: {"file": f"{SCHEMAS_DIR}/{schema_files[name]}", "refs": sorted(schema_refs[name], key=order.__getitem__)}
+            for name in schemas
+        },
+    }
+
+
+class _Bundler:
+    """Resolves the external $refs of a split layout back into one document"""
+    
+    def __init__(self, root_path: str):
+        self.root_path = os.path.abspath(root_path)
+        self._documents: Dict[str, Any] = {}
+        self.root = self._load(self.root_path)
+        
+        # Files holding component schemas, so refs to them become local schema refs again
+        self._schema_names: Dict[str, str] = {}
+        for name, schema in self.root.get("components", {}).get("schemas", {}).items():
+            ref = schema.get("$ref") if isinstance(schema, dict) else None
+            if isinstance(ref, str) and not ref.startswith('#'):
+                self._schema_names[self._resolve_path(self.root_path, ref)] = name
+        
+        # Schemas reached through refs, in the order they still have to be bundled
+        self._needed: Set[str] = set()
+        self._pending: List[str] = []
+    
+    def bundle(self, tags: Optional[List[str]]) -> Dict[str, Any]:
+        path_files = None if tags is None else self._tag_files(tags)
+        
+        bundled: Dict[str, Any] = {}
+        for key, value in self.root.items():
+            if key == "paths":
+                bundled[key] = {
+                    path: self._inline(item, self.root_path)
+                    for path, item in value.items()
+                    if path_files is None or self._ref_file(item) in path_files
+                }
+            elif key == "components":
+                bundled[key] = {
+                    section: (self._bundle_schemas(entries, everything=tags is None) if section == "schemas"
+                              else self._inline(entries, self.root_path))
+                    for section, entries in value.items()
+                }
+            else:
+                bundled[key] = self._inline(value, self.root_path)
+        return bundled
+    
+    def _bundle_schemas(self, schemas: Dict[str, Any], everything: bool) -> Dict[str, Any]:
+        """Component schemas; with `everything` off, only those reached so far and what they reach"""
+        if everything:
+            self._needed.update(schemas)
+            self._pending.extend(schemas)
+        
+        resolved: Dict[str, Any] = {}
+        while self._pending:
+            name = self._pending.pop()
+            if name not in resolved and name in schemas:
+                resolved[name] = self._inline(schemas[name], self.root_path, top_level=True)
+        return {name: resolved[name] for name in schemas if name in resolved}
+    
+    def _tag_files(self, tags: List[str]) -> Set[str]:
+        index_path = os.path.join(os.path.dirname(self.root_path), INDEX_DOCUMENT)
+        index = self._load(index_path)
+        missing = [tag for tag in tags if tag not in index["tags"]]
+        if missing:
+            raise KeyError(f"Unknown tags: {', '.join(missing)}")
+        return {self._resolve_path(index_path, index["tags"][tag]["file"]) for tag in tags}
+    
+    def _inline(self, node: Any, base: str, top_level: bool = False) -> Any:
+        """Copy of a fragment from file `base` with external refs resolved or made local"""
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if isinstance(ref, str):
+                return self._resolve_ref(ref, base, top_level)
+            return {key: self._inline(value, base) for key, value in node.items()}
+        if isinstance(node, list):
+            return [self._inline(value, base) for value in node]
+        return node
+    
+    def _resolve_ref(self, ref: str, base: str, top_level: bool) -> Any:
+        file_part, _, pointer = ref.partition('#')
+        target = self._resolve_path(base, file_part) if file_part else base
+        
+        if target == self.root_path:
+            return {"$ref": '#' + pointer}
+        
+        # A schema file referenced from anywhere but its own components entry stays a ref
+        name = self._schema_names.get(target)
+        if name is not None and not top_level:
+            if name not in self._needed:
+                self._needed.add(name)
+                self._pending.append(name)
+            return {"$ref": SCHEMA_REF_PREFIX + name + pointer}
+        
+        # Anything else is inlined, relative to the file it came from
+        node = self._load(target)
+        for token in _tokens(pointer):
+            node = node[int(token)] if isinstance(node, list) else node[token]
+        return self._inline(node, target)
+    
+    def _ref_file(self, item: Any) -> Optional[str]:
+        """File a root-level path item refers to"""
+        ref = item.get("$ref") if isinstance(item, dict) else None
+        if not isinstance(ref, str) or ref.startswith('#'):
+            return None
+        return self._resolve_path(self.root_path, ref.partition('#')[0])
+    
+    def _resolve_path(self, base: str, relative: str) -> str:
+        return os.path.normpath(os.path.join(os.path.dirname(base), relative))
+    
+    def _load(self, path: str) -> Any:
+        document = self._documents.get(path)
+        if document is None:
+            with open(path, 'r', encoding='utf-8') as f:
+                if path.endswith('.json'):
+                    document = json.load(f)
+                else:
+                    document = yaml.load(f, Loader=_Loader)
+            self._documents[path] = document
+        return document
@@ -0,0 +1,198 @@
+"""
+Spec serializer for Model-to-Code Generator
+Writes JSON-compatible documents (OpenAPI specs) as YAML and JSON in a single walk
+"""
+
+import json
+import re
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple
+
+import yaml
+
+
+# libyaml's emitter when PyYAML was built with it; only used to pick scalar styles
+_SCALAR_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+# Lines are never folded, so a scalar renders the same at any indentation
+_NO_FOLDING = 2 ** 31 - 1
+
+SCALAR_CACHE_SIZE = 65536
+
+# Strings that are certainly safe as plain YAML scalars (no indicators, quotes or
+# escapes, and not resolvable to another type); everything else asks the emitter
+_PLAIN = re.compile(r'[A-Za-z/][A-Za-z0-9_./(){}-]*(?: [A-Za-z0-9_./(){}-]+)*\Z')
+_RESERVED_WORDS = frozenset(['yes', 'no', 'true', 'false', 'on', 'off', 'null'])
+_LINE_BREAK = re.compile(r'[\r\n\x85\u2028\u2029]')
+
+_encode_json_string = json.encoder.encode_basestring_ascii
+
+
+def serialize_spec(spec: Any) -> Tuple[str, str]:
+    """
+    Serialize a JSON-compatible document to YAML and JSON text in one walk
+
+    JSON output is identical to json.dumps(spec, indent=2). YAML output is block
+    style in key order; shared sub-documents are written out in full rather than
+    as anchors, so both files describe exactly the same tree.
+
+    Returns:
+        (YAML text, JSON text)
+    """
+    writer = _SpecWriter()
+    writer.write_root(spec)
+    return writer.yaml_text(), writer.json_text()
+
+
+class _SpecWriter:
+    """Accumulates the YAML and JSON renderings of one document side by side"""
+    
+    def __init__(self):
+        self._yaml: List[str] = []
+        self._json: List[str] = []
+    
+    def yaml_text(self) -> str:
+        # Every YAML line was written with the separator in front of it
+        return ''.join(self._yaml)[1:] + '\n'
+    
+    def json_text(self) -> str:
+        return ''.join(self._json)
+    
+    def write_root(self, value: Any):
+        if isinstance(value, dict) and value:
+            self._yaml.append('\n')
+            self._write_mapping(value, 0, 0, True)
+        elif isinstance(value, list) and value:
+            self._yaml.append('\n')
+            self._write_sequence(value, 0, 0, True)
+        else:
+            self._yaml.append('\n' + _yaml_leaf(value))
+            self._json.append(_json_scalar(value))
+    
+    def _write_mapping(self, mapping: dict, column: int, depth: int, inline_first: bool):
+        """Block mapping with keys at `column`; the first key may continue the current line"""
+        write_yaml = self._yaml.append
+        write_json = self._json.append
+        pad = '\n' + ' ' * column
+        json_pad = '\n' + '  ' * (depth + 1)
+        
+        separator = '{' + json_pad
+        for key, value in mapping.items():
+            if not isinstance(key, str):
+                raise TypeError(f"Spec keys must be strings, not {type(key).__name__}")
+            
+            write_json(separator + _encode_json_string(key) + ': ')
+            separator = ',' + json_pad
+            
+            yaml_key = _yaml_key(key)
+            if yaml_key is None:
+                # Multi-line or very long keys need the explicit "? key" / ": value" form
+                write_yaml(('? ' if inline_first else pad + '? ')
+                           + _indent_continuation(_yaml_scalar(key), column) + pad + ': ')
+                inline_first = False
+                self._write_item(value, column, depth)
+                continue
+            
+            write_yaml(yaml_key if inline_first else pad + yaml_key)
+            inline_first = False
+            
+            if isinstance(value, dict) and value:
+                write_yaml(':')
+                self._write_mapping(value, column + 2, depth + 1, False)
+            elif isinstance(value, list) and value:
+                # PyYAML style: sequences in a mapping are not indented
+                write_yaml(':')
+                self._write_sequence(value, column, depth + 1, False)
+            else:
+                write_yaml(': ' + _indent_continuation(_yaml_leaf(value), column))
+                write_json(_json_scalar(value))
+        
+        write_json('\n' + '  ' * depth + '}')
+    
+    def _write_sequence(self, items: list, column: int, depth: int, inline_first: bool):
+        """Block sequence with dashes at `column`; the first item may continue the current line"""
+        write_yaml = self._yaml.append
+        write_json = self._json.append
+        pad = '\n' + ' ' * column
+        json_pad = '\n' + '  ' * (depth + 1)
+        
+        separator = '[' + json_pad
+        for value in items:
+            write_yaml('- ' if inline_first else pad + '- ')
+            inline_first = False
+            write_json(separator)
+            separator = ',' + json_pad
+            self._write_item(value, column, depth)
+        
+        write_json('\n' + '  ' * depth + ']')
+    
+    def _write_item(self, value: Any, column: int, depth: int):
+        """Node following a "- " or ": " indicator at `column`, starting on the same line"""
+        if isinstance(value, dict) and value:
+            self._write_mapping(value, column + 2, depth + 1, True)
+        elif isinstance(value, list) and value:
+            self._write_sequence(value, column + 2, depth + 1, True)
+        else:
+            self._yaml.append(_indent_continuation(_yaml_leaf(value), column))
+            self._json.append(_json_scalar(value))
+
+
+def _indent_continuation(text: str, column: int) -> str:
+    """Shift the continuation lines of a multi-line scalar under its container"""
+    if '\n' not in text or not column:
+        return text
+    pad = ' ' * column
+    first, *rest = text.split('\n')
+    return '\n'.join([first] + [pad + line if line else line for line in rest])
+
+
+def _yaml_leaf(value: Any) -> str:
+    """YAML text of a scalar or an empty collection"""
+    if isinstance(value, dict):
+        return '{}'
+    if isinstance(value, list):
+        return '[]'
+    return _yaml_scalar(value)
+
+
+@lru_cache(maxsize=SCALAR_CACHE_SIZE, typed=True)
+def _yaml_scalar(value: Any) -> str:
+    """YAML text of a scalar as a block sequence item would show it"""
+    if value is None:
+        return 'null'
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    if type(value) is int:
+        return str(value)
+    if type(value) is str and _PLAIN.match(value) and value.lower() not in _RESERVED_WORDS:
+        return value
+    
+    # Let the emitter choose the style; rendering it as a sequence item gives the
+    # same continuation indentation as any other block context (plus the column)
+    text = yaml.dump([value], Dumper=_SCALAR_DUMPER, default_flow_style=False, width=_NO_FOLDING)
+    return text[2:-1]
+
+
+@lru_cache(maxsize=SCALAR_CACHE_SIZE)
+def _yaml_key(key: str) -> Optional[str]:
+    """YAML text of a simple mapping key (None if the key needs the explicit form)"""
+    if len(key) >= 128 or _LINE_BREAK.search(key):
+        return None
+    return _yaml_scalar(key)
+
+
+def _json_scalar(value: Any) -> str:
+    """JSON text of a scalar (or empty collection), as json.dumps writes it"""
+    if isinstance(value, str):
+        return _encode_json_string(value)
+    if value is None:
+        return 'null'
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    if type(value) is int:
+        return int.__repr__(value)
+    return json.dumps(value)
@@ -0,0 +1,49 @@
+"""
+Template rendering backend for generators
+Compiles Jinja2 templates once per process and keeps their bytecode on disk
+"""
+
+import os
+import tempfile
+from functools import lru_cache
+from typing import Any
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache, StrictUndefined
+
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), 'templates')
+
+
+def _bytecode_cache_dir() -> str:
+    """Directory for compiled template bytecode, shared across runs"""
+    cache_dir = os.environ.get('MODEL_TO_CODE_TEMPLATE_CACHE')
+    if not cache_dir:
+        base_dir = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        cache_dir = os.path.join(base_dir, 'model-to-code', 'templates')
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+    except OSError:
+        # Read-only home directories (e.g. hardened containers) fall back to /tmp
+        cache_dir = os.path.join(tempfile.gettempdir(), 'model-to-code-templates')
+        os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+@lru_cache(maxsize=None)
+def get_environment() -> Environment:
+    """Process-wide template environment; compiled templates stay cached in it"""
+    return Environment(
+        loader=FileSystemLoader(TEMPLATE_DIR),
+        bytecode_cache=FileSystemBytecodeCache(_bytecode_cache_dir()),
+        # Templates ship with the package, so skip the per-render mtime checks
+        auto_reload=False,
+        cache_size=-1,
+        keep_trailing_newline=True,
+        trim_blocks=True,
+        lstrip_blocks=True,
+        undefined=StrictUndefined,
+    )
+
+
+def render(template_name: str, **context: Any) -> str:
+    """Render a template from the generators' template directory"""
+    return get_environment().get_template(template_name).render(**context)
@@ -0,0 +1,379 @@
+"""
+Type expressions and per-language type mapping for generators
+Parses UML type strings such as List<Order> or Optional[User] and maps them recursively
+"""
+
+import copy
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Tuple, Optional, Any, FrozenSet
+
+
+# Base UML type -> target type, per emitter. Lookups use the lower-cased UML name.
+TYPE_MAPPINGS: Dict[str, Dict[str, str]] = {
+    'python': {
+        'string': 'str',
+        'int': 'int',
+        'integer': 'int',
+        'float': 'float',
+        'double': 'float',
+        'boolean': 'bool',
+        'bool': 'bool',
+        'date': 'datetime.date',
+        'datetime': 'datetime.datetime',
+        'list': 'List',
+        'dict': 'Dict',
+        'object': 'Any',
+        'void': 'None'
+    },
+    'java': {
+        'string': 'String',
+        'str': 'String',
+        'int': 'int',
+        'integer': 'int',
+        'float': 'float',
+        'double': 'double',
+        'boolean': 'boolean',
+        'bool': 'boolean',
+        'date': 'LocalDate',
+        'datetime': 'LocalDateTime',
+        'list': 'List',
+        'dict': 'Map',
+        'object': 'Object',
+        'void': 'void'
+    },
+    'typescript': {
+        'string': 'string',
+        'str': 'string',
+        'int': 'number',
+        'integer': 'number',
+        'float': 'number',
+        'double': 'number',
+        'boolean': 'boolean',
+        'bool': 'boolean',
+        'date': 'Date',
+        'datetime': 'Date',
+        'list': 'Array',
+        'dict': 'Record<string, any>',
+        'object': 'any',
+        'void': 'void'
+    },
+    # Boxed Java types for JPA entities and DTOs in the generated services
+    'spring': {
+        'int': 'Integer',
+        'integer': 'Integer',
+        'string': 'String',
+        'float': 'Double',
+        'boolean': 'Boolean',
+        'bool': 'Boolean',
+        'datetime': 'LocalDateTime',
+        'date': 'LocalDate',
+        'list': 'List<String>',
+        'array': 'List<String>'
+    },
+    # TypeScript types of JSON payloads, where dates travel as strings
+    'typescript-json': {
+        'int': 'number',
+        'integer': 'number',
+        'long': 'number',
+        'string': 'string',
+        'float': 'number',
+        'double': 'number',
+        'boolean': 'boolean',
+        'bool': 'boolean',
+        'datetime': 'string',
+        'date': 'string',
+        'list': 'string[]',
+        'array': 'string[]'
+    },
+    # Python types of JSON payloads, where dates travel as strings
+    'python-json': {
+        'int': 'int',
+        'integer': 'int',
+        'long': 'int',
+        'string': 'str',
+        'float': 'float',
+        'double': 'float',
+        'boolean': 'bool',
+        'bool': 'bool',
+        'datetime': 'str',
+        'date': 'str',
+        'list': 'List[str]',
+        'array': 'List[str]'
+    },
+}
+
+# Unknown types fall back to these; emitters not listed keep the UML name as written
+TYPE_FALLBACKS: Dict[str, str] = {
+    'spring': 'String',
+    'typescript-json': 'string',
+    'python-json': 'Any',
+}
+
+OPENAPI_SCHEMAS: Dict[str, Dict[str, Any]] = {
+    'int': {'type': 'integer', 'format': 'int32', 'example': 123},
+    'integer': {'type': 'integer', 'format': 'int32', 'example': 123},
+    'long': {'type': 'integer', 'format': 'int64', 'example': 123456789},
+    'string': {'type': 'string', 'example': 'sample text'},
+    'float': {'type': 'number', 'format': 'float', 'example': 123.45},
+    'double': {'type': 'number', 'format': 'double', 'example': 123.456789},
+    'boolean': {'type': 'boolean', 'example': True},
+    'bool': {'type': 'boolean', 'example': True},
+    'datetime': {'type': 'string', 'format': 'date-time', 'example': '2024-01-01T00:00:00Z'},
+    'date': {'type': 'string', 'format': 'date', 'example': '2024-01-01'},
+    'list': {'type': 'array', 'items': {'type': 'string'}},
+    'array': {'type': 'array', 'items': {'type': 'string'}}
+}
+
+OPENAPI_FALLBACK: Dict[str, Any] = {'type': 'string', 'example': 'sample text'}
+
+
+# Generic type constructors recognised in models, by lower-cased name
+GENERIC_KINDS: Dict[str, str] = {
+    'list': 'list',
+    'array': 'list',
+    'arraylist': 'list',
+    'sequence': 'list',
+    'collection': 'list',
+    'iterable': 'list',
+    'set': 'set',
+    'hashset': 'set',
+    'dict': 'dict',
+    'map': 'dict',
+    'hashmap': 'dict',
+    'record': 'dict',
+    'optional': 'optional',
+    'nullable': 'optional',
+    # Suffix forms: Order[] and User?
+    '[]': 'list',
+    '?': 'optional',
+}
+
+GENERIC_ARITY: Dict[str, int] = {'list': 1, 'set': 1, 'dict': 2, 'optional': 1}
+
+# Per emitter, generic kind -> (head type name, template filled with the mapped arguments)
+GENERIC_FORMS: Dict[str, Dict[str, Tuple[Optional[str], str]]] = {
+    'python': {
+        'list': ('List', 'List[{0}]'),
+        'set': ('Set', 'Set[{0}]'),
+        'dict': ('Dict', 'Dict[{0}, {1}]'),
+        'optional': ('Optional', 'Optional[{0}]'),
+    },
+    'java': {
+        'list': ('List', 'List<{0}>'),
+        'set': ('Set', 'Set<{0}>'),
+        'dict': ('Map', 'Map<{0}, {1}>'),
+        # Reference types are already nullable
+        'optional': (None, '{0}'),
+    },
+    'typescript': {
+        'list': ('Array', 'Array<{0}>'),
+        'set': ('Set', 'Set<{0}>'),
+        'dict': ('Record', 'Record<{0}, {1}>'),
+        'optional': (None, '{0} | null'),
+    },
+    'spring': {
+        'list': ('List', 'List<{0}>'),
+        'set': ('Set', 'Set<{0}>'),
+        'dict': ('Map', 'Map<{0}, {1}>'),
+        'optional': (None, '{0}'),
+    },
+    'typescript-json': {
+        'list': (None, '{0}[]'),
+        'set': (None, '{0}[]'),
+        'dict': ('Record', 'Record<{0}, {1}>'),
+        'optional': (None, '{0} | null'),
+    },
+    'python-json': {
+        'list': ('List', 'List[{0}]'),
+        'set': ('List', 'List[{0}]'),
+        'dict': ('Dict', 'Dict[{0}, {1}]'),
+        'optional': ('Optional', 'Optional[{0}]'),
+    },
+}
+
+# Java generics only take reference types
+BOXED_TYPES: Dict[str, str] = {
+    'int': 'Integer',
+    'long': 'Long',
+    'short': 'Short',
+    'byte': 'Byte',
+    'char': 'Character',
+    'float': 'Float',
+    'double': 'Double',
+    'boolean': 'Boolean',
+}
+
+TYPE_CACHE_SIZE = 4096
+
+_TOKEN_RE = re.compile(r'\s*(?:([A-Za-z_$][\w.$]*)|(\S))')
+
+
+@dataclass(frozen=True)
+class TypeExpr:
+    """Parsed type expression: a name with optional generic arguments"""
+    name: str
+    args: Tuple["TypeExpr", ...] = ()
+
+
+class TypeSyntaxError(ValueError):
+    """Raised for type strings that are not valid type expressions"""
+    pass
+
+
+@lru_cache(maxsize=TYPE_CACHE_SIZE)
+def parse_type(type_string: str) -> TypeExpr:
+    """
+    Parse a type string into a type expression
+    
+    Accepts Name, Name<Args>, Name[Args] and the suffixes [] (list) and ? (optional).
+    
+    Raises:
+        TypeSyntaxError: If the string is not a valid type expression
+    """
+    tokens = []
+    for match in _TOKEN_RE.finditer(type_string):
+        tokens.append(match.group(1) or match.group(2))
+    if not tokens:
+        raise TypeSyntaxError(f"Empty type expression: {type_string!r}")
+    
+    expr, position = _parse_expr(tokens, 0, type_string)
+    if position != len(tokens):
+        raise TypeSyntaxError(f"Unexpected {tokens[position]!r} in type {type_string!r}")
+    return expr
+
+
+def _parse_expr(tokens, position: int, type_string: str) -> Tuple[TypeExpr, int]:
+    """Parse one type expression starting at tokens[position]"""
+    name = tokens[position] if position < len(tokens) else None
+    if name is None or not (name[0].isalpha() or name[0] in '_$'):
+        raise TypeSyntaxError(f"Expected a type name in {type_string!r}")
+    position += 1
+    
+    args = ()
+    if position < len(tokens) and tokens[position] in ('<', '['):
+        closing = '>' if tokens[position] == '<' else ']'
+        if not (closing == ']' and position + 1 < len(tokens) and tokens[position + 1] == ']'):
+            arg_list = []
+            position += 1
+            while True:
+                arg, position = _parse_expr(tokens, position, type_string)
+                arg_list.append(arg)
+                if position < len(tokens) and tokens[position] == ',':
+                    position += 1
+                    continue
+                break
+            if position >= len(tokens) or tokens[position] != closing:
+                raise TypeSyntaxError(f"Missing {closing!r} in type {type_string!r}")
+            position += 1
+            args = tuple(arg_list)
+    expr = TypeExpr(name, args)
+    
+    # Suffixes wrap the expression: Order[]? is an optional list of Order
+    while position < len(tokens):
+        if tokens[position] == '[' and position + 1 < len(tokens) and tokens[position + 1] == ']':
+            expr = TypeExpr('[]', (expr,))
+            position += 2
+        elif tokens[position] == '?':
+            expr = TypeExpr('?', (expr,))
+            position += 1
+        else:
+            break
+    
+    return expr, position
+
+
+def map_type(language: str, type_name: str) -> str:
+    """Map a UML type string to the given emitter's type"""
+    return _translate(language, type_name)[0]
+
+
+def type_names(language: str, type_name: str) -> FrozenSet[str]:
+    """Every emitter type name a mapped type string refers to (e.g. for imports)"""
+    return _translate(language, type_name)[1]
+
+
+@lru_cache(maxsize=TYPE_CACHE_SIZE)
+def _translate(language: str, type_name: str) -> Tuple[str, FrozenSet[str]]:
+    """Mapped type and referenced names, memoized per (language, type string)"""
+    try:
+        expr = parse_type(type_name)
+    except TypeSyntaxError:
+        # Leave anything we cannot parse to the flat lookup
+        expr = TypeExpr(type_name)
+    
+    names = set()
+    mapped = _map_expr(language, expr, names)
+    return mapped, frozenset(names)
+
+
+def _map_expr(language: str, expr: TypeExpr, names: set) -> str:
+    """Map a type expression recursively, collecting the names it refers to"""
+    if not expr.args:
+        mapped = TYPE_MAPPINGS[language].get(expr.name.lower())
+        if mapped is None:
+            mapped = TYPE_FALLBACKS.get(language, expr.name)
+        names.add(mapped)
+        return mapped
+    
+    kind = GENERIC_KINDS.get(expr.name.lower())
+    if kind is None or len(expr.args) != GENERIC_ARITY[kind]:
+        if language in TYPE_FALLBACKS:
+            fallback = TYPE_FALLBACKS[language]
+            names.add(fallback)
+            return fallback
+        # Unknown generic: keep the name and map its arguments
+        names.add(expr.name)
+        args = ', '.join(_map_arg(language, arg, names) for arg in expr.args)
+        return f'{expr.name}[{args}]' if language == 'python' else f'{expr.name}<{args}>'
+    
+    head, template = GENERIC_FORMS[language][kind]
+    if head:
+        names.add(head)
+    args = [_map_arg(language, arg, names) for arg in expr.args]
+    if template == '{0}[]' and ' | ' in args[0]:
+        args[0] = f'({args[0]})'
+    return template.format(*args)
+
+
+def _map_arg(language: str, expr: TypeExpr, names: set) -> str:
+    """Map a generic argument, boxing Java primitives"""
+    mapped = _map_expr(language, expr, names)
+    if language == 'java' and mapped in BOXED_TYPES:
+        mapped = BOXED_TYPES[mapped]
+        names.add(mapped)
+    return mapped
+
+
+def openapi_schema(type_name: str) -> Dict[str, Any]:
+    """OpenAPI schema for a UML type string (a fresh copy the caller may modify)"""
+    return copy.deepcopy(_openapi_schema(type_name))
+
+
+@lru_cache(maxsize=TYPE_CACHE_SIZE)
+def _openapi_schema(type_name: str) -> Dict[str, Any]:
+    """Memoized schema; never hand this copy out directly"""
+    try:
+        expr = parse_type(type_name)
+    except TypeSyntaxError:
+        expr = TypeExpr(type_name)
+    return _openapi_expr(expr)
+
+
+def _openapi_expr(expr: TypeExpr) -> Dict[str, Any]:
+    """Build the schema of a type expression recursively"""
+    kind = GENERIC_KINDS.get(expr.name.lower()) if expr.args else None
+    if kind is None or len(expr.args) != GENERIC_ARITY[kind]:
+        return copy.deepcopy(OPENAPI_SCHEMAS.get(expr.name.lower(), OPENAPI_FALLBACK))
+    
+    if kind == 'list':
+        return {'type': 'array', 'items': _openapi_expr(expr.args[0])}
+    if kind == 'set':
+        return {'type': 'array', 'items': _openapi_expr(expr.args[0]), 'uniqueItems': True}
+    if kind == 'dict':
+        return {'type': 'object', 'additionalProperties': _openapi_expr(expr.args[1])}
+    
+    schema = _openapi_expr(expr.args[0])
+    schema['nullable'] = True
+    return schema
@@ -3,88 +3,72 @@ TypeScript code generator for class models
 Generates TypeScript classes from UML class diagrams
 """
 
-from typing import List, Dict, Optional
+from typing import Dict, Optional, Iterator, Tuple
+from .base_generator import BaseGenerator
+from .code_writer import CodeWriter
+from .type_mapping import map_type
+from .ir import ClassIR, lower
 from ..models.class_model import (
     ClassDiagram, ClassDefinition, Attribute, Method, Parameter, 
     Visibility, Relationship
 )
 
 
-class TypeScriptCodeGenerator:
+class TypeScriptCodeGenerator(BaseGenerator):
     """Generates TypeScript code from class models"""
     
-    def __init__(self):
-        self.type_mapping = {
-            'string': 'string',
-            'int': 'number',
-            'integer': 'number',
-            'float': 'number',
-            'double': 'number',
-            'boolean': 'boolean',
-            'bool': 'boolean',
-            'date': 'Date',
-            'datetime': 'Date',
-            'list': 'Array',
-            'dict': 'Record<string, any>',
-            'object': 'any',
-            'void': 'void'
-        }
+    def __init__(self, cache=None):
+        super().__init__(cache)
+        self.type_language = 'typescript'
         self.required_imports = set()
     
-    def generate(self, diagram: ClassDiagram) -> Dict[str, str]:
-        """Generate TypeScript code for entire diagram"""
-        generated_files = {}
-        
-        # Generate each class
-        for class_def in diagram.classes:
+    def stream(self, diagram: ClassDiagram) -> Iterator[Tuple[str, str]]:
+        """Generate TypeScript code for entire diagram, one file at a time"""
+        # Generate each class, reusing cached output for unchanged classes
+        cache_keys = self._class_cache_keys(diagram)
+        for class_def, cache_key in zip(diagram.classes, cache_keys):
             filename = f"{self._to_kebab_case(class_def.name)}.ts"
-            code = self.generate_class(class_def, diagram)
-            generated_files[filename] = code
+            yield filename, self._cached_output(
+                cache_key, lambda: self.generate_class(class_def, diagram))
         
         # Generate index.ts for barrel exports
-        index_code = self._generate_index_file(diagram)
-        generated_files["index.ts"] = index_code
-        
-        return generated_files
+        yield "index.ts", self._generate_index_file(diagram)
+    
+    def _cache_options(self) -> Dict[str, str]:
+        """Type mapping affects every generated file"""
+        return {'type_language': self.type_language}
     
     def generate_class(self, class_def: ClassDefinition, diagram: ClassDiagram) -> str:
         """Generate TypeScript code for a single class"""
+        writer = CodeWriter('  ')
+        self.write_class(writer, class_def, diagram)
+        return writer.getvalue()
+    
+    def write_class(self, writer: CodeWriter, class_def: ClassDefinition, diagram: ClassDiagram):
+        """Write TypeScript code for a single class to a code writer"""
         self.required_imports.clear()
-        
-        lines = []
+        class_ir = lower(diagram).for_class(class_def)
         
         # Collect imports
-        self._collect_imports(class_def, diagram)
+        self._collect_imports(class_ir)
         
         # Add imports
         if self.required_imports:
-            for import_stmt in sorted(self.required_imports):
-                lines.append(import_stmt)
-            lines.append('')
+            writer.lines(sorted(self.required_imports))
+            writer.line()
         
         # Generate interfaces first if needed
         if class_def.is_interface:
-            interface_code = self._generate_interface(class_def)
-            lines.extend(interface_code)
+            self._write_interface(writer, class_def)
         else:
             # Generate class definition
-            class_code = self._generate_class_definition(class_def, diagram)
-            lines.extend(class_code)
-        
-        return '\n'.join(lines)
+            self._write_class_definition(writer, class_ir)
     
-    def _generate_interface(self, class_def: ClassDefinition) -> List[str]:
-        """Generate TypeScript interface"""
-        lines = []
-        
+    def _write_interface(self, writer: CodeWriter, class_def: ClassDefinition):
+        """Write a TypeScript interface"""
         # Interface comment
-        lines.append('/**')
-        if class_def.description:
-            lines.append(f' * {class_def.description}')
-        else:
-            lines.append(f' * {class_def.name} interface')
-        lines.append(' * Generated from UML model')
-        lines.append(' */')
+        summary = class_def.description or f'{class_def.name} interface'
+        writer.lines(('/**', f' * {summary}', ' * Generated from UML model', ' */'))
         
         # Interface declaration
         interface_line = f'export interface {class_def.name}'
@@ -97,32 +81,24 @@ class TypeScriptCodeGenerator:
             interface_line += f' extends {", ".join(extends)}'
         
         interface_line += ' {'
-        lines.append(interface_line)
-        
-        # Add properties
-        for attr in class_def.attributes:
-            lines.append(f'  {self._generate_interface_property(attr)}')
-        
-        # Add method signatures
-        for method in class_def.methods:
-            lines.append(f'  {self._generate_interface_method(method)}')
+        writer.line(interface_line)
         
-        lines.append('}')
+        with writer.indent():
+            # Add properties
+            writer.lines([self._generate_interface_property(attr) for attr in class_def.attributes])
+            
+            # Add method signatures
+            writer.lines([self._generate_interface_method(method) for method in class_def.methods])
         
-        return lines
+        writer.line('}')
     
-    def _generate_class_definition(self, class_def: ClassDefinition, diagram: ClassDiagram) -> List[str]:
-        """Generate the main class definition"""
-        lines = []
+    def _write_class_definition(self, writer: CodeWriter, class_ir: ClassIR):
+        """Write the main class definition"""
+        class_def = class_ir.definition
         
         # Class comment
-        lines.append('/**')
-        if class_def.description:
-            lines.append(f' * {class_def.description}')
-        else:
-            lines.append(f' * {class_def.name} class')
-        lines.append(' * Generated from UML model')
-        lines.append(' */')
+        summary = class_def.description or f'{class_def.name} class'
+        writer.lines(('/**', f' * {summary}', ' * Generated from UML model', ' */'))
         
         # Class declaration
         class_line = 'export '
@@ -141,31 +117,25 @@ class TypeScriptCodeGenerator:
             class_line += f' implements {", ".join(class_def.implemented_interfaces)}'
         
         class_line += ' {'
-        lines.append(class_line)
-        
-        # Generate properties
-        for attr in class_def.attributes:
-            lines.append(f'  {self._generate_property(attr)}')
-        
-        if class_def.attributes:
-            lines.append('')
-        
-        # Generate constructor
-        constructor_lines = self._generate_constructor(class_def)
-        if constructor_lines:
-            lines.extend(constructor_lines)
-            lines.append('')
+        writer.line(class_line)
         
-        # Generate methods
-        for method in class_def.methods:
-            if method.name != '__init__':  # Skip Python-style constructor
-                lines.extend(self._generate_method(method, class_def))
-                lines.append('')
+        with writer.indent():
+            # Generate properties
+            if class_def.attributes:
+                writer.lines([self._generate_property(attr) for attr in class_def.attributes])
+                writer.line()
+            
+            # Generate constructor
+            self._write_constructor(writer, class_ir)
+            writer.line()
+            
+            # Generate methods (the Python-style constructor is already lowered out)
+            for method in class_ir.methods:
+                self._write_method(writer, method, class_def)
+                writer.line()
         
         # Close class
-        lines.append('}')
-        
-        return lines
+        writer.line('}')
     
     def _generate_property(self, attr: Attribute) -> str:
         """Generate a property definition"""
@@ -224,88 +194,59 @@ class TypeScriptCodeGenerator:
         
         return f'{method.name}({", ".join(params)}): {return_type};'
     
-    def _generate_constructor(self, class_def: ClassDefinition) -> List[str]:
-        """Generate constructor for the class"""
-        lines = []
-        
-        # Find constructor method or generate from attributes
-        constructor_method = None
-        for method in class_def.methods:
-            if method.name == '__init__':
-                constructor_method = method
-                break
+    def _write_constructor(self, writer: CodeWriter, class_ir: ClassIR):
+        """Write the constructor for the class"""
+        constructor = class_ir.constructor
+        constructor_method = constructor.method
         
         # Build parameter list
         params = []
         
-        if constructor_method and constructor_method.parameters:
-            for param in constructor_method.parameters:
-                param_type = self._map_type(param.data_type)
-                param_str = f'{param.name}: {param_type}'
-                if param.default_value:
-                    param_str += f' = {param.default_value}'
-                elif param.is_optional:
-                    param_str = f'{param.name}?: {param_type}'
-                params.append(param_str)
-        else:
-            # Generate parameters from attributes
-            for attr in class_def.attributes:
-                if not attr.is_static:
-                    param_type = self._map_type(attr.data_type)
-                    param_str = f'{attr.name}: {param_type}'
-                    if attr.default_value:
-                        param_str += f' = {attr.default_value}'
-                    params.append(param_str)
-        
-        # Constructor signature
-        lines.append('  /**')
-        lines.append(f'   * Creates an instance of {class_def.name}')
-        for param in (constructor_method.parameters if constructor_method else []):
-            lines.append(f'   * @param {param.name} - {param.name} parameter')
-        lines.append('   */')
+        for param in constructor.parameters:
+            param_type = self._map_type(param.data_type)
+            param_str = f'{param.name}: {param_type}'
+            if param.default_value:
+                param_str += f' = {param.default_value}'
+            elif param.is_optional:
+                param_str = f'{param.name}?: {param_type}'
+            params.append(param_str)
         
-        if params:
-            lines.append(f'  constructor({", ".join(params)}) {{')
-        else:
-            lines.append('  constructor() {')
+        # Constructor signature, body indented relative to it
+        lines = ['/**', f' * Creates an instance of {class_ir.definition.name}']
+        for param in (constructor_method.parameters if constructor_method else []):
+            lines.append(f' * @param {param.name} - {param.name} parameter')
+        lines.extend((' */', f'constructor({", ".join(params)}) {{'))
         
         # Initialize properties
-        for attr in class_def.attributes:
-            if not attr.is_static:
-                if constructor_method and any(p.name == attr.name for p in constructor_method.parameters):
-                    lines.append(f'    this.{attr.name} = {attr.name};')
-                elif attr.default_value:
-                    lines.append(f'    this.{attr.name} = {attr.default_value};')
-                else:
-                    default_val = self._get_default_value(attr.data_type)
-                    if default_val != 'undefined':
-                        lines.append(f'    this.{attr.name} = {default_val};')
-        
-        lines.append('  }')
+        for attr in class_ir.instance_attributes:
+            if attr.name in constructor.assigned:
+                lines.append(f'  this.{attr.name} = {attr.name};')
+            elif attr.default_value:
+                lines.append(f'  this.{attr.name} = {attr.default_value};')
+            else:
+                default_val = self._get_default_value(attr.data_type)
+                if default_val != 'undefined':
+                    lines.append(f'  this.{attr.name} = {default_val};')
         
-        return lines
+        lines.append('}')
+        writer.lines(lines)
     
-    def _generate_method(self, method: Method, class_def: ClassDefinition) -> List[str]:
-        """Generate a method definition"""
-        lines = []
-        
+    def _write_method(self, writer: CodeWriter, method: Method, class_def: ClassDefinition):
+        """Write a method definition"""
         # Method comment
-        lines.append('  /**')
-        if method.description:
-            lines.append(f'   * {method.description}')
-        else:
-            lines.append(f'   * {method.name.replace("_", " ").title()} method')
+        summary = method.description or f'{method.name.replace("_", " ").title()} method'
+        lines = ['/**', f' * {summary}']
         
         for param in method.parameters:
-            lines.append(f'   * @param {param.name} - {param.name} parameter')
+            lines.append(f' * @param {param.name} - {param.name} parameter')
         
         if method.return_type != 'void':
-            lines.append(f'   * @returns {self._map_type(method.return_type)}')
+            lines.append(f' * @returns {self._map_type(method.return_type)}')
         
-        lines.append('   */')
+        lines.append(' */')
         
         # Method signature
-        signature = '  '
+        signature = ''
         
         # Visibility
         if method.visibility == Visibility.PRIVATE:
@@ -338,80 +279,74 @@ class TypeScriptCodeGenerator:
         
         # Abstract methods don't have body
         if method.is_abstract:
-            signature += ';'
-            lines.append(signature)
+            lines.append(signature + ';')
+            writer.lines(lines)
+            return
+        
+        lines.append(signature + ' {')
+        
+        # Method body, indented relative to the signature
+        if method.body:
+            lines.extend([f'  {line}' if line else '' for line in method.body.split('\n')])
         else:
-            signature += ' {'
-            lines.append(signature)
-            
-            # Method body
-            if method.body:
-                for line in method.body.split('\n'):
-                    lines.append(f'    {line}')
-            else:
-                # Generate basic method body
-                if method.name.startswith('get'):
-                    attr_name = method.name[3:].lower()
-                    # Find matching attribute
-                    for attr in class_def.attributes:
-                        if attr.name.lower() == attr_name:
-                            lines.append(f'    return this.{attr.name};')
-                            break
-                    else:
-                        default_return = self._get_default_value(return_type)
-                        if default_return != 'undefined':
-                            lines.append(f'    return {default_return};')
-                
-                elif method.name.startswith('set'):
-                    attr_name = method.name[3:].lower()
-                    param_name = method.parameters[0].name if method.parameters else 'value'
-                    # Find matching attribute
-                    for attr in class_def.attributes:
-                        if attr.name.lower() == attr_name:
-                            lines.append(f'    this.{attr.name} = {param_name};')
-                            break
-                
-                elif return_type != 'void':
+            # Generate basic method body
+            if method.name.startswith('get'):
+                attr_name = method.name[3:].lower()
+                # Find matching attribute
+                for attr in class_def.attributes:
+                    if attr.name.lower() == attr_name:
+                        lines.append(f'  return this.{attr.name};')
+                        break
+                else:
                     default_return = self._get_default_value(return_type)
                     if default_return != 'undefined':
-                        lines.append(f'    return {default_return};')
-                else:
-                    lines.append('    // TODO: Implement method')
+                        lines.append(f'  return {default_return};')
             
-            lines.append('  }')
+            elif method.name.startswith('set'):
+                attr_name = method.name[3:].lower()
+                param_name = method.parameters[0].name if method.parameters else 'value'
+                # Find matching attribute
+                for attr in class_def.attributes:
+                    if attr.name.lower() == attr_name:
+                        lines.append(f'  this.{attr.name} = {param_name};')
+                        break
+            
+            elif return_type != 'void':
+                default_return = self._get_default_value(return_type)
+                if default_return != 'undefined':
+                    lines.append(f'  return {default_return};')
+            else:
+                lines.append('  // TODO: Implement method')
         
-        return lines
+        lines.append('}')
+        writer.lines(lines)
     
-    def _collect_imports(self, class_def: ClassDefinition, diagram: ClassDiagram):
+    def _collect_imports(self, class_ir: ClassIR):
         """Collect required imports for the class"""
         # Add imports for related classes
-        for rel in diagram.get_relationships_for_class(class_def.name):
-            if rel.target_class != class_def.name:
-                related_class = diagram.get_class_by_name(rel.target_class)
-                if related_class:
-                    filename = self._to_kebab_case(rel.target_class)
-                    self.required_imports.add(f'import {{ {rel.target_class} }} from "./{filename}";')
+        for related_class in class_ir.dependencies:
+            filename = self._to_kebab_case(related_class.name)
+            self.required_imports.add(f'import {{ {related_class.name} }} from "./{filename}";')
     
     def _generate_index_file(self, diagram: ClassDiagram) -> str:
         """Generate index.ts for barrel exports"""
-        lines = [
-            '/**',
-            f' * {diagram.name}',
-            f' * {diagram.description or "Generated from UML model"}',
-            ' */',
-            '',
-        ]
+        writer = CodeWriter('  ')
+        writer.line('/**')
+        writer.line(f' * {diagram.name}')
+        writer.line(f' * {diagram.description or "Generated from UML model"}')
+        writer.line(' */')
+        writer.line()
         
         # Export all classes
         for class_def in diagram.classes:
             filename = self._to_kebab_case(class_def.name)
-            lines.append(f'export {{ {class_def.name} }} from "./{filename}";')
+            writer.line(f'export {{ {class_def.name} }} from "./{filename}";')
         
-        return '\n'.join(lines)
+        return writer.getvalue()
     
     def _map_type(self, type_name: str) -> str:
         """Map UML types to TypeScript types"""
-        return self.type_mapping.get(type_name.lower(), type_name)
+        return map_type(self.type_language, type_name)
     
     def _get_default_value(self, ts_type: str) -> str:
         """Get default value for a TypeScript type"""
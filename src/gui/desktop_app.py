@@ -14,9 +14,7 @@ from pathlib import Path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from src.parsers.text_parser import TextModelParser
-from src.generators.python_generator import PythonCodeGenerator
-from src.generators.java_generator import JavaCodeGenerator
-from src.generators.typescript_generator import TypeScriptCodeGenerator
+from src.generators.registry import registry
 
 
 class ModelToCodeGUI:
@@ -25,11 +23,11 @@ class ModelToCodeGUI:
         self.root.title("Model-to-Code Generator")
         self.root.geometry("1200x800")
         
-        # Initialize generators
+        # Display name -> registry target; generators are imported on first use
         self.generators = {
-            'Python': PythonCodeGenerator(),
-            'Java': JavaCodeGenerator(),
-            'TypeScript': TypeScriptCodeGenerator()
+            'Python': 'python',
+            'Java': 'java',
+            'TypeScript': 'typescript'
         }
         
         self.parser = TextModelParser()
@@ -254,15 +252,19 @@ classes:
             self.status_var.set("Generating code...")
             self.root.update()
             
-            # Generate code
+            # Generate code, showing each file as soon as it is produced
             language = self.language_var.get()
-            generator = self.generators[language]
-            generated_files = generator.generate(diagram)
+            generator = registry.create(self.generators[language])
             
-            self.current_files = generated_files
-            self.display_generated_files()
+            self.clear_file_tabs()
+            self.current_files = {}
+            for filename, content in generator.stream(diagram):
+                self.current_files[filename] = content
+                self.add_file_tab(filename, content)
+                self.status_var.set(f"Generated {filename}")
+                self.root.update_idletasks()
             
-            self.status_var.set(f"Generated {len(generated_files)} files successfully")
+            self.status_var.set(f"Generated {len(self.current_files)} files successfully")
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to generate code: {e}")
@@ -270,27 +272,34 @@ classes:
     
     def display_generated_files(self):
         """Display generated files in tabs"""
-        # Clear existing tabs
-        for tab in self.notebook.tabs():
-            self.notebook.forget(tab)
+        self.clear_file_tabs()
         
         # Create tabs for each file
         for filename, content in self.current_files.items():
-            frame = ttk.Frame(self.notebook)
-            
-            # Add copy button
-            btn_frame = ttk.Frame(frame)
-            btn_frame.pack(fill=tk.X, padx=5, pady=5)
-            ttk.Button(btn_frame, text=f"Copy {filename}", 
-                      command=lambda f=filename: self.copy_to_clipboard(f)).pack(side=tk.RIGHT)
-            
-            # Add text widget with content
-            text_widget = scrolledtext.ScrolledText(frame, font=('Consolas', 10))
-            text_widget.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-            text_widget.insert(1.0, content)
-            text_widget.config(state=tk.DISABLED)  # Read-only
-            
-            self.notebook.add(frame, text=filename)
+            self.add_file_tab(filename, content)
+    
+    def clear_file_tabs(self):
+        """Remove all generated file tabs"""
+        for tab in self.notebook.tabs():
+            self.notebook.forget(tab)
+    
+    def add_file_tab(self, filename, content):
+        """Add a read-only tab showing one generated file"""
+        frame = ttk.Frame(self.notebook)
+        
+        # Add copy button
+        btn_frame = ttk.Frame(frame)
+        btn_frame.pack(fill=tk.X, padx=5, pady=5)
+        ttk.Button(btn_frame, text=f"Copy {filename}", 
+                  command=lambda f=filename: self.copy_to_clipboard(f)).pack(side=tk.RIGHT)
+        
+        # Add text widget with content
+        text_widget = scrolledtext.ScrolledText(frame, font=('Consolas', 10))
+        text_widget.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        text_widget.insert(1.0, content)
+        text_widget.config(state=tk.DISABLED)  # Read-only
+        
+        self.notebook.add(frame, text=filename)
     
     def copy_to_clipboard(self, filename):
         """Copy file content to clipboard"""
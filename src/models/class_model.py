@@ -89,6 +89,8 @@ class ClassDefinition:
     parent_classes: List[str] = field(default_factory=list)
     implemented_interfaces: List[str] = field(default_factory=list)
     description: Optional[str] = None
+    # Generator hints from the model, e.g. {'large': True, 'partition_by': 'createdAt'}
+    annotations: Dict[str, Any] = field(default_factory=dict)
 
 
 @dataclass
@@ -100,12 +102,46 @@ class ClassDiagram:
     packages: List[str] = field(default_factory=list)
     description: Optional[str] = None
     
+    _index: Optional["DiagramIndex"] = field(default=None, init=False, repr=False, compare=False)
+    
+    def build_index(self) -> "DiagramIndex":
+        """
+        Build (or reuse) the lookup index shared by every generator
+        
+        Call this once after parsing so that concurrent generators all share
+        the same precomputed analysis. The index (and the IR derived from it)
+        reflects the diagram as it was when built, and keeping it current is
+        the caller's job: add_class() and add_relationship() drop it, and any
+        other edit (renaming or replacing a class, changing its attributes or
+        methods, editing a relationship) must be followed by invalidate_index().
+        
+        The list identities and lengths below only catch the coarsest edits
+        (assigning new lists, appending or removing directly); same-length
+        edits are not detected. Fingerprinting the contents instead would cost
+        a pass over the whole diagram on every lookup through the index.
+        """
+        signature = (id(self.classes), len(self.classes), id(self.relationships), len(self.relationships))
+        if self._index is None or self._index.signature != signature:
+            self._index = DiagramIndex(self, signature)
+        return self._index
+    
+    def invalidate_index(self):
+        """Drop the index and everything derived from it, after editing the diagram in place"""
+        self._index = None
+    
+    def add_class(self, class_def: ClassDefinition):
+        """Add a class to the diagram"""
+        self.classes.append(class_def)
+        self._index = None
+    
+    def add_relationship(self, relationship: Relationship):
+        """Add a relationship to the diagram"""
+        self.relationships.append(relationship)
+        self._index = None
+    
     def get_class_by_name(self, class_name: str) -> Optional[ClassDefinition]:
         """Find a class by name"""
-        for cls in self.classes:
-            if cls.name == class_name:
-                return cls
-        return None
+        return self.build_index().classes_by_name.get(class_name)
     
     def get_classes_in_package(self, package_name: str) -> List[ClassDefinition]:
         """Get all classes in a specific package"""
@@ -113,8 +149,29 @@ class ClassDiagram:
     
     def get_relationships_for_class(self, class_name: str) -> List[Relationship]:
         """Get all relationships involving a specific class"""
-        return [rel for rel in self.relationships 
-                if rel.source_class == class_name or rel.target_class == class_name]
+        return list(self.build_index().relationships_by_class.get(class_name, ()))
+
+
+class DiagramIndex:
+    """Name-based lookups over a ClassDiagram, valid until the diagram is edited (see ClassDiagram.build_index)"""
+    
+    def __init__(self, diagram: ClassDiagram, signature: tuple):
+        self.signature = signature
+        
+        # Analyses derived from the diagram (e.g. the generators' IR), dropped with the index
+        self.derived: Dict[str, Any] = {}
+        
+        # First class wins on duplicate names, matching a linear scan
+        self.classes_by_name: Dict[str, ClassDefinition] = {}
+        for cls in diagram.classes:
+            self.classes_by_name.setdefault(cls.name, cls)
+        
+        # Relationships keep their diagram order for each class they touch
+        self.relationships_by_class: Dict[str, List[Relationship]] = {}
+        for rel in diagram.relationships:
+            self.relationships_by_class.setdefault(rel.source_class, []).append(rel)
+            if rel.target_class != rel.source_class:
+                self.relationships_by_class.setdefault(rel.target_class, []).append(rel)
 
 
 # Factory methods for common patterns
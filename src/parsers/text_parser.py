@@ -38,20 +38,22 @@ class TextModelParser:
             # Class definition
             if line.startswith('class '):
                 class_name = self._extract_class_name(line)
-                current_class = ClassDefinition(name=class_name)
-                diagram.classes.append(current_class)
+                current_class = ClassDefinition(name=class_name, stereotype=self._extract_stereotype(line))
+                diagram.add_class(current_class)
             
             # Interface definition
             elif line.startswith('interface '):
                 interface_name = self._extract_class_name(line)
-                current_class = ClassDefinition(name=interface_name, is_interface=True)
-                diagram.classes.append(current_class)
+                current_class = ClassDefinition(name=interface_name, is_interface=True,
+                                                stereotype=self._extract_stereotype(line))
+                diagram.add_class(current_class)
             
             # Abstract class
             elif line.startswith('abstract class '):
                 class_name = self._extract_class_name(line)
-                current_class = ClassDefinition(name=class_name, is_abstract=True)
-                diagram.classes.append(current_class)
+                current_class = ClassDefinition(name=class_name, is_abstract=True,
+                                                stereotype=self._extract_stereotype(line))
+                diagram.add_class(current_class)
             
             # Class members (attributes and methods)
             elif current_class and (line.startswith('+') or line.startswith('-') or 
@@ -62,7 +64,7 @@ class TextModelParser:
             elif '-->' in line or '<--' in line or '--|>' in line or '<|--' in line:
                 relationship = self._parse_relationship(line)
                 if relationship:
-                    diagram.relationships.append(relationship)
+                    diagram.add_relationship(relationship)
             
             # End class definition
             elif line == '}' and current_class:
@@ -85,12 +87,12 @@ class TextModelParser:
         # Parse classes
         for class_data in data.get('classes', []):
             class_def = self._parse_yaml_class(class_data)
-            diagram.classes.append(class_def)
+            diagram.add_class(class_def)
         
         # Parse relationships
         for rel_data in data.get('relationships', []):
             relationship = self._parse_yaml_relationship(rel_data)
-            diagram.relationships.append(relationship)
+            diagram.add_relationship(relationship)
         
         return diagram
     
@@ -106,7 +108,7 @@ class TextModelParser:
             if line.endswith(':'):
                 class_name = line[:-1].strip()
                 current_class = ClassDefinition(name=class_name)
-                diagram.classes.append(current_class)
+                diagram.add_class(current_class)
             
             # Attributes and methods
             elif current_class and line.startswith('  '):
@@ -127,6 +129,11 @@ class TextModelParser:
         match = re.search(r'(?:class|interface|abstract class)\s+(\w+)', line)
         return match.group(1) if match else "Unknown"
     
+    def _extract_stereotype(self, line: str) -> Optional[str]:
+        """Extract the stereotype of a PlantUML class definition (class Order <<large>>)"""
+        match = re.search(r'<<\s*([^>]+?)\s*>>', line)
+        return match.group(1) if match else None
+    
     def _parse_class_member(self, line: str, class_def: ClassDefinition):
         """Parse a class member (attribute or method) from PlantUML"""
         visibility_char = line[0]
@@ -218,7 +225,9 @@ class TextModelParser:
             package=class_data.get('package'),
             is_abstract=class_data.get('abstract', False),
             is_interface=class_data.get('interface', False),
-            description=class_data.get('description')
+            stereotype=class_data.get('stereotype'),
+            description=class_data.get('description'),
+            annotations=dict(class_data.get('annotations') or {})
         )
         
         # Parse attributes
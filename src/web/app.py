@@ -10,39 +10,27 @@ import zipfile
 from io import StringIO
 
 from ..parsers.text_parser import TextModelParser
-from ..generators.python_generator import PythonCodeGenerator
-from ..generators.java_generator import JavaCodeGenerator
-from ..generators.typescript_generator import TypeScriptCodeGenerator
+from ..generators.registry import registry
 from ..models.class_model import create_sample_model
 
 
 app = Flask(__name__)
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 
-# Initialize generators (including Kessel Run generators if available)
-generators = {
-    'python': PythonCodeGenerator(),
-    'java': JavaCodeGenerator(),
-    'typescript': TypeScriptCodeGenerator()
-}
-
-# Add Kessel Run generators if available
-try:
-    from ..generators.microservice_generator import MicroserviceGenerator
-    from ..generators.openapi_generator import OpenAPIGenerator
-    from ..generators.devsecops_generator import DevSecOpsGenerator
-    
-    generators.update({
-        'microservices': MicroserviceGenerator(),
-        'openapi': OpenAPIGenerator(),
-        'devsecops': DevSecOpsGenerator()
-    })
-except ImportError:
-    pass
-
 parser = TextModelParser()
 
 
+def get_generator(target_language: str):
+    """Create the generator for a target, importing it on first use (None if unavailable)"""
+    if target_language not in registry:
+        return None
+    try:
+        return registry.create(target_language)
+    except ImportError:
+        # Generators with optional dependencies that are not installed
+        return None
+
+
 @app.route('/')
 def index():
     """Main page with model input form"""
@@ -80,7 +68,7 @@ def generate_code():
         
         # Generate code
         try:
-            generator = generators.get(target_language)
+            generator = get_generator(target_language)
             if not generator:
                 return jsonify({'error': f'Unsupported target language: {target_language}'}), 400
             
@@ -138,20 +126,66 @@ def download_generated_code():
         import json
         files = json.loads(files_data)
         
-        # Create a temporary ZIP file
-        temp_dir = tempfile.mkdtemp()
-        zip_path = os.path.join(temp_dir, 'generated_code.zip')
+        temp_dir = build_zip(files.items())
+        return send_from_directory(temp_dir, 'generated_code.zip', as_attachment=True)
+    
+    except Exception as e:
+        return jsonify({'error': f'Failed to create download: {str(e)}'}), 500
+
+
+@app.route('/api/generate/download', methods=['POST'])
+def generate_download():
+    """Generate code and stream it straight into a ZIP file"""
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({'error': 'No data provided'}), 400
+        
+        model_text = data.get('model_text', '').strip()
+        model_format = data.get('model_format', 'simple')
+        target_language = data.get('target_language', 'python')
+        
+        if not model_text:
+            return jsonify({'error': 'No model text provided'}), 400
+        
+        # Parse the model
+        try:
+            if model_format == 'plantuml':
+                diagram = parser.parse_plantuml(model_text)
+            elif model_format == 'yaml':
+                diagram = parser.parse_yaml(model_text)
+            elif model_format == 'simple':
+                diagram = parser.parse_simple_text(model_text)
+            else:
+                return jsonify({'error': f'Unsupported model format: {model_format}'}), 400
+        except Exception as e:
+            return jsonify({'error': f'Failed to parse model: {str(e)}'}), 400
         
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for filename, content in files.items():
-                zipf.writestr(filename, content)
+        generator = get_generator(target_language)
+        if not generator:
+            return jsonify({'error': f'Unsupported target language: {target_language}'}), 400
         
+        # Each file is compressed as soon as it is generated
+        temp_dir = build_zip(generator.stream(diagram))
         return send_from_directory(temp_dir, 'generated_code.zip', as_attachment=True)
     
     except Exception as e:
         return jsonify({'error': f'Failed to create download: {str(e)}'}), 500
 
 
+def build_zip(files) -> str:
+    """Write (filename, content) pairs into a temporary ZIP, returning its directory"""
+    temp_dir = tempfile.mkdtemp()
+    zip_path = os.path.join(temp_dir, 'generated_code.zip')
+    
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        for filename, content in files:
+            zipf.writestr(filename, content)
+    
+    return temp_dir
+
+
 @app.route('/api/validate', methods=['POST'])
 def validate_model():
     """Validate model syntax without generating code"""